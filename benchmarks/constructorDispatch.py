@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#--------------------------------------------------------------------------------------
+# Micro-benchmark of the constructor selection used by the patch fields :
+# the former chain of try / except AssertionError against overloadTable,
+# for the clone ( copy and copy with internal field ) and map ( mapper
+# constructor ) signatures. Stand-in argument classes keep it Foam-free.
+#
+#     python benchmarks/constructorDispatch.py [ number of calls ]
+
+
+#--------------------------------------------------------------------------------------
+import os, sys, timeit, types
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), os.pardir ) )
+
+from materialModels.overloadTable import overloadTable, foamType, sameClass
+
+
+#--------------------------------------------------------------------------------------
+def _standIn( name ):
+    class standIn( object ):
+        @classmethod
+        def ext_isinstance( cls, arg ):
+            if not isinstance( arg, cls ):
+               raise TypeError( name )
+            return True
+    standIn.__name__ = name
+    return standIn
+
+standInFoam = types.ModuleType( "standInFoam" )
+for className in ( "fvPatch", "DimensionedField_vector_volMesh", "dictionary", "fvPatchFieldMapper" ):
+    setattr( standInFoam, className, _standIn( className ) )
+sys.modules[ "standInFoam" ] = standInFoam
+
+
+#--------------------------------------------------------------------------------------
+def _check( className, arg ):
+    try:
+        getattr( standInFoam, className ).ext_isinstance( arg )
+    except TypeError:
+        raise AssertionError( className )
+
+
+#--------------------------------------------------------------------------------------
+class patchFieldBase( object ):
+    def _init__p_iF( self, p, iF ):
+        return self
+
+    def _init__p_iF_dict( self, p, iF, dict_ ):
+        return self
+
+    def _init__self_p_iF_mapper( self, ptf, p, iF, mapper ):
+        return self
+
+    def _init__self( self, ptf ):
+        return self
+
+    def _init__self_iF( self, ptf, iF ):
+        return self
+
+
+#--------------------------------------------------------------------------------------
+class tryChainPatchField( patchFieldBase ):
+    def __init__( self, *args ):
+        for method in ( self._try__p_iF, self._try__p_iF_dict, self._try__self_p_iF_mapper,
+                        self._try__self, self._try__self_iF ):
+            try:
+                method( *args )
+                return
+            except AssertionError:
+                pass
+        raise AssertionError()
+
+    def _try__p_iF( self, *args ):
+        if len( args ) != 2 :
+           raise AssertionError( "len( args ) != 2" )
+        _check( "fvPatch", args[ 0 ] ); _check( "DimensionedField_vector_volMesh", args[ 1 ] )
+        return self._init__p_iF( *args )
+
+    def _try__p_iF_dict( self, *args ):
+        if len( args ) != 3 :
+           raise AssertionError( "len( args ) != 3" )
+        _check( "fvPatch", args[ 0 ] ); _check( "DimensionedField_vector_volMesh", args[ 1 ] )
+        _check( "dictionary", args[ 2 ] )
+        return self._init__p_iF_dict( *args )
+
+    def _try__self_p_iF_mapper( self, *args ):
+        if len( args ) != 4 :
+           raise AssertionError( "len( args ) != 4" )
+        if args[ 0 ].__class__ != self.__class__:
+           raise AssertionError( "args[ argc ].__class__ != self.__class__" )
+        _check( "fvPatch", args[ 1 ] ); _check( "DimensionedField_vector_volMesh", args[ 2 ] )
+        _check( "fvPatchFieldMapper", args[ 3 ] )
+        return self._init__self_p_iF_mapper( *args )
+
+    def _try__self( self, *args ):
+        if len( args ) != 1 :
+           raise AssertionError( "len( args ) != 1" )
+        if args[ 0 ].__class__ != self.__class__:
+           raise AssertionError( "args[ argc ].__class__ != self.__class__" )
+        return self._init__self( *args )
+
+    def _try__self_iF( self, *args ):
+        if len( args ) != 2 :
+           raise AssertionError( "len( args ) != 2" )
+        if args[ 0 ].__class__ != self.__class__:
+           raise AssertionError( "args[ argc ].__class__ != self.__class__" )
+        _check( "DimensionedField_vector_volMesh", args[ 1 ] )
+        return self._init__self_iF( *args )
+
+
+#--------------------------------------------------------------------------------------
+fvPatch_ = foamType( "standInFoam", "fvPatch" )
+iF_ = foamType( "standInFoam", "DimensionedField_vector_volMesh" )
+dictionary_ = foamType( "standInFoam", "dictionary" )
+mapper_ = foamType( "standInFoam", "fvPatchFieldMapper" )
+
+class tablePatchField( patchFieldBase ):
+    _constructors = overloadTable()
+    _constructors.add( "_init__p_iF", fvPatch_, iF_ )
+    _constructors.add( "_init__p_iF_dict", fvPatch_, iF_, dictionary_ )
+    _constructors.add( "_init__self_p_iF_mapper", sameClass, fvPatch_, iF_, mapper_ )
+    _constructors.add( "_init__self", sameClass )
+    _constructors.add( "_init__self_iF", sameClass, iF_ )
+
+    def __init__( self, *args ):
+        tablePatchField._constructors( self, *args )
+
+
+#--------------------------------------------------------------------------------------
+def main( nCalls ):
+    p = standInFoam.fvPatch()
+    iF = standInFoam.DimensionedField_vector_volMesh()
+    mapper = standInFoam.fvPatchFieldMapper()
+
+    print( "%-12s %-10s %14s" % ( "signature", "dispatch", "us per call" ) )
+    for patchFieldType, label in ( ( tryChainPatchField, "try-chain" ), ( tablePatchField, "table" ) ):
+        ptf = patchFieldType( p, iF )
+        cases = ( ( "clone", lambda : patchFieldType( ptf ) ),
+                  ( "clone(iF)", lambda : patchFieldType( ptf, iF ) ),
+                  ( "map", lambda : patchFieldType( ptf, p, iF, mapper ) ) )
+        for name, call in cases:
+            seconds = min( timeit.repeat( call, number = nCalls, repeat = 3 ) )
+            print( "%-12s %-10s %14.3f" % ( name, label, 1.0e6 * seconds / nCalls ) )
+
+
+#--------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    nCalls = 20000
+    if len( sys.argv ) > 1:
+       nCalls = int( sys.argv[ 1 ] )
+    main( nCalls )
+
+
+#--------------------------------------------------------------------------------------
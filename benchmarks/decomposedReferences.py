@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Stand-in for a decomposed run of the global-face componentReference
+# resolution. A box-like mesh is cut into processor meshes, one process per
+# rank builds the globalFaceIndex of its processor mesh from the local
+# faceProcAddressing and resolves all references. The references owned by
+# the ranks must cover every reference exactly once and point back to the
+# same global face. Foam-free.
+#
+#     python benchmarks/decomposedReferences.py [ ranks ] [ faces ] [ references ]
+
+
+#--------------------------------------------------------------------------------------
+import os, sys, time
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), os.pardir ) )
+
+import numpy
+from materialModels.globalFaceIndex import globalFaceIndex, decodeAddressing
+
+
+#--------------------------------------------------------------------------------------
+#- Undecomposed mesh : internal faces first, then the boundary faces of the patches
+def globalMesh( nFaces ):
+    nBoundary = nFaces // 5
+    patchSizes = [ nBoundary // 4, nBoundary // 4, nBoundary // 2, nBoundary - nBoundary // 4 * 2 - nBoundary // 2 ]
+    patchStarts = list( nFaces - nBoundary + numpy.cumsum( [ 0 ] + patchSizes[ :-1 ] ) )
+
+    return patchStarts, patchSizes
+
+
+#--------------------------------------------------------------------------------------
+#- Processor mesh of the given rank : its share of the global boundary faces,
+#  a processor patch and the faceProcAddressing of its faces
+def processorMesh( rank, nRanks, nFaces, patchStarts, patchSizes ):
+    random = numpy.random.RandomState( 0 )
+    owner = random.randint( 0, nRanks, nFaces )
+
+    internal = numpy.nonzero( owner[ : patchStarts[ 0 ] ] == rank )[ 0 ]
+    starts = []
+    sizes = []
+    faces = [ internal ]
+    nLocal = internal.shape[ 0 ]
+    for start, size in zip( patchStarts, patchSizes ):
+        patchFaces = start + numpy.nonzero( owner[ start : start + size ] == rank )[ 0 ]
+        starts.append( nLocal )
+        sizes.append( patchFaces.shape[ 0 ] )
+        faces.append( patchFaces )
+        nLocal += patchFaces.shape[ 0 ]
+
+    # Processor patch faces are internal in the global mesh, some of them flipped
+    shared = internal[ : internal.shape[ 0 ] // 10 ]
+    starts.append( nLocal )
+    sizes.append( shared.shape[ 0 ] )
+    faces.append( shared )
+
+    globalFaces = numpy.concatenate( faces )
+    sign = numpy.ones( globalFaces.shape[ 0 ], numpy.int64 )
+    sign[ nLocal: ][ ::2 ] = -1
+    addressing = sign * ( globalFaces + 1 )
+
+    return addressing, starts, sizes, [ False ] * len( patchSizes ) + [ True ]
+
+
+#--------------------------------------------------------------------------------------
+def resolve( args ):
+    rank, nRanks, nFaces, references = args
+    patchStarts, patchSizes = globalMesh( nFaces )
+    addressing, starts, sizes, coupled = processorMesh( rank, nRanks, nFaces, patchStarts, patchSizes )
+
+    start = time.time()
+    index = globalFaceIndex( decodeAddressing( addressing ), starts, sizes, coupled )
+    patches, faces = index.lookup( references )
+    elapsed = time.time() - start
+
+    owned = numpy.nonzero( patches >= 0 )[ 0 ]
+    localFaces = numpy.asarray( starts )[ patches[ owned ] ] + faces[ owned ]
+    backToGlobal = decodeAddressing( addressing )[ localFaces ]
+
+    return rank, owned, backToGlobal, index.size(), elapsed
+
+
+#--------------------------------------------------------------------------------------
+def main():
+    nRanks = 4
+    nFaces = 1000000
+    nReferences = 100000
+    if len( sys.argv ) > 1:
+       nRanks = int( sys.argv[ 1 ] )
+    if len( sys.argv ) > 2:
+       nFaces = int( sys.argv[ 2 ] )
+    if len( sys.argv ) > 3:
+       nReferences = int( sys.argv[ 3 ] )
+
+    patchStarts, patchSizes = globalMesh( nFaces )
+    random = numpy.random.RandomState( 1 )
+    references = random.randint( patchStarts[ 0 ], nFaces, nReferences )
+
+    import multiprocessing
+    pool = multiprocessing.Pool( nRanks )
+    results = pool.map( resolve, [ ( rank, nRanks, nFaces, references ) for rank in range( nRanks ) ] )
+    pool.close()
+    pool.join()
+
+    count = numpy.zeros( nReferences, numpy.int64 )
+    for rank, owned, backToGlobal, size, elapsed in results:
+        count[ owned ] += 1
+        assert numpy.all( backToGlobal == references[ owned ] ), "rank %d resolved a wrong face" % rank
+        print "rank %d : %d indexed faces, %d references owned, %.2f ms" % ( rank, size, owned.shape[ 0 ], elapsed * 1.0e3 )
+
+    assert numpy.all( count == 1 ), "%d references not owned exactly once" % numpy.sum( count != 1 )
+    print "all %d references owned exactly once" % nReferences
+
+    return 0
+
+
+#--------------------------------------------------------------------------------------
+if __name__ == "__main__":
+   sys.exit( main() )
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,316 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Scaling benchmark of the material layer on synthetic meshes. Every case is
+# a mesh of the given number of cells split into blocks of materials, each a
+# linearElastic law of its own under multiMaterial, with the boundary faces
+# spread over the given number of tractionDisplacement patches. Timed are
+#
+#     rheologyModel          construction, reading the laws and the materials
+#     multiMaterial          updateIndex, E and patchE over all the patches
+#     Lame                   rheologyModel mu and lambda from a cleared cache
+#     updateCoeffs           all the patches, one by one and batched
+#     componentReference     reading one per boundary face in ten, one object
+#                            per reference and as componentReferenceList
+#     autoMap, rmap          all the patches
+#
+# It runs on the NumPy backend ( see numpyBackend ), so the figures
+# are those of the material layer itself. By default the number of cells,
+# of materials and of patches are varied one at a time around a base case,
+# --grid runs all the combinations. Timings ( the best and the mean of the
+# repeats, in seconds ) are printed and written to the --json file, with
+# the hits and misses of the scratch field pool.
+#
+#     python benchmarks/scaling.py [ options ]
+
+
+#--------------------------------------------------------------------------------------
+import os, sys, timeit
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), os.pardir ) )
+
+import numpy
+from materialModels import numpyBackend
+numpyBackend.install()
+
+from materialModels.numpyBackend import word, dictionary, dimensionedScalar, dimDensity, dimForce, dimArea, dimless, IOobject
+from materialModels.numpyBackend import Istream, token, fvPatchFieldMapper, volSymmTensorField, volVectorField, volTensorField
+
+from materialModels.rheologyModel import rheologyModel
+from materialModels import fieldPool
+from materialModels.componentReference import componentReference, componentReferenceList
+from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+
+
+#--------------------------------------------------------------------------------------
+baseCase = ( 100000, 10, 50 )
+defaultCells = ( 1000, 10000, 100000, 1000000, 10000000 )
+defaultMaterials = ( 1, 10, 100 )
+defaultPatches = ( 1, 50, 500 )
+
+
+#--------------------------------------------------------------------------------------
+#- Synthetic mesh : about as many boundary faces as a cube of the cells has,
+#  face cells and normals at random, materials in contiguous blocks of cells
+def buildMesh( nCells, nMaterials, nPatches, random ):
+    nFaces = max( nPatches, int( 6.0 * nCells ** ( 2.0 / 3.0 ) ) )
+    bounds = numpy.linspace( 0, nFaces, nPatches + 1 ).astype( numpy.int64 )
+
+    patches = []
+    for patchI in range( nPatches ):
+        size = bounds[ patchI + 1 ] - bounds[ patchI ]
+        nf = random.normal( size = ( size, 3 ) )
+        nf /= numpy.sqrt( ( nf * nf ).sum( axis = 1 ) ).reshape( -1, 1 )
+        patches.append( ( "traction%d" % patchI, random.randint( 0, nCells, size ), nf ) )
+
+    mesh = numpyBackend.fvMesh( numpyBackend.Time(), nCells, patches )
+    mesh.fields_[ "materials" ] = ( numpy.arange( nCells ) * nMaterials // nCells ).astype( float )
+
+    laws = []
+    for lawI in range( nMaterials ):
+        laws.append( ( "material%d" % lawI,
+                       { "type" : "linearElastic",
+                         "rho" : dimensionedScalar( word( "rho" ), dimDensity, 7854.0 ),
+                         "E" : dimensionedScalar( word( "E" ), dimForce / dimArea, 2.0e+11 * ( 1.0 + 0.01 * lawI ) ),
+                         "nu" : dimensionedScalar( word( "nu" ), dimless, 0.3 ) } ) )
+    mesh.dictionaries_[ "rheologyProperties" ] = { "planeStress" : "no",
+                                                   "rheology" : { "type" : "multiMaterial", "laws" : laws } }
+
+    return mesh
+
+
+#--------------------------------------------------------------------------------------
+class case( object ):
+    def __init__( self, nCells, nMaterials, nPatches, seed = 0 ):
+        random = numpy.random.RandomState( seed )
+        self.mesh_ = mesh = buildMesh( nCells, nMaterials, nPatches, random )
+
+        def io( name ):
+            return IOobject( word( name ), "0", mesh, IOobject.NO_READ, IOobject.NO_WRITE )
+
+        self.sigma_ = volSymmTensorField( io( "sigma" ), mesh )
+        self.U_ = volVectorField( io( "U" ), mesh )
+        self.gradU_ = volTensorField( io( "grad(U)" ), mesh, 1.0e-3 * random.normal( size = ( nCells, 9 ) ) )
+        self.rheology_ = rheologyModel( self.sigma_ )
+
+        iF = self.U_.dimensionedInternalField()
+        patchDict = dictionary( { "U" : "U", "rheology" : "rheologyProperties",
+                                  "traction" : ( 1.0e+6, 0.0, 0.0 ), "pressure" : 0.0 } )
+        self.patchFields_ = []
+        for patch in mesh.boundary():
+            patchField = tractionDisplacementFvPatchVectorField( patch, iF, patchDict )
+            self.U_.ext_boundaryField()[ patch.index() ] = patchField
+            self.patchFields_.append( patchField )
+
+        # One reference per boundary face in ten
+        self.references_ = []
+        for patch in mesh.boundary():
+            for face in range( 0, patch.size(), 10 ):
+                self.references_.append( { "patch" : str( patch.name() ), "face" : face,
+                                           "direction" : "xyz"[ face % 3 ], "value" : 0.0 } )
+
+        self.mappers_ = [ fvPatchFieldMapper( numpy.arange( patch.size() )[ ::-1 ] ) for patch in mesh.boundary() ]
+        self.copies_ = [ tractionDisplacementFvPatchVectorField( patchField ) for patchField in self.patchFields_ ]
+        pass
+
+    def nFaces( self ):
+        return sum( [ patch.size() for patch in self.mesh_.boundary() ] )
+
+    def constructRheology( self ):
+        return rheologyModel( self.sigma_ )
+
+    def updateIndex( self ):
+        self.rheology_.law().updateIndex()
+
+    def assemble( self ):
+        return self.rheology_.law().E()
+
+    def assemblePatches( self ):
+        law = self.rheology_.law()
+        return [ law.patchE( patchI ) for patchI in range( len( self.patchFields_ ) ) ]
+
+    def lame( self ):
+        self.rheology_.clearOut()
+        return self.rheology_.mu(), self.rheology_._lambda()
+
+    def resetUpdated( self ):
+        for patchField in self.patchFields_:
+            patchField.updated_ = False
+
+    def updateCoeffs( self ):
+        for patchField in self.patchFields_:
+            patchField.updateCoeffs()
+
+    def updateCoeffsBatched( self ):
+        tractionDisplacementFvPatchVectorField.batched = True
+        try:
+            self.updateCoeffs()
+        finally:
+            tractionDisplacementFvPatchVectorField.batched = False
+
+    def readReferences( self ):
+        is_ = Istream( self.references_ )
+        reader = componentReference.iNew( self.mesh_ )
+        return [ reader( is_ )() for reference in self.references_ ]
+
+    def readReferenceList( self ):
+        return componentReferenceList( self.mesh_, Istream( [ token.BEGIN_LIST ] + self.references_ + [ token.END_LIST ] ) )
+
+    def autoMap( self ):
+        for patchField, mapper in zip( self.patchFields_, self.mappers_ ):
+            patchField.autoMap( mapper )
+
+    def rmap( self ):
+        for patchField, patchCopy, mapper in zip( self.patchFields_, self.copies_, self.mappers_ ):
+            patchField.rmap( patchCopy, mapper.directAddressing() )
+
+
+#--------------------------------------------------------------------------------------
+#- ( name, method, method run untimed before every repeat )
+operations = ( ( "rheologyModel", "constructRheology", None ),
+               ( "multiMaterial.updateIndex", "updateIndex", None ),
+               ( "multiMaterial.E", "assemble", None ),
+               ( "multiMaterial.patchE", "assemblePatches", None ),
+               ( "rheologyModel.Lame", "lame", None ),
+               ( "updateCoeffs", "updateCoeffs", "resetUpdated" ),
+               ( "updateCoeffs.batched", "updateCoeffsBatched", "resetUpdated" ),
+               ( "componentReference.iNew", "readReferences", None ),
+               ( "componentReferenceList", "readReferenceList", None ),
+               ( "autoMap", "autoMap", None ),
+               ( "rmap", "rmap", None ) )
+
+
+#--------------------------------------------------------------------------------------
+def timeOperation( call, reset, repeat ):
+    timings = []
+    for i in range( repeat ):
+        if reset is not None:
+           reset()
+        start = timeit.default_timer()
+        call()
+        timings.append( timeit.default_timer() - start )
+
+    return { "min" : min( timings ), "mean" : sum( timings ) / len( timings ) }
+
+
+#--------------------------------------------------------------------------------------
+def run( nCells, nMaterials, nPatches, repeat ):
+    start = timeit.default_timer()
+    instance = case( nCells, nMaterials, nPatches )
+    result = { "cells" : nCells, "materials" : nMaterials, "patches" : nPatches,
+               "boundaryFaces" : instance.nFaces(), "references" : len( instance.references_ ),
+               "setup" : timeit.default_timer() - start, "timings" : {} }
+
+    # The constants are cached as a solver has them before the boundary update
+    instance.rheology_.mu()
+    hits, misses = fieldPool.instance().stats()
+    for name, method, reset in operations:
+        if reset is not None:
+           reset = getattr( instance, reset )
+        result[ "timings" ][ name ] = timeOperation( getattr( instance, method ), reset, repeat )
+
+    result[ "fieldPool" ] = { "hits" : fieldPool.instance().stats()[ 0 ] - hits,
+                              "misses" : fieldPool.instance().stats()[ 1 ] - misses }
+
+    return result
+
+
+#--------------------------------------------------------------------------------------
+def cases( options ):
+    cells = options.cells or defaultCells
+    materials = options.materials or defaultMaterials
+    patches = options.patches or defaultPatches
+    if options.grid:
+       return [ ( c, m, p ) for c in cells for m in materials for p in patches ]
+
+    result = []
+    for combination in [ ( c, baseCase[ 1 ], baseCase[ 2 ] ) for c in cells ] + \
+                       [ ( baseCase[ 0 ], m, baseCase[ 2 ] ) for m in materials ] + \
+                       [ ( baseCase[ 0 ], baseCase[ 1 ], p ) for p in patches ]:
+        if combination not in result:
+           result.append( combination )
+
+    return result
+
+
+#--------------------------------------------------------------------------------------
+def environment():
+    import platform, time, subprocess
+    commit = None
+    try:
+        commit = subprocess.Popen( [ "git", "rev-parse", "HEAD" ], stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+                                   cwd = os.path.dirname( os.path.abspath( __file__ ) ) ).communicate()[ 0 ].strip() or None
+    except OSError:
+        pass
+
+    return { "date" : time.strftime( "%Y-%m-%dT%H:%M:%S" ), "commit" : commit,
+             "python" : platform.python_version(), "numpy" : numpy.__version__,
+             "machine" : platform.machine(), "platform" : platform.platform() }
+
+
+#--------------------------------------------------------------------------------------
+def main( argv = None ):
+    from optparse import OptionParser
+    def sizes( option, opt, value, parser ):
+        setattr( parser.values, option.dest, [ int( float( size ) ) for size in value.split( "," ) ] )
+
+    parser = OptionParser( usage = "%prog [ options ]" )
+    for name, default in ( ( "cells", defaultCells ), ( "materials", defaultMaterials ), ( "patches", defaultPatches ) ):
+        parser.add_option( "--" + name, dest = name, type = "string", action = "callback", callback = sizes,
+                           help = "comma separated numbers of %s, %s by default" % ( name, ",".join( map( str, default ) ) ) )
+    parser.add_option( "--grid", dest = "grid", action = "store_true", default = False,
+                       help = "run all the combinations instead of one parameter at a time" )
+    parser.add_option( "--repeat", dest = "repeat", type = "int", default = 3,
+                       help = "number of repeats of every operation" )
+    parser.add_option( "--json", dest = "json", default = None,
+                       help = "write the results to the given JSON file" )
+    options, args = parser.parse_args( argv )
+
+    results = []
+    print "%10s %9s %7s  %-26s %12s %12s" % ( "cells", "materials", "patches", "operation", "min [ms]", "mean [ms]" )
+    for nCells, nMaterials, nPatches in cases( options ):
+        result = run( nCells, nMaterials, nPatches, options.repeat )
+        for name, method, reset in operations:
+            timing = result[ "timings" ][ name ]
+            print "%10d %9d %7d  %-26s %12.3f %12.3f" % ( nCells, nMaterials, nPatches, name,
+                                                          timing[ "min" ] * 1.0e3, timing[ "mean" ] * 1.0e3 )
+        results.append( result )
+        sys.stdout.flush()
+
+    if options.json is not None:
+       import json
+       output = open( options.json, "w" )
+       json.dump( { "environment" : environment(), "repeat" : options.repeat, "cases" : results }, output, indent = 1 )
+       output.close()
+       pass
+
+    return 0
+
+
+#--------------------------------------------------------------------------------------
+if __name__ == "__main__":
+   sys.exit( main() )
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,139 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Evaluation of per-cell kernels over chunks of a cell range in a pool of
+# threads. The kernels work on NumPy buffers, whose loops release the GIL,
+# so that the chunks really run side by side. With one thread, or with
+# fewer cells than one chunk, the kernel is called once on the whole range.
+#
+# The pool shared by the material models is set up from rheologyProperties
+#
+#     nThreads        8;        // default 1
+#     chunkSize       65536;    // cells per chunk, default 65536
+
+
+#----------------------------------------------------------------------------
+class chunkedPool( object ):
+    def __init__( self, nThreads = 1, chunkSize = 65536 ):
+        self.pool_ = None
+        self.nThreads_ = 1
+        self.configure( nThreads, chunkSize )
+        pass
+
+
+    #------------------------------------------------------------------------
+    def __del__( self ):
+        self.close()
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Change the number of threads and the chunk size
+    def configure( self, nThreads, chunkSize ):
+        nThreads = max( int( nThreads ), 1 )
+        if nThreads != self.nThreads_:
+           self.close()
+           pass
+        self.nThreads_ = nThreads
+        self.chunkSize_ = max( int( chunkSize ), 1 )
+        pass
+
+
+    #------------------------------------------------------------------------
+    def nThreads( self ):
+        return self.nThreads_
+
+
+    #------------------------------------------------------------------------
+    def chunkSize( self ):
+        return self.chunkSize_
+
+
+    #------------------------------------------------------------------------
+    #- Stop the threads, they are started again when needed
+    def close( self ):
+        if self.pool_ is not None:
+           self.pool_.close()
+           self.pool_.join()
+           self.pool_ = None
+           pass
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return the ( start, end ) ranges splitting size cells
+    def chunks( self, size ):
+        nChunks = max( min( ( size + self.chunkSize_ - 1 ) // self.chunkSize_, 4 * self.nThreads_ ), 1 )
+        bounds = [ size * i // nChunks for i in range( nChunks + 1 ) ]
+
+        return zip( bounds[ :-1 ], bounds[ 1: ] )
+
+
+    #------------------------------------------------------------------------
+    #- Call kernel( start, end ) for the chunks of range( size ). The kernel
+    #  writes its results into slices of preallocated arrays
+    def run( self, kernel, size ):
+        if self.nThreads_ == 1 or size <= self.chunkSize_:
+           kernel( 0, size )
+           return
+
+        if self.pool_ is None:
+           from multiprocessing.pool import ThreadPool
+           self.pool_ = ThreadPool( self.nThreads_ )
+           pass
+
+        self.pool_.map( lambda bounds : kernel( *bounds ), self.chunks( size ) )
+        pass
+
+
+#----------------------------------------------------------------------------
+_instance = chunkedPool()
+
+
+#----------------------------------------------------------------------------
+#- Return the pool shared by the material models
+def instance():
+    return _instance
+
+
+#----------------------------------------------------------------------------
+#- Set up the shared pool from the optional entries of the dictionary
+def configure( dict_ ):
+    from Foam.OpenFOAM import word, readLabel
+    nThreads = _instance.nThreads()
+    if dict_.found( word( "nThreads" ) ):
+       nThreads = readLabel( dict_.lookup( word( "nThreads" ) ) )
+       pass
+
+    chunkSize = _instance.chunkSize()
+    if dict_.found( word( "chunkSize" ) ):
+       chunkSize = readLabel( dict_.lookup( word( "chunkSize" ) ) )
+       pass
+
+    _instance.configure( nThreads, chunkSize )
+    pass
+
+
+#----------------------------------------------------------------------------
@@ -31,42 +31,45 @@
 
 #--------------------------------------------------------------------------------
 from Foam.template import PtrList_TypeBase
+from materialModels.overloadTable import overloadTable, foamType, sameClass, anything
+from materialModels.lazyImport import OpenFOAM, finiteVolume
+
+fvMesh_ = foamType( "Foam.finiteVolume", "fvMesh" )
+dictionary_ = foamType( "Foam.OpenFOAM", "dictionary" )
+
+def globalFaceIndex_( obj, arg ):
+    from materialModels.globalFaceIndex import globalFaceIndex
+    return arg is None or isinstance( arg, globalFaceIndex )
+
+
 class componentReference( PtrList_TypeBase ):
+    #- Constructors keyed on the number and the classes of the arguments
+    _constructors = overloadTable()
+    #- Construct from components : mesh, patch name, face, direction and value
+    _constructors.add( "_init__with_5_param", fvMesh_, anything, anything, anything, anything )
+    #- Construct from components followed by an unused argument, kept for old callers
+    _constructors.add( "_init__with_6_param", fvMesh_, anything, anything, anything, anything, anything )
+    #- Construct from dictionary
+    _constructors.add( "_init__with_2_param", fvMesh_, dictionary_ )
+    #- Construct from dictionary given the global face index of the mesh
+    _constructors.add( "_init__with_3_param", fvMesh_, dictionary_, globalFaceIndex_ )
+    #- Construct from self
+    _constructors.add( "_init__self", sameClass )
+    
     def __init__( self, *args ):
-        #- Construct from components
-        try:
-            self._init__with_6_param( *args )
-            return
-        except AssertionError:
-            pass
-        #- - Construct from dictionary
-        try:
-            self._init__with_2_param( *args )
-            return
-        except AssertionError:
-            pass
+        componentReference._constructors( self, *args )
+        pass
         
-        #- - Construct from self
-        try:
-            self._init__self( *args )
-            return
-        except AssertionError:
-            pass
         
-        raise AssertionError()
+    #-----------------------------------------------------------------------------  
+    def _init__with_6_param( self, *args ):
+        self._init__with_5_param( *args[ : 5 ] )
         
         
     #-----------------------------------------------------------------------------  
-    def _init__with_6_param(self, *args):
-        if len(args) != 6:
-           raise AssertionError( "len( args ) != 6" )
-        
+    def _init__with_5_param(self, *args):
+        PtrList_TypeBase.__init__( self )
         argc = 0
-        from Foam.finiteVolume import fvMesh
-        try:
-            fvMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvMesh" )
         mesh = args[ argc ]; argc +=1
         
         from Foam.OpenFOAM import word
@@ -100,51 +103,56 @@ class componentReference( PtrList_TypeBase ):
         self.faceIndex_ = faceIndex
         self.dir_ = dir_
         self.value_ = value
+        self.globalFace_ = -1
         self.checkPatchFace(mesh)
         
         
     #-----------------------------------------------------------------------------
-    def _init__with_2_param( self, *args ):
-        if len(args) != 2:
-           raise AssertionError( "len( args ) != 2" )
-        argc = 0
-        
-        from Foam.finiteVolume import fvMesh
-        try:
-            fvMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvMesh" )
-        mesh = args[ argc ]; argc +=1
-        
-        from Foam.OpenFOAM import dictionary
-        try:
-            dictionary.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != dictionary" )
-        dict_ = args[ argc ]
+    def _init__with_2_param( self, mesh, dict_ ):
+        self._init__with_3_param( mesh, dict_, None )
+    
+    
+    #-----------------------------------------------------------------------------
+    #- The face is given either by patch and face entries or by the label of
+    #  the face in the undecomposed mesh, the globalFace entry. The face must
+    #  be on this processor, componentReferenceList and iNew.references drop
+    #  the others while reading
+    def _init__with_3_param( self, mesh, dict_, index ):
         PtrList_TypeBase.__init__( self )
         from Foam.OpenFOAM import polyPatchID, word, readLabel, readScalar
-        self.patchID_ = polyPatchID( dict_.lookup( word( "patch" ) ), mesh.boundaryMesh() )
-        self.faceIndex_ = readLabel( dict_.lookup( word( "face" ) ) )
         self.dir_ = self.getDir( dict_ )
         self.value_ = readScalar( dict_.lookup( word( "value" ) ) )
-        self.checkPatchFace(mesh)
+        self.globalFace_ = -1
+        
+        if not dict_.found( word( "globalFace" ) ):
+           self.patchID_ = polyPatchID( dict_.lookup( word( "patch" ) ), mesh.boundaryMesh() )
+           self.faceIndex_ = readLabel( dict_.lookup( word( "face" ) ) )
+           self.checkPatchFace(mesh)
+           return
+        
+        self.globalFace_ = readLabel( dict_.lookup( word( "globalFace" ) ) )
+        if index is None:
+           from materialModels.globalFaceIndex import globalFaceIndex
+           index = globalFaceIndex.New( mesh )
+           pass
+        
+        patches, faces = index.lookup( self.globalFace_ )
+        patchI = int( patches[ 0 ] )
+        if patchI < 0:
+           raise IOError( "Global face %d is not on this processor, read the references "
+                          "with componentReferenceList in a parallel run" % self.globalFace_ )
+        self.faceIndex_ = int( faces[ 0 ] )
+        self.patchID_ = polyPatchID( mesh.boundaryMesh()[ patchI ].name(), mesh.boundaryMesh() )
+        pass
     
     
     #----------------------------------------------------------------------------
-    def _init__self(self, *args):
-        if len(args) != 1:
-           raise AssertionError( "len( args ) != 1" )
-        
-        argc = 0
-        if args[ argc ].__class__ != self.__class__:
-           raise AssertionError( "args[ argc ].__class__ != self.__class__" )
-        clone = args[ argc ]
-        
+    def _init__self( self, clone ):
         self.patchID_ = clone.patchID_
         self.faceIndex_ = clone.faceIndex_
         self.dir_ = clone.dir_
         self.value_ = clone.value_
+        self.globalFace_ = clone.globalFace_
         
         
         
@@ -160,42 +168,104 @@ class componentReference( PtrList_TypeBase ):
             from Foam.template import PtrList_INewBase
             PtrList_INewBase.__init__( self )
             self.mesh_ = mesh_
+            
+            # Global face index, built once for the first globalFace entry
+            self.index_ = None
             pass
 
 
     #---------------------------------------------------------------------------------
+        #- Read the next reference for PtrList, which keeps every entry. A
+        #  global face of another processor is an IOError, the references of
+        #  a decomposed case are read with componentReferenceList
         def __call__(self, is_):
-           try:
-              from Foam.OpenFOAM import dictionary
-              crDict = dictionary(is_)
-              from Foam.template import autoPtr_PtrList_TypeHolder
-              return autoPtr_PtrList_TypeHolder( componentReference( self.mesh_, crDict ) )
-           except Exception:
-              import sys, traceback
-              traceback.print_exc( file = sys.stdout )
+           from Foam.OpenFOAM import dictionary
+           crDict = dictionary(is_)
+           from Foam.OpenFOAM import word
+           if self.index_ is None and crDict.found( word( "globalFace" ) ):
+              from materialModels.globalFaceIndex import globalFaceIndex
+              self.index_ = globalFaceIndex.New( self.mesh_ )
               pass
+           from Foam.template import autoPtr_PtrList_TypeHolder
+           return autoPtr_PtrList_TypeHolder( componentReference( self.mesh_, crDict, self.index_ ) )
+
+
+    #---------------------------------------------------------------------------------
+        #- Read the next dictionary without building the reference. Return the
+        #  patch name ( None for a global face ), face, direction, value and
+        #  global face ( -1 if given by patch and face )
+        def entry( self, is_ ):
+           crDict = OpenFOAM.dictionary( is_ )
+           dir_ = componentReference.getDir( crDict )
+           value = OpenFOAM.readScalar( crDict.lookup( OpenFOAM.word( "value" ) ) )
+           if crDict.found( OpenFOAM.word( "globalFace" ) ):
+              return None, -1, dir_, value, OpenFOAM.readLabel( crDict.lookup( OpenFOAM.word( "globalFace" ) ) )
+           
+           return str( OpenFOAM.word( crDict.lookup( OpenFOAM.word( "patch" ) ) ) ), \
+                  OpenFOAM.readLabel( crDict.lookup( OpenFOAM.word( "face" ) ) ), dir_, value, -1
+
+
+    #---------------------------------------------------------------------------------
+        #- Read the list of reference dictionaries in one pass, as PtrList does,
+        #  yielding the raw entry of every one
+        def entries( self, is_ ):
+           firstToken = OpenFOAM.token( is_ )
+           if firstToken.isLabel():
+              is_.readBegin( "PtrList" )
+              for i in range( firstToken.labelToken() ):
+                  yield self.entry( is_ )
+              is_.readEnd( "PtrList" )
+              return
+           
+           if not firstToken.isPunctuation() or firstToken.pToken() != OpenFOAM.token.BEGIN_LIST:
+              raise IOError( "incorrect first token, expected <int> or '('" )
+           
+           while True:
+               lastToken = OpenFOAM.token( is_ )
+               if lastToken.isPunctuation() and lastToken.pToken() == OpenFOAM.token.END_LIST:
+                  return
+               is_.putBack( lastToken )
+               yield self.entry( is_ )
+
+
+    #---------------------------------------------------------------------------------
+        #- Read the list of reference dictionaries, yielding the references on
+        #  this processor. Those given by a global face of another processor
+        #  are dropped
+        def references( self, is_ ):
+           for patchName, face, dir_, value, globalFace in self.entries( is_ ):
+               if globalFace >= 0:
+                  if self.index_ is None:
+                     from materialModels.globalFaceIndex import globalFaceIndex
+                     self.index_ = globalFaceIndex.New( self.mesh_ )
+                     pass
+                  patches, faces = self.index_.lookup( globalFace )
+                  if patches[ 0 ] < 0:
+                     continue
+                  patchName = self.mesh_.boundaryMesh()[ int( patches[ 0 ] ) ].name()
+                  face = int( faces[ 0 ] )
+                  pass
+               reference = componentReference( self.mesh_, patchName, face, dir_, value )
+               reference.globalFace_ = globalFace
+               yield reference
     #---------------------------------------------------------------------------------
     
     #- Create direction given a name
-    def getDir( self, dict_ ):
-        from Foam.OpenFOAM import dictionary
+    @staticmethod
+    def getDir( dict_ ):
         try:
-            dictionary.ext_isinstance( dict_ )
+            OpenFOAM.dictionary.ext_isinstance( dict_ )
         except TypeError:
             raise AssertionError( "args[ argc ].__class__ != dictionary" )
         
-        from Foam.OpenFOAM import word
-        dirName = str( word( dict_.lookup( word( "direction" ) ) ) )
+        dirName = str( OpenFOAM.word( dict_.lookup( OpenFOAM.word( "direction" ) ) ) )
         
         if dirName == "x" or dirName == "X":
-           from Foam.OpenFOAM import vector
-           return vector.X
+           return OpenFOAM.vector.X
         elif dirName == "y" or dirName == "Y":
-           from Foam.OpenFOAM import vector
-           return vector.Y
+           return OpenFOAM.vector.Y
         elif dirName == "z" or dirName == "Z":
-           from Foam.OpenFOAM import vector
-           return vector.Z
+           return OpenFOAM.vector.Z
         else:
            raise IOError("Direction %s not recognize. Use x,y or z " %dirName )
      
@@ -204,9 +274,8 @@ class componentReference( PtrList_TypeBase ):
     #- Check if patch face is in range
     def checkPatchFace( self, mesh ):
 
-        from Foam.finiteVolume import fvMesh
         try:
-            fvMesh.ext_isinstance( mesh )
+            finiteVolume.fvMesh.ext_isinstance( mesh )
         except TypeError:
             raise AssertionError( "args[ argc ].__class__ != fvMesh" )
         
@@ -245,8 +314,17 @@ class componentReference( PtrList_TypeBase ):
         return self.value_
 
 
+    #--------------------------------------------------------------------------------
+    #- Return label of the face in the undecomposed mesh, -1 if given by patch and face
+    def globalFace( self ):
+        return self.globalFace_
+
+
 #------------------------------------------------------------------------------------
 
-       
+
+#------------------------------------------------------------------------------------
+from materialModels.componentReference.componentReferenceList import componentReferenceList
 
 
+#------------------------------------------------------------------------------------
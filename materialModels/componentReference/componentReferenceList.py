@@ -0,0 +1,167 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Compact list of componentReference. The entries are read through
+# componentReference.iNew in one pass, but instead of one object per
+# reference the patch index, face index, direction and value are kept in
+# contiguous arrays, sorted by patch, with the offsets of every patch
+#
+#     cr = componentReferenceList( mesh, stressProperties.lookup( word( "componentReference" ) ) )
+#     cr.patchReferences( patchI )     // slice of the references of the patch
+#     cr.groups().setReference( DUEqn )
+#
+# References given by a global face of another processor are dropped while
+# reading, as componentReference.iNew.references does.
+
+
+#----------------------------------------------------------------------------
+from materialModels.lazyImport import numpy
+
+
+#----------------------------------------------------------------------------
+class componentReferenceList( object ):
+    def __init__( self, mesh, is_ ):
+        from materialModels.componentReference import componentReference
+        self.mesh_ = mesh
+
+        # Patch names and sizes are queried once for all the references
+        boundaryMesh = mesh.boundaryMesh()
+        patchIndices = {}
+        patchSizes = numpy.empty( boundaryMesh.size(), numpy.int64 )
+        for patchI in range( boundaryMesh.size() ):
+            patchIndices[ str( boundaryMesh[ patchI ].name() ) ] = patchI
+            patchSizes[ patchI ] = boundaryMesh[ patchI ].size()
+
+        import array
+        patches = array.array( "l" )
+        faces = array.array( "l" )
+        dirs = array.array( "B" )
+        values = array.array( "d" )
+        globalFaces = array.array( "l" )
+        for patchName, face, dir_, value, globalFace in componentReference.iNew( mesh ).entries( is_ ):
+            if patchName is None:
+               patches.append( -1 )
+            elif patchIndices.has_key( patchName ):
+               patches.append( patchIndices[ patchName ] )
+            else:
+               raise AssertionError( "Non-existing patch or index out of range " )
+            faces.append( face )
+            dirs.append( dir_ )
+            values.append( value )
+            globalFaces.append( globalFace )
+
+        patches = numpy.frombuffer( patches, numpy.int_ ).astype( numpy.int64 )
+        faces = numpy.frombuffer( faces, numpy.int_ ).astype( numpy.int64 )
+        globalFaces = numpy.frombuffer( globalFaces, numpy.int_ ).astype( numpy.int64 )
+
+        # References given by global face are resolved on this processor or dropped
+        byGlobalFace = globalFaces >= 0
+        if byGlobalFace.any():
+           from materialModels.globalFaceIndex import globalFaceIndex
+           patches[ byGlobalFace ], faces[ byGlobalFace ] = globalFaceIndex.New( mesh ).lookup( globalFaces[ byGlobalFace ] )
+           pass
+
+        owned = patches >= 0
+        if numpy.any( faces[ owned ] < 0 ) or numpy.any( faces[ owned ] >= patchSizes[ patches[ owned ] ] ):
+           raise AssertionError( "Non-existing patch or index out of range " )
+
+        order = numpy.argsort( patches[ owned ], kind = "mergesort" )
+        self.patches_ = patches[ owned ][ order ].astype( numpy.int32 )
+        self.faces_ = faces[ owned ][ order ]
+        self.dirs_ = numpy.frombuffer( dirs, numpy.uint8 )[ owned ][ order ]
+        self.values_ = numpy.frombuffer( values, float )[ owned ][ order ]
+        self.globalFaces_ = globalFaces[ owned ][ order ]
+
+        # References of patch i are offsets_[ i ] to offsets_[ i + 1 ]
+        self.offsets_ = numpy.zeros( boundaryMesh.size() + 1, numpy.int64 )
+        numpy.cumsum( numpy.bincount( self.patches_, minlength = boundaryMesh.size() ), out = self.offsets_[ 1: ] )
+
+        self.groups_ = None
+        pass
+
+
+    #------------------------------------------------------------------------
+    def size( self ):
+        return self.patches_.shape[ 0 ]
+
+
+    #------------------------------------------------------------------------
+    def __len__( self ):
+        return self.size()
+
+
+    #------------------------------------------------------------------------
+    #- Return patch indices
+    def patchIndices( self ):
+        return self.patches_
+
+
+    #------------------------------------------------------------------------
+    #- Return face indices
+    def faceIndices( self ):
+        return self.faces_
+
+
+    #------------------------------------------------------------------------
+    #- Return directions
+    def dirs( self ):
+        return self.dirs_
+
+
+    #------------------------------------------------------------------------
+    #- Return values
+    def values( self ):
+        return self.values_
+
+
+    #------------------------------------------------------------------------
+    #- Return the slice of the references on the given patch
+    def patchReferences( self, patchI ):
+        return slice( self.offsets_[ patchI ], self.offsets_[ patchI + 1 ] )
+
+
+    #------------------------------------------------------------------------
+    #- Return the references grouped for bulk application
+    def groups( self ):
+        if self.groups_ is None:
+           from materialModels.componentReferenceGroups import componentReferenceGroups
+           self.groups_ = componentReferenceGroups( self.patches_, self.faces_, self.dirs_, self.values_ )
+           pass
+
+        return self.groups_
+
+
+    #------------------------------------------------------------------------
+    #- Return the i-th reference as a componentReference, built on demand
+    def __getitem__( self, i ):
+        from materialModels.componentReference import componentReference
+        patchName = self.mesh_.boundaryMesh()[ int( self.patches_[ i ] ) ].name()
+        result = componentReference( self.mesh_, patchName, int( self.faces_[ i ] ), int( self.dirs_[ i ] ), float( self.values_[ i ] ) )
+        result.globalFace_ = int( self.globalFaces_[ i ] )
+
+        return result
+
+
+#----------------------------------------------------------------------------
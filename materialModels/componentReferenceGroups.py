@@ -0,0 +1,139 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# componentReference constraints grouped by patch and direction, so that a
+# whole group is applied with one NumPy scatter instead of a Python call
+# per reference. The groups are built once and applied every iteration
+#
+#     groups = componentReferenceGroups.New( cr )
+#     ...
+#     groups.setReference( DUEqn )     // DUEqn.setComponentReference for all
+#     groups.apply( U )                // fix the components on the patches
+#
+# The references are resolved per processor while reading ( see
+# globalFaceIndex ), so every processor applies the references it holds.
+
+
+#----------------------------------------------------------------------------
+from materialModels.fieldArrays import toArray
+from materialModels.lazyImport import numpy
+
+
+#----------------------------------------------------------------------------
+class componentReferenceGroups( object ):
+    #- Construct from the patch index, face index, direction and value arrays
+    def __init__( self, patches, faces, dirs, values ):
+        patches = numpy.asarray( patches, numpy.int64 )
+        faces = numpy.asarray( faces, numpy.int64 )
+        dirs = numpy.asarray( dirs, numpy.int64 )
+        values = numpy.asarray( values, float )
+
+        order = numpy.lexsort( ( dirs, patches ) )
+        patches = patches[ order ]
+        dirs = dirs[ order ]
+        faces = faces[ order ]
+        values = values[ order ]
+
+        # ( patch, direction, faces, values ) of each group
+        self.groups_ = []
+        if patches.shape[ 0 ] != 0:
+           starts = numpy.nonzero( numpy.diff( patches ) | numpy.diff( dirs ) )[ 0 ] + 1
+           bounds = numpy.concatenate( ( [ 0 ], starts, [ patches.shape[ 0 ] ] ) )
+           for start, end in zip( bounds[ :-1 ], bounds[ 1: ] ):
+               self.groups_.append( ( int( patches[ start ] ), int( dirs[ start ] ), faces[ start : end ], values[ start : end ] ) )
+               pass
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Construct from the references
+    @staticmethod
+    def New( references ):
+        patches = []
+        faces = []
+        dirs = []
+        values = []
+        for reference in references:
+            patches.append( reference.patchIndex() )
+            faces.append( reference.faceIndex() )
+            dirs.append( reference.dir() )
+            values.append( reference.value() )
+
+        return componentReferenceGroups( patches, faces, dirs, values )
+
+
+    #------------------------------------------------------------------------
+    #- Return the ( patch, direction, faces, values ) groups
+    def groups( self ):
+        return self.groups_
+
+
+    #------------------------------------------------------------------------
+    #- Return number of references
+    def size( self ):
+        return sum( [ group[ 2 ].shape[ 0 ] for group in self.groups_ ] )
+
+
+    #------------------------------------------------------------------------
+    #- Add values at the faces to the direction component of a patch field
+    #  of vectors, or set them if add is false
+    def _scatter( self, patchField, dir_, faces, values, add ):
+        component = toArray( patchField, 3 )[ :, dir_ ]
+        if add:
+           numpy.add.at( component, faces, values )
+        else:
+           component[ faces ] = values
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Set the fixed component values on the boundary of the vector field
+    def apply( self, field ):
+        boundaryField = field.ext_boundaryField()
+        for patchI, dir_, faces, values in self.groups_:
+            self._scatter( boundaryField[ patchI ], dir_, faces, values, False )
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Set the reference levels of the vector matrix, as setComponentReference
+    #  does for every reference
+    def setReference( self, matrix ):
+        if not self.groups_ or not matrix.psi().needReference():
+           return
+
+        diag = toArray( matrix.diag() )
+        boundary = matrix.psi().mesh().boundary()
+        internalCoeffs = matrix.internalCoeffs()
+        boundaryCoeffs = matrix.boundaryCoeffs()
+        for patchI, dir_, faces, values in self.groups_:
+            faceCells = toArray( boundary[ patchI ].faceCells() )
+            cellDiag = diag[ faceCells[ faces ] ]
+            self._scatter( internalCoeffs[ patchI ], dir_, faces, cellDiag, True )
+            self._scatter( boundaryCoeffs[ patchI ], dir_, faces, cellDiag * values, True )
+        pass
+
+
+#----------------------------------------------------------------------------
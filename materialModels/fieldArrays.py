@@ -0,0 +1,87 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Conversion between the wrapped Foam fields and NumPy arrays. The fields
+# are viewed without a copy through the NumPy array interface, which the
+# wrapper must provide. Copying a field element by element from Python is
+# slower than the loops the vectorized code replaces, so a field without
+# the interface is an error rather than a silent fallback.
+
+
+#----------------------------------------------------------------------------
+from materialModels.lazyImport import numpy, OpenFOAM
+
+
+#----------------------------------------------------------------------------
+#- Classes checked so far for the array interface
+_viewClasses = {}
+
+
+#----------------------------------------------------------------------------
+#- Return true if the field data can be viewed by NumPy without a copy
+def hasView( field ):
+    cls = field.__class__
+    result = _viewClasses.get( cls )
+    if result is None:
+       result = _viewClasses[ cls ] = hasattr( field, "__array_interface__" ) or hasattr( field, "__array_struct__" )
+    return result
+
+
+#----------------------------------------------------------------------------
+#- Raise TypeError unless the field data can be viewed by NumPy
+def requireView( field ):
+    if not hasView( field ):
+       raise TypeError( "%s does not expose the NumPy array interface, materialModels needs "
+                        "a pythonFlu build with NumPy views of the fields" % field.__class__.__name__ )
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Return a view of the field data of shape ( size, ) or ( size, nComponents ),
+#  of the type of the field data, e.g. label lists give integer arrays
+def toArray( field, nComponents = 1 ):
+    requireView( field )
+    result = numpy.asarray( field )
+    if nComponents > 1:
+       result = result.reshape( -1, nComponents )
+    return result
+
+
+#----------------------------------------------------------------------------
+#- Copy the array into the field, nothing to do if the array is a view of it
+def assign( field, array ):
+    target = toArray( field )
+    if numpy.may_share_memory( target, array ):
+       return field
+    target.reshape( array.shape )[ ... ] = array
+    return field
+
+
+#----------------------------------------------------------------------------
+#- Build a new scalarField from the array
+def toScalarField( array ):
+    return assign( OpenFOAM.scalarField( array.shape[ 0 ], 0.0 ), array )
+
+
+#----------------------------------------------------------------------------
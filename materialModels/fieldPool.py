@@ -0,0 +1,224 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Bounded pool of the scratch volScalarFields of the material properties
+# ( rho, E, nu, Ep, sigmaY, ... ), keyed on the name, the dimensions and the
+# mesh. Fields are recycled only inside a scratch scope owned by the caller
+#
+#     with fieldPool.scratch():
+#         lawE = law.E()
+#         ...                     // lawE must not be kept past the scope
+#
+# The property fields acquired in the scope are released to the pool when
+# it is left and handed out again in the next scope. Outside of any scope
+# every call builds a new field, which the caller owns for good, so a field
+# or an array view of it is never refilled behind the back of its holder.
+#
+# The pool shared by the material models is set up from rheologyProperties
+#
+#     fieldPoolSize   16;       // number of pooled fields, 0 to switch off
+
+
+#----------------------------------------------------------------------------
+from materialModels.fieldArrays import toArray
+from materialModels.lazyImport import OpenFOAM, finiteVolume
+from materialModels.registryWatch import objectKey
+
+
+#----------------------------------------------------------------------------
+class fieldPool( object ):
+    def __init__( self, maxSize = 16 ):
+        # Released ( key, field ) entries, the most recently released last
+        self.entries_ = []
+        
+        # ( key, field ) entries acquired in every open scope, the innermost last
+        self.scopes_ = []
+        self.maxSize_ = max( int( maxSize ), 0 )
+        self.hits_ = 0
+        self.misses_ = 0
+        pass
+
+
+    #------------------------------------------------------------------------
+    def maxSize( self ):
+        return self.maxSize_
+
+
+    #------------------------------------------------------------------------
+    #- Change the number of pooled fields, dropping the oldest ones if needed
+    def setMaxSize( self, maxSize ):
+        self.maxSize_ = max( int( maxSize ), 0 )
+        del self.entries_[ : max( len( self.entries_ ) - self.maxSize_, 0 ) ]
+        pass
+
+
+    #------------------------------------------------------------------------
+    def size( self ):
+        return len( self.entries_ )
+
+
+    #------------------------------------------------------------------------
+    #- Return the numbers of requests served from the pool and not
+    def stats( self ):
+        return self.hits_, self.misses_
+
+
+    #------------------------------------------------------------------------
+    #- Return true if a scratch scope is open
+    def active( self ):
+        return len( self.scopes_ ) != 0
+
+
+    #------------------------------------------------------------------------
+    #- Open a scratch scope, see scratch
+    def open( self ):
+        self.scopes_.append( [] )
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Close the innermost scratch scope releasing the fields acquired in it
+    def close( self ):
+        for key, field in self.scopes_.pop():
+            self.release( key, field )
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return a released field stored under the key and accepted by match,
+    #  if given, or one made by make. The field belongs to the innermost
+    #  scope, it is not to be acquired outside of a scope
+    def acquire( self, key, make, match = None ):
+        if not self.active():
+           raise AssertionError( "fieldPool.acquire outside of a scratch scope" )
+        
+        result = None
+        for i in range( len( self.entries_ ) - 1, -1, -1 ):
+            if self.entries_[ i ][ 0 ] == key and ( match is None or match( self.entries_[ i ][ 1 ] ) ):
+               result = self.entries_.pop( i )[ 1 ]
+               break
+        
+        if result is None:
+           self.misses_ += 1
+           result = make()
+        else:
+           self.hits_ += 1
+        
+        self.scopes_[ -1 ].append( ( key, result ) )
+        
+        return result
+
+
+    #------------------------------------------------------------------------
+    #- Pool the field under the key, dropping the oldest entries if needed
+    def release( self, key, field ):
+        if self.maxSize_ == 0:
+           return
+
+        del self.entries_[ : max( len( self.entries_ ) + 1 - self.maxSize_, 0 ) ]
+        self.entries_.append( ( key, field ) )
+        pass
+
+
+    #------------------------------------------------------------------------
+    def clear( self ):
+        self.entries_ = []
+        pass
+
+
+#----------------------------------------------------------------------------
+_instance = fieldPool()
+
+
+#----------------------------------------------------------------------------
+#- Return the pool shared by the material models
+def instance():
+    return _instance
+
+
+#----------------------------------------------------------------------------
+#- Scratch scope of the shared pool, to be used in a with statement
+class scratch( object ):
+    def __enter__( self ):
+        _instance.open()
+        return _instance
+    
+    def __exit__( self, excType, excValue, traceback ):
+        _instance.close()
+        return False
+
+
+#----------------------------------------------------------------------------
+#- Set up the shared pool from the optional entry of the dictionary
+def configure( dict_ ):
+    from Foam.OpenFOAM import word, readLabel
+    if dict_.found( word( "fieldPoolSize" ) ):
+       _instance.setMaxSize( readLabel( dict_.lookup( word( "fieldPoolSize" ) ) ) )
+       pass
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Return a new volScalarField of the given name and dimensioned value with
+#  zero gradient patches. The boundary conditions are left to the caller
+def newField( name, mesh, value, db = None ):
+    if db is None:
+       db = mesh
+       pass
+
+    IOobject = OpenFOAM.IOobject
+    return finiteVolume.volScalarField( IOobject( OpenFOAM.word( str( name ) ),
+                                                  OpenFOAM.fileName( mesh.time().timeName() ),
+                                                  db,
+                                                  IOobject.NO_READ,
+                                                  IOobject.NO_WRITE ),
+                                        mesh,
+                                        value,
+                                        finiteVolume.zeroGradientFvPatchScalarField.typeName )
+
+
+#----------------------------------------------------------------------------
+#- Return a field as newField does, taken from the pool in a scratch scope.
+#  A pooled field is set to the value only if initialise is true, callers
+#  overwriting all the cells pass false
+def scratchField( name, mesh, value, db = None, initialise = True ):
+    if not _instance.active():
+       return newField( name, mesh, value, db )
+
+    # The C++ objects, a wrapped mesh is returned as a new proxy on every call
+    key = ( str( name ), objectKey( mesh ), objectKey( db or mesh ), mesh.nCells() )
+    made = []
+    def make():
+        made.append( True )
+        return newField( name, mesh, value, db )
+    
+    result = _instance.acquire( key, make, lambda field : field.dimensions() == value.dimensions() )
+    if initialise and not made:
+       toArray( result.internalField() ).fill( value.value() )
+       pass
+
+    return result
+
+
+#----------------------------------------------------------------------------
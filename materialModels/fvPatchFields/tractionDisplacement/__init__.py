@@ -31,133 +31,87 @@ from Foam.OpenFOAM import ext_Info, ext_Warning, ext_SeriousError, tab, nl
 #------------------------------------------------------------------------------------
 from Foam.finiteVolume import fixedGradientFvPatchVectorField
 
+#------------------------------------------------------------------------------------
+from materialModels.overloadTable import overloadTable, foamType, sameClass
+from materialModels.registryWatch import watchedObjects, objectKey
+from materialModels.fieldArrays import toArray, assign
+from materialModels.fvPatchFields.tractionDisplacement.tractionGradient import tractionGradient
+from materialModels.lazyImport import numpy, OpenFOAM, finiteVolume
+
+fvPatch_ = foamType( "Foam.finiteVolume", "fvPatch" )
+DimensionedField_vector_volMesh_ = foamType( "Foam.finiteVolume", "DimensionedField_vector_volMesh" )
+dictionary_ = foamType( "Foam.OpenFOAM", "dictionary" )
+fvPatchFieldMapper_ = foamType( "Foam.finiteVolume", "fvPatchFieldMapper" )
+
+
+#------------------------------------------------------------------------------------
+# ( registry, field name ) -> [ time index, pass, index of the patch updated last ]
+# of the tractionDisplacement patches of a field, see _pass. The passes are
+# numbered across all the fields, so a pass number is never handed out twice
+# and the entries of the past time steps can be dropped
+_passes = {}
+_passCount = [ 0 ]
+
+
 #------------------------------------------------------------------------------------
 class tractionDisplacementFvPatchVectorField( fixedGradientFvPatchVectorField ):
+    #- Constructors keyed on the number and the classes of the arguments
+    _constructors = overloadTable()
+    _constructors.add( "_init__fvPatch__DimensionedField_vector_volMesh", 
+                       fvPatch_, DimensionedField_vector_volMesh_ )
+    _constructors.add( "_init__fvPatch__DimensionedField_vector_volMesh__dictionary", 
+                       fvPatch_, DimensionedField_vector_volMesh_, dictionary_ )
+    _constructors.add( "_init__self__fvPatch__DimensionedField_vector_volMesh__mapper", 
+                       sameClass, fvPatch_, DimensionedField_vector_volMesh_, fvPatchFieldMapper_ )
+    _constructors.add( "_init__self", 
+                       sameClass )
+    _constructors.add( "_init__self__DimensionedField_vector_volMesh", 
+                       sameClass, DimensionedField_vector_volMesh_ )
+    
     def __init__( self, *args ):
-        try:
-            self._init__fvPatch__DimensionedField_vector_volMesh( *args )
-            return
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        try:
-            self._init__fvPatch__DimensionedField_vector_volMesh__dictionary( *args )
-            return
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-
-        try:
-            self._init__self__fvPatch__DimensionedField_vector_volMesh__mapper( *args )
-            return
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        try:
-            self._init__self( *args )
-            return
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        try:
-            self._init__self__DimensionedField_vector_volMesh( *args )
-            return
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        raise AssertionError()
+        tractionDisplacementFvPatchVectorField._constructors( self, *args )
+        pass
 
     #------------------------------------------------------------------------------------
     def type( self ) :
-        from Foam.OpenFOAM import word
-        return word( "tractionDisplacement" )
+        return OpenFOAM.word( "tractionDisplacement" )
     
     #------------------------------------------------------------------------------------
-    def _init__fvPatch__DimensionedField_vector_volMesh( self, *args ) :
-        if len( args ) != 2 :
-            raise AssertionError( "len( args ) != 2" )
-        argc = 0
-
-        from Foam.finiteVolume import fvPatch
-        try:
-            fvPatch.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvPatch" )
-        p = args[ argc ]; argc += 1
-        
-        from Foam.finiteVolume import DimensionedField_vector_volMesh
-        try:
-            DimensionedField_vector_volMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != DimensionedField_Vector_volMesh" )
-        iF = args[ argc ]; argc += 1
-        
+    def _init__fvPatch__DimensionedField_vector_volMesh( self, p, iF ) :
         fixedGradientFvPatchVectorField.__init__( self, p, iF )
         
         from Foam.OpenFOAM import word
         from Foam.OpenFOAM import vectorField, vector, scalarField
         self.UName_ = word( "undefined" )
         self.rheologyName_ = word( "undefined" )
-        self.traction_ = vectorField( p.size(), vector.zero)
-        self.pressure_ = scalarField(p.size(), 0.0)
+        from materialModels.sharedField import sharedField
+        self.traction_ = sharedField( vectorField( p.size(), vector.zero) )
+        self.pressure_ = sharedField( scalarField(p.size(), 0.0) )
+        self.batchGradient_ = None
+        self.handles_ = None
+        
+        from materialModels.fvPatchFields.tractionDisplacement.patchLoads import patchLoads
+        self.loads_ = patchLoads()
                 
         return self
 
 
     #------------------------------------------------------------------------------------
-    def _init__fvPatch__DimensionedField_vector_volMesh__dictionary( self, *args ) :
-        if len( args ) != 3 :
-            raise AssertionError( "len( args ) != 3" )
-        argc = 0
-        
-        from Foam.finiteVolume import fvPatch
-        try:
-            fvPatch.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvPatch" )
-        p = args[ argc ]; argc += 1
-
-        from Foam.finiteVolume import DimensionedField_vector_volMesh
-        try:
-            DimensionedField_vector_volMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != DimensionedField_Vector_volMesh" )
-        iF = args[ argc ]; argc += 1
-        
-        from Foam.OpenFOAM import dictionary
-        try:
-            dictionary.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != dictionary" )
-        dict_ = args[ argc ]; argc += 1
-
+    def _init__fvPatch__DimensionedField_vector_volMesh__dictionary( self, p, iF, dict_ ) :
         fixedGradientFvPatchVectorField.__init__( self, p, iF )
        
         from Foam.OpenFOAM import word
         from Foam.OpenFOAM import vectorField, vector, scalarField
         self.UName_ = word( dict_.lookup( word( "U" ) ) )
         self.rheologyName_ = word( dict_.lookup( word( "rheology" ) ) )
-        self.traction_ = vectorField( word( "traction" ) , dict_, p.size() )
-        self.pressure_ = scalarField( word( "pressure" ), dict_, p.size() )
+        from materialModels.sharedField import sharedField
+        self.traction_ = sharedField( vectorField( word( "traction" ) , dict_, p.size() ) )
+        self.pressure_ = sharedField( scalarField( word( "pressure" ), dict_, p.size() ) )
+        self.batchGradient_ = None
+        self.handles_ = None
+        
+        from materialModels.fvPatchFields.tractionDisplacement.patchLoads import patchLoads
+        self.loads_ = patchLoads.New( dict_, self.db().time() )
         
         self.ext_assign( self.patchInternalField() )
         self.gradient().ext_assign( vector.zero )
@@ -168,156 +122,99 @@ class tractionDisplacementFvPatchVectorField( fixedGradientFvPatchVectorField ):
 
         
     #------------------------------------------------------------------------------------
-    def _init__self__fvPatch__DimensionedField_vector_volMesh__mapper( self, *args ) :
-        if len( args ) != 4 :
-            raise AssertionError( "len( args ) != 4" )
-        argc = 0
-        
-        if args[ argc ].__class__ != self.__class__ :
-            raise AssertionError( "args[ argc ].__class__ != self.__class__" )
-        tdpvf = args[ argc ]; argc += 1
-        
-        from Foam.finiteVolume import fvPatch
-        try:
-            fvPatch.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvPatch" )
-        p = args[ argc ]; argc += 1
-
-        from Foam.finiteVolume import DimensionedField_vector_volMesh
-        try:
-            DimensionedField_vector_volMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != DimensionedField_Vector_volMesh" )
-        iF = args[ argc ]; argc += 1
-        
-        from Foam.finiteVolume import fvPatchFieldMapper
-        try:
-            fvPatchFieldMapper.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != fvPatchFieldMapper" )
-        mapper = args[ argc ]; argc += 1
-        
+    def _init__self__fvPatch__DimensionedField_vector_volMesh__mapper( self, tdpvf, p, iF, mapper ) :
         fixedGradientFvPatchVectorField.__init__( self, tdpvf, p, iF, mapper )
         
-        from Foam.OpenFOAM import word
         from Foam.OpenFOAM import vectorField, scalarField
         self.UName_ = tdpvf.UName_
         self.rheologyName_ = tdpvf.rheologyName_
-        self.traction_ = vectorField( tdpvf.traction_ , mapper )
-        self.pressure_ = scalarField( tdpvf.pressure_ , mapper )
+        from materialModels.sharedField import sharedField
+        self.traction_ = sharedField( vectorField( tdpvf.traction_() , mapper ) )
+        self.pressure_ = sharedField( scalarField( tdpvf.pressure_() , mapper ) )
+        self.batchGradient_ = None
+        self.handles_ = None
+        self.loads_ = tdpvf.loads_.clone()
         
         return self
 
 
     #------------------------------------------------------------------------------------
-    def _init__self( self, *args ) :
-        if len( args ) != 1 :
-            raise AssertionError( "len( args ) != 1" )
-        argc = 0
-        
-        if args[ argc ].__class__ != self.__class__ :
-            raise AssertionError( "args[ argc ].__class__ != self.__class__" )
-        tdpvf = args[ argc ]; argc += 1
-        
+    def _init__self( self, tdpvf ) :
         fixedGradientFvPatchVectorField.__init__( self, tdpvf )
 
-        from Foam.OpenFOAM import vectorField, scalarField
         self.UName_ = tdpvf.UName_
         self.rheologyName_ = tdpvf.rheologyName_
-        self.traction_ = tdpvf.traction_ 
-        self.pressure_ = tdpvf.pressure_ 
+        # Shared with tdpvf until one of them writes
+        self.traction_ = tdpvf.traction_.share()
+        self.pressure_ = tdpvf.pressure_.share()
+        self.batchGradient_ = None
+        self.handles_ = None
+        self.loads_ = tdpvf.loads_.clone()
         
         return self
         
         
     #------------------------------------------------------------------------------------
-    def _init__self__DimensionedField_vector_volMesh( self, *args ) :
-        if len( args ) != 2 :
-            raise AssertionError( "len( args ) != 2" )
-        argc = 0
-  
-        if args[ argc ].__class__ != self.__class__ :
-            raise AssertionError( "args[ argc ].__class__ != self.__class__" )
-        tdpvf = args[ argc ]; argc += 1
-        
-        from Foam.finiteVolume import DimensionedField_vector_volMesh
-        try:
-            DimensionedField_vector_volMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != DimensionedField_Vector_volMesh" )
-        iF = args[ argc ]; argc += 1
-        
+    def _init__self__DimensionedField_vector_volMesh( self, tdpvf, iF ) :
         fixedGradientFvPatchVectorField.__init__( self, tdpvf, iF )
         
-        from Foam.OpenFOAM import vectorField, scalarField
         self.UName_ = tdpvf.UName_
         self.rheologyName_ = tdpvf.rheologyName_
-        self.traction_ = tdpvf.traction_
-        self.pressure_ = tdpvf.pressure_ 
+        # Shared with tdpvf until one of them writes
+        self.traction_ = tdpvf.traction_.share()
+        self.pressure_ = tdpvf.pressure_.share()
+        self.batchGradient_ = None
+        self.handles_ = None
+        self.loads_ = tdpvf.loads_.clone()
         
         return self
         
         
     #------------------------------------------------------------------------------------
+    _clones = overloadTable()
+    _clones.add( "_clone" )
+    _clones.add( "_clone__DimensionedField_vector_volMesh", DimensionedField_vector_volMesh_ )
+    
     def clone( self, *args ) :
-        try:
-            return self._clone( *args )
-        except AssertionError:
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        try:
-            return self._clone__DimensionedField_vector_volMesh( *args )
-        except AssertionError :
-            pass
-        except Exception:
-            import sys, traceback
-            traceback.print_exc( file = sys.stdout )
-            pass
-        
-        raise AssertionError()
+        return tractionDisplacementFvPatchVectorField._clones( self, *args )
            
     #------------------------------------------------------------------------------------
-    def _clone( self, *args ) :
-        if len( args ) != 0 :
-            raise AssertionError( "len( args ) != 0" )
-
-        from Foam.finiteVolume import tmp_fvPatchField_vector
+    def _clone( self ) :
         obj = tractionDisplacementFvPatchVectorField( self )
 
-        return tmp_fvPatchField_vector( obj )
+        return finiteVolume.tmp_fvPatchField_vector( obj )
         
     #------------------------------------------------------------------------------------
-    def _clone__DimensionedField_vector_volMesh( self, *args ) :
-        if len( args ) != 1 :
-            raise AssertionError( "len( args ) != 1" )
-        argc = 0
-
-        from Foam.finiteVolume import DimensionedField_vector_volMesh
-        try:
-            DimensionedField_vector_volMesh.ext_isinstance( args[ argc ] )
-        except TypeError:
-            raise AssertionError( "args[ argc ].__class__ != DimensionedField_Vector_volMesh" )
-        iF = args[ argc ]; argc += 1
-
-        from Foam.finiteVolume import tmp_fvPatchField_vector
+    def _clone__DimensionedField_vector_volMesh( self, iF ) :
         obj = tractionDisplacementFvPatchVectorField( self, iF )
         
-        return tmp_fvPatchField_vector( obj )
+        return finiteVolume.tmp_fvPatchField_vector( obj )
     
     
     #------------------------------------------------------------------------------------
+    #- Return the traction for reading, it may be shared with copies of the patch field
     def traction(self):
-        return self.traction_
+        return self.traction_()
+    
+    
+    #------------------------------------------------------------------------------------
+    #- Return the traction for writing, a private copy if it was shared
+    def tractionRef(self):
+        self.loads_.modified()
+        return self.traction_.ref()
     
     
     #-------------------------------------------------------------------------------------
+    #- Return the pressure for reading, it may be shared with copies of the patch field
     def pressure(self):
-        return self.pressure_
+        return self.pressure_()
+    
+    
+    #-------------------------------------------------------------------------------------
+    #- Return the pressure for writing, a private copy if it was shared
+    def pressureRef(self):
+        self.loads_.modified()
+        return self.pressure_.ref()
     
     
     #-------------------------------------------------------------------------------------
@@ -328,10 +225,10 @@ class tractionDisplacementFvPatchVectorField( fixedGradientFvPatchVectorField ):
         argc = 0
         m = args[ argc ]
 
-        from Foam.finiteVolume import fixedGradientFvPatchVectorField
-        fixedGradientFvPatchVectorField.autoMap( self, m )
-        self.traction_.autoMap(m)
-        self.pressure_.autoMap(m)
+        finiteVolume.fixedGradientFvPatchVectorField.autoMap( self, m )
+        self.traction_.ref().autoMap(m)
+        self.pressure_.ref().autoMap(m)
+        self.loads_.clearOut()
         pass 
     
     
@@ -339,51 +236,181 @@ class tractionDisplacementFvPatchVectorField( fixedGradientFvPatchVectorField ):
     # Reverse-map the given fvPatchField onto this fvPatchField
     def rmap( self, *args ):
         
-        if len( args ) != 1 :
-            raise AssertionError( "len( args ) != 1" )
+        if len( args ) != 2 :
+            raise AssertionError( "len( args ) != 2" )
         argc = 0
         ptf = args[ argc ]; argc += 1
         addr = args[ argc ]
         
-        from Foam.finiteVolume import fixedGradientFvPatchVectorField
-        fixedGradientFvPatchVectorField.rmap( self, ptf, addr )
+        finiteVolume.fixedGradientFvPatchVectorField.rmap( self, ptf, addr )
 
-        dmptf = fixedGradientFvPatchVectorField.ext_refCast( ptf )
+        dmptf = finiteVolume.fixedGradientFvPatchVectorField.ext_refCast( ptf )
         
-        self.traction_.rmap(dmptf.traction_, addr);
-        self.pressure_.rmap(dmptf.pressure_, addr);
+        self.traction_.ref().rmap(dmptf.traction_(), addr);
+        self.pressure_.ref().rmap(dmptf.pressure_(), addr);
+        self.loads_.clearOut()
         pass
         
         
+    #---------------------------------------------------------------------------------------
+    #- Switch on to let the first tractionDisplacement patch updated in an
+    #  iteration evaluate the gradient of all such patches of the same field
+    #  in one pass. All of them are then expected to be updated together,
+    #  as done by correctBoundaryConditions
+    batched = False
+    
+    
+    #---------------------------------------------------------------------------------------
+    #- Return the rheology model and the grad(U) patch field. They are looked
+    #  up once and again only after the objects registered as rheologyName and
+    #  grad(UName) went missing or the mesh changed, see watchedObjects
+    def _handles( self ):
+        if self.handles_ is None:
+           from Foam.OpenFOAM import IOdictionary, word
+           from Foam.finiteVolume import volTensorField
+           rheologyName = self.rheologyName_
+           gradUName = word( "grad(" +str( self.UName_ ) + ")" )
+           patchI = self.patch().index()
+           
+           def lookup( db ):
+               return ( IOdictionary.ext_lookupObject( db, rheologyName ), 
+                        volTensorField.ext_lookupObject( db, gradUName ) )
+           
+           def derive( objects ):
+               return objects[ 0 ], objects[ 1 ].ext_boundaryField()[ patchI ]
+           
+           self.handles_ = watchedObjects( ( rheologyName, gradUName ), lookup, derive )
+           pass
+        
+        return self.handles_.handles( self.db(), self.patch().boundaryMesh().mesh() )
+    
+    
+    #---------------------------------------------------------------------------------------
+    #- Return the arrays the gradient kernel needs on this patch
+    def _gradientArgs( self ):
+        rheology, gradU = self._handles()
+        
+        if rheology.uniform():
+           # Uniform properties need no fields at all
+           mu = rheology.uniformMu().value()
+           lambda_ = rheology.uniformLambda().value()
+        else:
+           # Only the cells next to this patch are evaluated
+           mu = rheology.patchMu( self.patch().index() )
+           lambda_ = rheology.patchLambda( self.patch().index() )
+        
+        n = self.patch().nf()
+        
+        if not isinstance( mu, float ):
+           mu = toArray( mu )
+           lambda_ = toArray( lambda_ )
+        
+        traction = toArray( self.traction_(), 3 )
+        pressure = toArray( self.pressure_() )
+        if self.loads_.active():
+           traction, pressure = self.loads_.apply( self.patch(), self.db().time(), traction, pressure )
+        
+        return toArray( n, 3 ), toArray( gradU, 9 ), traction, pressure, mu, lambda_
+    
+    
+    #---------------------------------------------------------------------------------------
+    #- Return the ( time index, pass ) of this update. The patches of a field
+    #  are updated in the order of their indices, as correctBoundaryConditions
+    #  does, so updating a patch not after the one updated last starts a pass.
+    #  The registry is keyed on its C++ object, not on the proxy
+    def _pass( self ):
+        key = ( objectKey( self.db() ), str( self.dimensionedInternalField().name() ) )
+        timeIndex = self.db().time().timeIndex()
+        patchI = self.patch().index()
+        
+        state = _passes.get( key )
+        if state is None or state[ 0 ] != timeIndex:
+           # Entries of the other time steps are of no use any more
+           for other in [ other for other, value in _passes.items() if value[ 0 ] != timeIndex ]:
+               del _passes[ other ]
+           _passCount[ 0 ] += 1
+           state = _passes[ key ] = [ timeIndex, _passCount[ 0 ], patchI ]
+        elif patchI <= state[ 2 ]:
+           _passCount[ 0 ] += 1
+           state[ 1 : ] = [ _passCount[ 0 ], patchI ]
+        else:
+           state[ 2 ] = patchI
+        
+        return state[ 0 ], state[ 1 ]
+    
+    
+    #---------------------------------------------------------------------------------------
+    #- Return the tractionDisplacement patches to be evaluated together with this one
+    def _batchMembers( self ):
+        field = finiteVolume.volVectorField.ext_lookupObject( self.db(), self.dimensionedInternalField().name() )
+        boundaryField = field.ext_boundaryField()
+        
+        members = []
+        for patchI in range( boundaryField.size() ):
+            patchField = boundaryField[ patchI ]
+            if not isinstance( patchField, tractionDisplacementFvPatchVectorField ) or patchField.updated():
+               continue
+            if str( patchField.UName_ ) != str( self.UName_ ) or str( patchField.rheologyName_ ) != str( self.rheologyName_ ):
+               continue
+            members.append( patchField )
+        
+        if self not in members:
+           members.insert( 0, self )
+        
+        return members
+    
+    
+    #---------------------------------------------------------------------------------------
+    #- Evaluate the gradient of all batch members in one concatenated pass,
+    #  hand their slices tagged with the pass to the other members and return
+    #  the own one
+    def _batchGradient( self, tag ):
+        members = self._batchMembers()
+        
+        args = [ member._gradientArgs() for member in members ]
+        sizes = [ memberArgs[ 0 ].shape[ 0 ] for memberArgs in args ]
+        
+        def concatenate( argI ):
+            values = [ memberArgs[ argI ] for memberArgs in args ]
+            if isinstance( values[ 0 ], float ):
+               return values[ 0 ]
+            return numpy.concatenate( values )
+        
+        result = tractionGradient( *[ concatenate( argI ) for argI in range( 6 ) ] )
+        
+        result = numpy.split( result, numpy.cumsum( sizes )[ :-1 ] )
+        for member, memberResult in zip( members, result ):
+            if member is not self:
+               member.batchGradient_ = ( tag, memberResult )
+        
+        return result[ members.index( self ) ]
+    
+    
     #---------------------------------------------------------------------------------------
     def updateCoeffs(self):
         try:
            if self.updated():
               return
-
-           from Foam.OpenFOAM import IOdictionary
-           rheology = IOdictionary.ext_lookupObject( self.db(), self.rheologyName_ )
-           from Foam.OpenFOAM import scalarField
            
-           # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-           a_rheology_mu = rheology.mu()
-           a_rheology_mu_boundaryField = a_rheology_mu.ext_boundaryField()
-           mu = scalarField( a_rheology_mu_boundaryField[self.patch().index()] )
+           gradient = self.gradient()
            
-           a_rheology_lambda = rheology._lambda()
-           a_rheology_lambda_boundaryField = a_rheology_lambda.ext_boundaryField()
-           lambda_ = scalarField( a_rheology_lambda_boundaryField[ self.patch().index() ] )
-
-           n = self.patch().nf()
-           from Foam.finiteVolume import volTensorField
-           from Foam.OpenFOAM import word
-           gradU =volTensorField.ext_lookupPatchField( self.patch(), word( "grad(" +str( self.UName_ ) + ")" ) )
+           tag = self._pass()
+           batchGradient, self.batchGradient_ = self.batchGradient_, None
+           if batchGradient is not None and batchGradient[ 0 ] == tag:
+              # Already evaluated by the first patch of the batch in this pass
+              result = batchGradient[ 1 ]
+           else:
+              # A result of another pass is stale, evaluated on this patch only
+              if tractionDisplacementFvPatchVectorField.batched and batchGradient is None:
+                 result = self._batchGradient( tag )
+              else:
+                 # Written straight into the gradient
+                 result = tractionGradient( *( self._gradientArgs() + ( toArray( gradient, 3 ), ) ) )
+                 pass
+              pass
            
-           from Foam.OpenFOAM import ext_Info
-           self.gradient().ext_assign( ( ( self.traction_ -  self.pressure_ * n ) - ( n & ( mu * gradU.ext_T() - ( mu + lambda_ ) * gradU ) ) \
-                                          - n * lambda_ * gradU.tr() ) / ( 2.0 * mu + lambda_) )
+           assign( gradient, result )
            
-           from Foam.finiteVolume import fixedGradientFvPatchVectorField
            fixedGradientFvPatchVectorField.updateCoeffs( self )
         except Exception, exc:
             import sys, traceback
@@ -400,8 +427,9 @@ class tractionDisplacementFvPatchVectorField( fixedGradientFvPatchVectorField ):
            from Foam.OpenFOAM import word, token
            os.writeKeyword( word( "U" ) ) << self.UName_ << token( token.END_STATEMENT ) << nl
            os.writeKeyword( word( "rheology" ) ) << self.rheologyName_ << token( token.END_STATEMENT ) << nl
-           self.traction_.writeEntry( word( "traction" ), os)
-           self.pressure_.writeEntry( word( "pressure" ), os)
+           self.traction_().writeEntry( word( "traction" ), os)
+           self.pressure_().writeEntry( word( "pressure" ), os)
+           self.loads_.write( os )
            self.writeEntry( word( "value" ), os)
            pass
         except Exception, exc:
@@ -0,0 +1,402 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Time-varying part of the tractionDisplacement loads. On top of the static
+# per-face traction and pressure the patch dictionary may give
+#
+#     tractionSeries        "<file>";     // columns : time Tx Ty Tz, or time T
+#     tractionDirection     ( 0 0 -1 );   // needed unless the series is a vector
+#     tractionDistribution  "<expr>";     // scalar function of x, y, z
+#     pressureSeries        "<file>";     // columns : time p
+#     pressureDistribution  "<expr>";     // scalar function of x, y, z, t
+#     cyclicSeries          yes;          // repeat the series periodically
+#
+# and the load added at time t on a face with centre ( x, y, z ) is
+# distribution( x, y, z, t ) * series( t ), times the direction for traction
+# if given. A missing distribution is one, a distribution without series
+# and without t is constant in time. A scalar traction is never spread over
+# the three components, it needs the direction.
+#
+# A distribution is an arithmetic expression of numbers, x, y, z, t, pi and
+# the functions listed in spatialFunction, anything else is rejected when
+# the dictionary is read.
+
+
+#----------------------------------------------------------------------------
+#- Piecewise linear table of a scalar or vector quantity against time,
+#  clamped outside its range or repeated if cyclic
+class timeSeries( object ):
+    def __init__( self, times, values, cyclic = False ):
+        import numpy
+        self.times_ = numpy.asarray( times, float )
+        self.values_ = numpy.asarray( values, float )
+        self.cyclic_ = cyclic
+
+        if self.times_.shape[ 0 ] < 2 or numpy.any( numpy.diff( self.times_ ) <= 0.0 ):
+           raise IOError( "The time series needs at least two strictly increasing times" )
+
+        # Interpolation coefficients are computed once, a lookup is then O(1)
+        dt = numpy.diff( self.times_ )
+        self.slopes_ = numpy.diff( self.values_, axis = 0 ) / dt.reshape( ( -1, ) + ( 1, ) * ( self.values_.ndim - 1 ) )
+        self.period_ = self.times_[ -1 ] - self.times_[ 0 ]
+        self.uniform_ = numpy.allclose( dt, dt[ 0 ] )
+        self.dt_ = dt[ 0 ]
+        self.cursor_ = 0
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return the tabulated values, of shape ( size, ) or ( size, nComponents )
+    def values( self ):
+        return self.values_
+
+
+    #------------------------------------------------------------------------
+    #- Read the series from the columns of a text file
+    @staticmethod
+    def read( fileName_, cyclic = False ):
+        import numpy
+        data = numpy.loadtxt( str( fileName_ ), ndmin = 2 )
+        values = data[ :, 1: ]
+        if values.shape[ 1 ] == 1:
+           values = values[ :, 0 ]
+
+        return timeSeries( data[ :, 0 ], values, cyclic )
+
+
+    #------------------------------------------------------------------------
+    #- Return the interval containing t
+    def _interval( self, t ):
+        times = self.times_
+        nIntervals = times.shape[ 0 ] - 1
+        if self.uniform_:
+           return min( int( ( t - times[ 0 ] ) / self.dt_ ), nIntervals - 1 )
+
+        # Time goes forward, so the last interval is the best first guess
+        i = self.cursor_
+        if t < times[ i ]:
+           import bisect
+           i = max( bisect.bisect_right( times, t ) - 1, 0 )
+        while i < nIntervals - 1 and t >= times[ i + 1 ]:
+           i += 1
+        self.cursor_ = i
+
+        return i
+
+
+    #------------------------------------------------------------------------
+    #- Return the value at time t
+    def __call__( self, t ):
+        times = self.times_
+        if self.cyclic_:
+           t = times[ 0 ] + ( t - times[ 0 ] ) % self.period_
+        if t <= times[ 0 ]:
+           return self.values_[ 0 ]
+        if t >= times[ -1 ]:
+           return self.values_[ -1 ]
+
+        i = self._interval( t )
+
+        return self.values_[ i ] + self.slopes_[ i ] * ( t - times[ i ] )
+
+
+#----------------------------------------------------------------------------
+#- Scalar function of the face centre coordinates x, y, z and the time t
+#  given as an expression of NumPy functions, evaluated on whole arrays at
+#  once. The expression is parsed and checked node by node before it is
+#  compiled, so only arithmetic on the names below can be evaluated
+class spatialFunction( object ):
+    variables = ( "x", "y", "z", "t" )
+    constants = ( "pi", )
+    functions = ( "sin", "cos", "tan", "exp", "log", "sqrt", "abs", "minimum", "maximum", "where" )
+    operators = ( "Add", "Sub", "Mult", "Div", "Mod", "Pow", "UAdd", "USub", "Lt", "LtE", "Gt", "GtE", "Eq", "NotEq" )
+
+    def __init__( self, expression ):
+        import ast
+        self.expression_ = str( expression )
+        try:
+            tree = ast.parse( self.expression_.strip(), "<spatialFunction>", "eval" )
+        except SyntaxError, error:
+            raise IOError( "Syntax error in the expression %s : %s" % ( self.expression_, error ) )
+        
+        self.names_ = set()
+        self._check( tree.body )
+        self.code_ = compile( tree, "<spatialFunction>", "eval" )
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Raise IOError unless the node is made of numbers, the variables, the
+    #  constants, calls of the functions and the operators only
+    def _check( self, node ):
+        import ast
+        children = []
+        if isinstance( node, ast.Num ):
+           pass
+        elif isinstance( node, ast.Name ) and node.id in self.variables + self.constants:
+           self.names_.add( node.id )
+        elif isinstance( node, ast.BinOp ) and node.op.__class__.__name__ in self.operators:
+           children = [ node.left, node.right ]
+        elif isinstance( node, ast.UnaryOp ) and node.op.__class__.__name__ in self.operators:
+           children = [ node.operand ]
+        elif isinstance( node, ast.Compare ) and all( [ op.__class__.__name__ in self.operators for op in node.ops ] ):
+           children = [ node.left ] + node.comparators
+        elif isinstance( node, ast.Call ) and isinstance( node.func, ast.Name ) and node.func.id in self.functions \
+             and not node.keywords and node.starargs is None and node.kwargs is None:
+           children = node.args
+        else:
+           what = node.__class__.__name__
+           if isinstance( node, ast.Name ):
+              what = "the name " + node.id
+           elif isinstance( node, ast.Call ):
+              what = "this call"
+           raise IOError( "%s is not allowed in the expression %s, use numbers, %s and the functions %s"
+                          % ( what, self.expression_, ", ".join( self.variables + self.constants ), ", ".join( self.functions ) ) )
+        
+        for child in children:
+            self._check( child )
+        pass
+
+
+    #------------------------------------------------------------------------
+    def expression( self ):
+        return self.expression_
+
+
+    #------------------------------------------------------------------------
+    #- Return true if the expression depends on the time
+    def timeDependent( self ):
+        return "t" in self.names_
+
+
+    #------------------------------------------------------------------------
+    #- Return the function values for the centres of shape ( size, 3 ) at time t
+    def __call__( self, C, t = 0.0 ):
+        import numpy
+        namespace = dict( [ ( name, getattr( numpy, name ) ) for name in self.constants + self.functions ] )
+        namespace.update( { "x" : C[ :, 0 ], "y" : C[ :, 1 ], "z" : C[ :, 2 ], "t" : t } )
+
+        return numpy.zeros( C.shape[ 0 ] ) + eval( self.code_, { "__builtins__" : {} }, namespace )
+
+
+#----------------------------------------------------------------------------
+class patchLoads( object ):
+    def __init__( self, tractionSeries = None, tractionDistribution = None,
+                  pressureSeries = None, pressureDistribution = None, cyclic = False,
+                  tractionFile = None, pressureFile = None, tractionDirection = None ):
+        import numpy
+        self.tractionSeries_ = tractionSeries
+        self.tractionDistribution_ = tractionDistribution
+        self.pressureSeries_ = pressureSeries
+        self.pressureDistribution_ = pressureDistribution
+        self.cyclic_ = cyclic
+        self.tractionFile_ = tractionFile
+        self.pressureFile_ = pressureFile
+        self.tractionDirection_ = None
+        if tractionDirection is not None:
+           self.tractionDirection_ = numpy.asarray( tractionDirection, float ).reshape( 3 )
+
+        vectorSeries = tractionSeries is not None and tractionSeries.values().ndim == 2
+        if vectorSeries and tractionSeries.values().shape[ 1 ] != 3:
+           raise IOError( "tractionSeries must have the columns time Tx Ty Tz or time T" )
+        if vectorSeries and self.tractionDirection_ is not None:
+           raise IOError( "tractionDirection is given for the vector tractionSeries %s" % tractionFile )
+        if ( tractionSeries is not None or tractionDistribution is not None ) \
+           and not vectorSeries and self.tractionDirection_ is None:
+           raise IOError( "A scalar traction load needs tractionDirection, or tractionSeries of Tx Ty Tz" )
+
+        self.clearOut()
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Read the optional load entries of the patch dictionary
+    @staticmethod
+    def New( dict_, time ):
+        from Foam.OpenFOAM import word, fileName, string, Switch
+
+        cyclic = False
+        if dict_.found( word( "cyclicSeries" ) ):
+           cyclic = bool( Switch( dict_.lookup( word( "cyclicSeries" ) ) ) )
+
+        def series( keyword ):
+            if not dict_.found( word( keyword ) ):
+               return None, None
+            name = fileName( dict_.lookup( word( keyword ) ) )
+            name.expand()
+            path = str( name )
+            if not name.isAbsolute():
+               import os
+               path = os.path.join( str( time.path() ), path )
+            return timeSeries.read( path, cyclic ), name
+
+        def distribution( keyword ):
+            if not dict_.found( word( keyword ) ):
+               return None
+            return spatialFunction( str( string( dict_.lookup( word( keyword ) ) ) ) )
+
+        tractionSeries, tractionFile = series( "tractionSeries" )
+        pressureSeries, pressureFile = series( "pressureSeries" )
+
+        tractionDirection = None
+        if dict_.found( word( "tractionDirection" ) ):
+           from Foam.OpenFOAM import vector
+           direction = vector( dict_.lookup( word( "tractionDirection" ) ) )
+           tractionDirection = ( direction.x(), direction.y(), direction.z() )
+
+        return patchLoads( tractionSeries, distribution( "tractionDistribution" ),
+                           pressureSeries, distribution( "pressureDistribution" ),
+                           cyclic, tractionFile, pressureFile, tractionDirection )
+
+
+    #------------------------------------------------------------------------
+    #- Return a copy for another patch, the tables are shared
+    def clone( self ):
+        return patchLoads( self.tractionSeries_, self.tractionDistribution_,
+                           self.pressureSeries_, self.pressureDistribution_,
+                           self.cyclic_, self.tractionFile_, self.pressureFile_,
+                           self.tractionDirection_ )
+
+
+    #------------------------------------------------------------------------
+    #- Return true if any time-varying or spatial load is given
+    def active( self ):
+        return self.tractionSeries_ is not None or self.tractionDistribution_ is not None \
+               or self.pressureSeries_ is not None or self.pressureDistribution_ is not None
+
+
+    #------------------------------------------------------------------------
+    #- Clear the cached face-centre terms, e.g. after mapping
+    def clearOut( self ):
+        self.distributions_ = None
+        self.loadsTimeIndex_ = None
+        self.loads_ = None
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Drop the loads of the current time step after the static loads changed
+    def modified( self ):
+        self.loads_ = None
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return true if a distribution depends on the time
+    def _timeDependent( self ):
+        return any( [ distribution is not None and distribution.timeDependent()
+                      for distribution in ( self.tractionDistribution_, self.pressureDistribution_ ) ] )
+
+
+    #------------------------------------------------------------------------
+    #- Return the distributions on the face centres, evaluated once unless the
+    #  mesh moves or they depend on the time
+    def _distributions( self, patch, time ):
+        if self.distributions_ is not None and not patch.boundaryMesh().mesh().moving() and not self._timeDependent():
+           return self.distributions_
+
+        from materialModels.fieldArrays import toArray
+        C = toArray( patch.Cf(), 3 )
+
+        tractionDistribution = None
+        if self.tractionDistribution_ is not None:
+           tractionDistribution = self.tractionDistribution_( C, time.value() ).reshape( -1, 1 )
+
+        pressureDistribution = None
+        if self.pressureDistribution_ is not None:
+           pressureDistribution = self.pressureDistribution_( C, time.value() )
+
+        self.distributions_ = ( tractionDistribution, pressureDistribution )
+
+        return self.distributions_
+
+
+    #------------------------------------------------------------------------
+    #- Return the load term given its distribution and series
+    def _term( self, distribution, series, t ):
+        if series is None:
+           return distribution
+        if distribution is None:
+           return series( t )
+        return distribution * series( t )
+
+
+    #------------------------------------------------------------------------
+    #- Return the traction term, of shape ( 3, ) or ( size, 3 )
+    def _tractionTerm( self, distribution, t ):
+        if self.tractionDirection_ is None:
+           # A vector series, checked on construction
+           return self._term( distribution, self.tractionSeries_, t )
+        
+        if distribution is None:
+           return self.tractionSeries_( t ) * self.tractionDirection_
+        
+        return self._term( distribution, self.tractionSeries_, t ) * self.tractionDirection_
+
+
+    #------------------------------------------------------------------------
+    #- Return traction and pressure arrays with the time-varying loads added,
+    #  evaluated once per time step
+    def apply( self, patch, time, traction, pressure ):
+        timeIndex = time.timeIndex()
+        if self.loads_ is not None and self.loadsTimeIndex_ == timeIndex:
+           return self.loads_
+
+        tractionDistribution, pressureDistribution = self._distributions( patch, time )
+        t = time.value()
+
+        if self.tractionSeries_ is not None or tractionDistribution is not None:
+           traction = traction + self._tractionTerm( tractionDistribution, t )
+        if self.pressureSeries_ is not None or pressureDistribution is not None:
+           pressure = pressure + self._term( pressureDistribution, self.pressureSeries_, t )
+
+        self.loads_ = ( traction, pressure )
+        self.loadsTimeIndex_ = timeIndex
+
+        return self.loads_
+
+
+    #------------------------------------------------------------------------
+    def write( self, os ):
+        from Foam.OpenFOAM import word, string, Switch, token, nl
+        if self.tractionFile_ is not None:
+           os.writeKeyword( word( "tractionSeries" ) ) << self.tractionFile_ << token( token.END_STATEMENT ) << nl
+        if self.tractionDirection_ is not None:
+           from Foam.OpenFOAM import vector
+           os.writeKeyword( word( "tractionDirection" ) ) << vector( *self.tractionDirection_ ) \
+                                                          << token( token.END_STATEMENT ) << nl
+        if self.tractionDistribution_ is not None:
+           os.writeKeyword( word( "tractionDistribution" ) ) << string( self.tractionDistribution_.expression() ) \
+                                                             << token( token.END_STATEMENT ) << nl
+        if self.pressureFile_ is not None:
+           os.writeKeyword( word( "pressureSeries" ) ) << self.pressureFile_ << token( token.END_STATEMENT ) << nl
+        if self.pressureDistribution_ is not None:
+           os.writeKeyword( word( "pressureDistribution" ) ) << string( self.pressureDistribution_.expression() ) \
+                                                             << token( token.END_STATEMENT ) << nl
+        if self.cyclic_:
+           os.writeKeyword( word( "cyclicSeries" ) ) << Switch( True ) << token( token.END_STATEMENT ) << nl
+        pass
+
+
+#----------------------------------------------------------------------------
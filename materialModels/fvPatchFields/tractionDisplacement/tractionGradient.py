@@ -0,0 +1,78 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+from materialModels.lazyImport import numpy
+
+
+#----------------------------------------------------------------------------
+#- Return the per-face coefficient as a column for broadcasting over vectors
+def _column( value ):
+    value = numpy.asarray( value, float )
+    if value.ndim == 0:
+       return value
+    return value.reshape( -1, 1 )
+
+
+#----------------------------------------------------------------------------
+#- Evaluate the tractionDisplacement gradient
+#
+#      ( ( traction - pressure*n ) - ( n & ( mu*gradU.T() - ( mu + lambda )*gradU ) )
+#        - n*lambda*tr( gradU ) ) / ( 2*mu + lambda )
+#
+#  on arrays : n and traction of shape ( size, 3 ), gradU of shape ( size, 9 )
+#  or ( size, 3, 3 ), pressure of shape ( size, ), mu and lambda either
+#  floats or of shape ( size, ). The result is written into out if given
+def tractionGradient( n, gradU, traction, pressure, mu, _lambda, out = None ):
+    gradU = numpy.asarray( gradU ).reshape( -1, 3, 3 )
+    mu = _column( mu )
+    _lambda = _column( _lambda )
+
+    if out is None:
+       out = numpy.empty( traction.shape )
+
+    # traction - pressure*n
+    numpy.multiply( n, numpy.asarray( pressure ).reshape( -1, 1 ), out = out )
+    numpy.subtract( traction, out, out = out )
+
+    # n & gradU.T() and n & gradU
+    nGradUT = numpy.einsum( "fji,fi->fj", gradU, n )
+    nGradU = numpy.einsum( "fij,fi->fj", gradU, n )
+
+    nGradUT *= mu
+    out -= nGradUT
+
+    nGradU *= mu + _lambda
+    out += nGradU
+
+    # n*lambda*tr( gradU ), nGradUT is reused as the temporary
+    lambdaTr = numpy.einsum( "fii->f", gradU ).reshape( -1, 1 ) * _lambda
+    numpy.multiply( n, lambdaTr, out = nGradUT )
+    out -= nGradUT
+
+    out /= 2.0 * mu + _lambda
+
+    return out
+
+
+#----------------------------------------------------------------------------
@@ -0,0 +1,155 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Index from the face labels of the undecomposed mesh to the boundary faces
+# of this processor. Every rank indexes its own boundary faces only, so the
+# memory and the set-up work are split between the ranks, and a global
+# boundary face is owned by exactly one rank. Faces of coupled ( processor,
+# cyclic ) patches are left out, they cannot carry a reference.
+
+
+#----------------------------------------------------------------------------
+from materialModels.lazyImport import numpy
+from materialModels.registryWatch import objectKey
+
+
+#----------------------------------------------------------------------------
+# C++ mesh -> ( patch starts, sizes and coupling, index ) of the indices
+# built by New, rebuilt when the patches of the mesh change
+_indices = {}
+
+
+#----------------------------------------------------------------------------
+class globalFaceIndex( object ):
+    #- Construct from the global face label of every local face, None on
+    #  an undecomposed mesh, and the start, size and coupling of the patches
+    def __init__( self, addressing, patchStarts, patchSizes, patchCoupled ):
+        faces = []
+        patches = []
+        for patchI in range( len( patchStarts ) ):
+            if patchCoupled[ patchI ] or patchSizes[ patchI ] == 0:
+               continue
+            faces.append( numpy.arange( patchStarts[ patchI ], patchStarts[ patchI ] + patchSizes[ patchI ] ) )
+            patches.append( numpy.repeat( patchI, patchSizes[ patchI ] ) )
+
+        if faces:
+           faces = numpy.concatenate( faces )
+           patches = numpy.concatenate( patches )
+        else:
+           faces = numpy.zeros( 0, numpy.int64 )
+           patches = numpy.zeros( 0, numpy.int64 )
+
+        globalFaces = faces
+        if addressing is not None:
+           globalFaces = numpy.asarray( addressing )[ faces ]
+
+        order = numpy.argsort( globalFaces, kind = "mergesort" )
+        self.globalFaces_ = globalFaces[ order ]
+        self.patches_ = patches[ order ]
+        self.faces_ = ( faces - numpy.asarray( patchStarts, numpy.int64 )[ patches ] )[ order ]
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return the index of the mesh, reading faceProcAddressing in a parallel
+    #  run. The index is built once per mesh and patch layout
+    @staticmethod
+    def New( mesh ):
+        from Foam.OpenFOAM import Pstream
+        boundaryMesh = mesh.boundaryMesh()
+        patchStarts = []
+        patchSizes = []
+        patchCoupled = []
+        for patchI in range( boundaryMesh.size() ):
+            patchStarts.append( boundaryMesh[ patchI ].start() )
+            patchSizes.append( boundaryMesh[ patchI ].size() )
+            patchCoupled.append( boundaryMesh[ patchI ].coupled() )
+
+        layout = ( tuple( patchStarts ), tuple( patchSizes ), tuple( patchCoupled ) )
+        cached = _indices.get( objectKey( mesh ) )
+        if cached is not None and cached[ 0 ] == layout:
+           return cached[ 1 ]
+
+        addressing = None
+        if Pstream.parRun():
+           addressing = decodeAddressing( readAddressing( mesh ) )
+           pass
+
+        result = globalFaceIndex( addressing, patchStarts, patchSizes, patchCoupled )
+        _indices[ objectKey( mesh ) ] = ( layout, result )
+
+        return result
+
+
+    #------------------------------------------------------------------------
+    #- Return number of the indexed faces
+    def size( self ):
+        return self.globalFaces_.shape[ 0 ]
+
+
+    #------------------------------------------------------------------------
+    #- Return patch and patch face indices of the given global faces,
+    #  -1 for the faces this processor does not own
+    def lookup( self, globalFaces ):
+        globalFaces = numpy.atleast_1d( numpy.asarray( globalFaces, numpy.int64 ) )
+        patches = numpy.empty( globalFaces.shape[ 0 ], numpy.int64 )
+        patches.fill( -1 )
+        faces = patches.copy()
+        if self.globalFaces_.shape[ 0 ] == 0:
+           return patches, faces
+
+        position = numpy.searchsorted( self.globalFaces_, globalFaces )
+        position[ position == self.globalFaces_.shape[ 0 ] ] = 0
+        owned = self.globalFaces_[ position ] == globalFaces
+
+        patches[ owned ] = self.patches_[ position[ owned ] ]
+        faces[ owned ] = self.faces_[ position[ owned ] ]
+
+        return patches, faces
+
+
+#----------------------------------------------------------------------------
+#- Read the faceProcAddressing of the processor mesh
+def readAddressing( mesh ):
+    from Foam.OpenFOAM import labelIOList, IOobject, word, polyMesh
+    from materialModels.fieldArrays import toArray
+    addressing = labelIOList( IOobject( word( "faceProcAddressing" ),
+                                        mesh.facesInstance(),
+                                        polyMesh.meshSubDir,
+                                        mesh,
+                                        IOobject.MUST_READ,
+                                        IOobject.NO_WRITE ) )
+
+    return toArray( addressing )
+
+
+#----------------------------------------------------------------------------
+#- Turn the faceProcAddressing entries, the global face label plus one
+#  signed by the face flip, into global face labels
+def decodeAddressing( addressing ):
+    return numpy.abs( numpy.asarray( addressing, numpy.int64 ) ) - 1
+
+
+#----------------------------------------------------------------------------
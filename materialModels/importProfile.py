@@ -0,0 +1,164 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Import-time profile of materialModels, to keep an eye on the start up cost
+# of short runs. Every module imported for the first time while the targets
+# are imported is timed, with the time spent in its own body ( self ) and
+# including the modules it imports ( cumulative ).
+#
+#     python -m materialModels.importProfile [ --json=<file> ] [ --budget=<ms> ] [ <module> ... ]
+#
+# Each profile should be taken in a fresh interpreter, modules imported
+# before are not seen. Given a budget, the exit status is non-zero when the
+# total import time exceeds it, so that a test run can keep the start up
+# cost in check.
+
+
+#----------------------------------------------------------------------------
+defaultTargets = ( "materialModels.rheologyModel",
+                   "materialModels.rheologyModel.rheologyLaws",
+                   "materialModels.fvPatchFields.tractionDisplacement",
+                   "materialModels.componentReference" )
+
+
+#----------------------------------------------------------------------------
+#- Return the full name of the imported module, Python 2 first looks for
+#  a plain name in the package of the importing module
+def _resolved( name, args ):
+    import sys
+    if not args or not args[ 0 ]:
+       return name
+
+    package = args[ 0 ].get( "__name__", "" )
+    if not args[ 0 ].has_key( "__path__" ):
+       package = package.rpartition( "." )[ 0 ]
+    if package and sys.modules.get( package + "." + name ) is not None:
+       return package + "." + name
+
+    return name
+
+
+#----------------------------------------------------------------------------
+#- Import the target modules and return the records
+#  [ ( module, depth, cumulative seconds, self seconds ) ] in import order
+#  and the errors { target : message }
+def profile( targets ):
+    import sys, time
+    import __builtin__
+
+    records = []
+    stack = []
+    original = __builtin__.__import__
+
+    def timedImport( name, *args, **kwargs ):
+        if sys.modules.has_key( name ):
+           return original( name, *args, **kwargs )
+
+        record = [ name, len( stack ), 0.0, 0.0 ]
+        records.append( record )
+        stack.append( 0.0 )
+        start = time.time()
+        try:
+            return original( name, *args, **kwargs )
+        finally:
+            elapsed = time.time() - start
+            children = stack.pop()
+            record[ 0 ] = _resolved( name, args )
+            record[ 2 ] = elapsed
+            record[ 3 ] = elapsed - children
+            if stack:
+               stack[ -1 ] += elapsed
+               pass
+            pass
+
+    errors = {}
+    __builtin__.__import__ = timedImport
+    try:
+        for target in targets:
+            try:
+                __import__( target )
+            except Exception, exc:
+                errors[ target ] = "%s: %s" % ( exc.__class__.__name__, exc )
+                pass
+    finally:
+        __builtin__.__import__ = original
+
+    # Drop the names that did not resolve to a module
+    records = [ tuple( record ) for record in records if sys.modules.get( record[ 0 ] ) is not None ]
+
+    return records, errors
+
+
+#----------------------------------------------------------------------------
+def main( argv = None ):
+    import sys
+    from optparse import OptionParser
+    parser = OptionParser( usage = "%prog [ options ] [ module ... ]" )
+    parser.add_option( "--json", dest = "json", default = None,
+                       help = "also write the profile to the given JSON file" )
+    parser.add_option( "--budget", dest = "budget", type = "float", default = None,
+                       help = "fail if the total import time exceeds the given milliseconds" )
+    options, targets = parser.parse_args( argv )
+    if not targets:
+       targets = defaultTargets
+       pass
+
+    records, errors = profile( targets )
+
+    total = sum( [ record[ 2 ] for record in records if record[ 1 ] == 0 ] )
+    print "%10s %10s  %s" % ( "self [ms]", "cumul [ms]", "module" )
+    for name, depth, cumulative, self_ in records:
+        print "%10.2f %10.2f  %s%s" % ( self_ * 1.0e3, cumulative * 1.0e3, "  " * depth, name )
+    print "%10s %10.2f  total" % ( "", total * 1.0e3 )
+
+    for target, message in sorted( errors.items() ):
+        print "Failed to import %s : %s" % ( target, message )
+
+    overBudget = options.budget is not None and total * 1.0e3 > options.budget
+    if overBudget:
+       print "Import time %.2f ms exceeds the budget of %.2f ms" % ( total * 1.0e3, options.budget )
+
+    if options.json is not None:
+       import json
+       output = open( options.json, "w" )
+       json.dump( { "targets" : list( targets ),
+                    "total" : total,
+                    "budget" : options.budget,
+                    "modules" : [ { "module" : name, "depth" : depth, "cumulative" : cumulative, "self" : self_ }
+                                  for name, depth, cumulative, self_ in records ],
+                    "errors" : errors }, output, indent = 1 )
+       output.close()
+       pass
+
+    return len( errors ) + int( overBudget )
+
+
+#----------------------------------------------------------------------------
+if __name__ == "__main__":
+   import sys
+   sys.exit( main() )
+
+
+#----------------------------------------------------------------------------
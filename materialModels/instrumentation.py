@@ -0,0 +1,255 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Opt-in timing of the hot entry points of the material layer. When enabled
+# the methods listed in targets are replaced by timing wrappers, so nothing
+# is paid while it is disabled. Per entry point it records the call count,
+# the cumulative time and the per-call latency, prints a summary for every
+# time step and writes all calls to a Chrome trace ( chrome://tracing,
+# Perfetto ) at the end.
+#
+#     from materialModels import instrumentation
+#     instrumentation.enable( runTime, traceFile = "materialModels.trace.json" )
+#
+# or, without changing the solver script,
+#
+#     MATERIALMODELS_TRACE=materialModels.trace.json python solver.py
+#
+# with the summaries going to stdout or to the file named by
+# MATERIALMODELS_SUMMARY.
+
+
+#----------------------------------------------------------------------------
+import os, sys, time, thread
+
+
+#----------------------------------------------------------------------------
+#- ( module, class, method ) of the instrumented entry points
+targets = ( ( "materialModels.rheologyModel", "rheologyModel", "mu" ),
+            ( "materialModels.rheologyModel", "rheologyModel", "_lambda" ),
+            ( "materialModels.rheologyModel.rheologyLaws.rheologyLaw", "rheologyLaw", "New" ),
+            ( "materialModels.rheologyModel.rheologyLaws.multiMaterial", "multiMaterial", "_assemble" ),
+            ( "materialModels.rheologyModel.rheologyLaws.multiMaterial", "multiMaterial", "_patchValues" ),
+            ( "materialModels.fvPatchFields.tractionDisplacement", "tractionDisplacementFvPatchVectorField", "updateCoeffs" ) )
+
+
+#----------------------------------------------------------------------------
+#- Upper bound of the calls kept for the trace, later calls are only counted
+maxEvents = 1000000
+
+
+#----------------------------------------------------------------------------
+class _state( object ):
+    enabled = False
+    time = None
+    timeIndex = None
+    traceFile = None
+    summaryFile = None
+    start = 0.0
+    originals = []
+    # name -> [ calls, cumulative, max ] for the run and for the current step
+    total = {}
+    step = {}
+    events = []
+    pass
+
+
+#----------------------------------------------------------------------------
+def enabled():
+    return _state.enabled
+
+
+#----------------------------------------------------------------------------
+#- Record one call of the entry point
+def _record( name, start, elapsed ):
+    if _state.time is not None:
+       timeIndex = _state.time.timeIndex()
+       if timeIndex != _state.timeIndex:
+          if _state.step:
+             _writeSummary( "time index %s" % _state.timeIndex, _state.step )
+             pass
+          _state.step = {}
+          _state.timeIndex = timeIndex
+          pass
+       pass
+
+    for stats in ( _state.total, _state.step ):
+        entry = stats.get( name )
+        if entry is None:
+           stats[ name ] = [ 1, elapsed, elapsed ]
+        else:
+           entry[ 0 ] += 1
+           entry[ 1 ] += elapsed
+           if elapsed > entry[ 2 ]:
+              entry[ 2 ] = elapsed
+        pass
+
+    if len( _state.events ) < maxEvents:
+       _state.events.append( ( name, start, elapsed, thread.get_ident() ) )
+       pass
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Return the timing wrapper of the function
+def _timed( name, function ):
+    clock = time.time
+    def wrapper( *args, **kwargs ):
+        start = clock()
+        try:
+            return function( *args, **kwargs )
+        finally:
+            _record( name, start, clock() - start )
+
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+
+    return wrapper
+
+
+#----------------------------------------------------------------------------
+#- Start timing the entry points. Given the Time, a summary is written every
+#  time the time index advances; the trace is written by finish or at exit
+def enable( time_ = None, traceFile = None, summaryFile = None ):
+    if _state.enabled:
+       disable()
+       pass
+
+    for moduleName, className, methodName in targets:
+        module = __import__( moduleName, globals(), locals(), [ className ] )
+        cls = getattr( module, className )
+        original = cls.__dict__[ methodName ]
+        name = "%s.%s" % ( className, methodName )
+        if isinstance( original, staticmethod ):
+           setattr( cls, methodName, staticmethod( _timed( name, original.__get__( None, cls ) ) ) )
+        else:
+           setattr( cls, methodName, _timed( name, original ) )
+        _state.originals.append( ( cls, methodName, original ) )
+
+    _state.enabled = True
+    _state.time = time_
+    _state.timeIndex = None
+    _state.traceFile = traceFile
+    _state.summaryFile = summaryFile
+    _state.start = time.time()
+    _state.total = {}
+    _state.step = {}
+    _state.events = []
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Restore the original methods, the records are kept
+def disable():
+    for cls, methodName, original in reversed( _state.originals ):
+        setattr( cls, methodName, original )
+    _state.originals = []
+    _state.enabled = False
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Return the records { name : ( calls, cumulative seconds, max seconds ) } of the run
+def statistics():
+    return dict( [ ( name, tuple( entry ) ) for name, entry in _state.total.items() ] )
+
+
+#----------------------------------------------------------------------------
+def _writeSummary( label, stats ):
+    lines = [ "materialModels timing, %s" % label,
+              "    %-48s %8s %12s %12s %12s" % ( "entry point", "calls", "total [ms]", "mean [us]", "max [us]" ) ]
+    for name in sorted( stats.keys(), key = lambda name : -stats[ name ][ 1 ] ):
+        calls, cumulative, maximum = stats[ name ]
+        lines.append( "    %-48s %8d %12.3f %12.1f %12.1f" % ( name, calls, cumulative * 1.0e3,
+                                                               cumulative / calls * 1.0e6, maximum * 1.0e6 ) )
+    from materialModels import fieldPool
+    lines.append( "    scratch field pool : %d hits, %d misses, run so far" % fieldPool.instance().stats() )
+
+    if _state.summaryFile is None:
+       print "\n".join( lines )
+    else:
+       output = open( _state.summaryFile, "a" )
+       output.write( "\n".join( lines ) + "\n" )
+       output.close()
+       pass
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Write the calls recorded so far as a Chrome trace
+def writeTrace( fileName ):
+    import json
+    pid = os.getpid()
+    events = [ { "name" : name, "cat" : "materialModels", "ph" : "X", "pid" : pid, "tid" : tid,
+                 "ts" : ( start - _state.start ) * 1.0e6, "dur" : elapsed * 1.0e6 }
+               for name, start, elapsed, tid in _state.events ]
+
+    output = open( fileName, "w" )
+    json.dump( { "traceEvents" : events, "displayTimeUnit" : "ms" }, output )
+    output.close()
+    pass
+
+
+#----------------------------------------------------------------------------
+#- Write the summary of the last step and of the run, and the trace file
+def finish():
+    if _state.step and _state.time is not None:
+       _writeSummary( "time index %s" % _state.timeIndex, _state.step )
+       _state.step = {}
+       pass
+    if _state.total:
+       _writeSummary( "whole run", _state.total )
+       pass
+    if _state.traceFile is not None:
+       writeTrace( _state.traceFile )
+       pass
+    disable()
+    pass
+
+
+#----------------------------------------------------------------------------
+def _atExit():
+    if _state.enabled:
+       finish()
+       pass
+    pass
+
+
+import atexit
+atexit.register( _atExit )
+
+
+#----------------------------------------------------------------------------
+#- Enable if the MATERIALMODELS_TRACE environment variable names a trace file,
+#  called by rheologyModel on construction
+def enableFromEnvironment( time_ ):
+    traceFile = os.environ.get( "MATERIALMODELS_TRACE" )
+    if traceFile and not _state.enabled:
+       enable( time_, traceFile, os.environ.get( "MATERIALMODELS_SUMMARY" ) or None )
+       pass
+    pass
+
+
+#----------------------------------------------------------------------------
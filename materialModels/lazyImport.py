@@ -0,0 +1,61 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Module stand-ins binding their symbols on first use. The module is imported
+# when the first symbol is asked for and every symbol is then kept as an
+# attribute of the stand-in, so hot methods pay neither the import at start
+# up nor the import statement on every call.
+#
+#     from materialModels.lazyImport import OpenFOAM
+#     OpenFOAM.scalarField( size, 0.0 )
+
+
+#----------------------------------------------------------------------------
+class lazyModule( object ):
+    def __init__( self, moduleName ):
+        self.moduleName_ = moduleName
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Called for the symbols not bound yet only
+    def __getattr__( self, name ):
+        if name.startswith( "__" ):
+           raise AttributeError( name )
+
+        module = __import__( self.moduleName_, globals(), locals(), [ name ] )
+        value = getattr( module, name )
+        setattr( self, name, value )
+
+        return value
+
+
+#----------------------------------------------------------------------------
+numpy = lazyModule( "numpy" )
+OpenFOAM = lazyModule( "Foam.OpenFOAM" )
+finiteVolume = lazyModule( "Foam.finiteVolume" )
+
+
+#----------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# Bounded cache dropping the least recently used entry when full.
+# OrderedDict keeps the use order, the most recently used entry last.
+
+
+#----------------------------------------------------------------------------
+class lruCache( object ):
+    def __init__( self, maxSize ):
+        from collections import OrderedDict
+        self.maxSize_ = max( int( maxSize ), 0 )
+        self.entries_ = OrderedDict()
+        self.hits_ = 0
+        self.misses_ = 0
+        pass
+
+
+    #------------------------------------------------------------------------
+    def maxSize( self ):
+        return self.maxSize_
+
+
+    #------------------------------------------------------------------------
+    def size( self ):
+        return len( self.entries_ )
+
+
+    #------------------------------------------------------------------------
+    #- Return the numbers of lookups found and not found in the cache
+    def stats( self ):
+        return self.hits_, self.misses_
+
+
+    #------------------------------------------------------------------------
+    #- Return the value stored under the key, or None
+    def lookup( self, key ):
+        try:
+            value = self.entries_.pop( key )
+        except KeyError:
+            self.misses_ += 1
+            return None
+
+        self.entries_[ key ] = value
+        self.hits_ += 1
+
+        return value
+
+
+    #------------------------------------------------------------------------
+    #- Store the value under the key, dropping the oldest entries if needed
+    def insert( self, key, value ):
+        if self.entries_.has_key( key ):
+           del self.entries_[ key ]
+           pass
+        if self.maxSize_ == 0:
+           return value
+
+        while len( self.entries_ ) >= self.maxSize_:
+            self.entries_.popitem( False )
+        self.entries_[ key ] = value
+
+        return value
+
+
+    #------------------------------------------------------------------------
+    def clear( self ):
+        self.entries_.clear()
+        pass
+
+
+#----------------------------------------------------------------------------
@@ -0,0 +1,968 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#----------------------------------------------------------------------------
+# NumPy backend : the part of the Foam API used by the material layer,
+# implemented on NumPy arrays, so that the same law classes and the same
+# rheologyProperties evaluate the properties without OpenFOAM, e.g. in post
+# processing or in test harnesses. Fields keep their values in NumPy arrays
+# and expose the array interface, as the fields of a NumPy enabled build do.
+# The mesh, given by the cell volumes and the face cells of the patches, is
+# its own object registry and holds the dictionaries and the initial fields
+# read with MUST_READ. It is installed as the Foam package, so it can not be
+# used in a process running the real one, and it refuses to be installed
+# where a real Foam package can be imported unless forced to, so that it
+# never shadows pythonFlu by accident.
+#
+#     from materialModels import numpyBackend
+#     numpyBackend.install()     // before anything imports Foam
+#
+#     mesh = numpyBackend.fvMesh( numpyBackend.Time(), V, [ ( "inlet", faceCells, nf ), ... ] )
+#     model = numpyBackend.rheologyModelFor( mesh, "constant/rheologyProperties", materials )
+#     E = toArray( model.law().E().internalField() )
+#
+# For another snapshot of the material labels
+#
+#     model.law().materials_.internalField().ext_assign( materials )
+#     model.law().updateIndex()
+#
+# Dictionary directives ( #include, $macro ) are not supported.
+
+
+#----------------------------------------------------------------------------
+import sys, types, weakref
+import numpy
+
+
+#----------------------------------------------------------------------------
+class standIn( object ):
+    @classmethod
+    def ext_isinstance( cls, arg ):
+        if not isinstance( arg, cls ):
+           raise TypeError( cls.__name__ )
+        return True
+
+
+#----------------------------------------------------------------------------
+class ptrList( list ):
+    def size( self ):
+        return len( self )
+
+
+#----------------------------------------------------------------------------
+class word( str ):
+    pass
+
+
+class string( str ):
+    pass
+
+
+class fileName( str ):
+    def expand( self ):
+        return self
+
+    def isAbsolute( self ):
+        return self.startswith( "/" )
+
+
+#----------------------------------------------------------------------------
+class Switch( object ):
+    def __init__( self, value ):
+        if isinstance( value, str ):
+           value = value in ( "on", "yes", "true", "y", "t" )
+        self.value_ = bool( value )
+
+    def __nonzero__( self ):
+        return self.value_
+
+    __bool__ = __nonzero__
+
+
+#----------------------------------------------------------------------------
+#- Output stream swallowing everything
+class _sink( object ):
+    def __lshift__( self, arg ):
+        return self
+
+_info = _sink()
+
+def ext_Info():
+    return _info
+
+ext_Warning = ext_SeriousError = ext_Info
+nl = "\n"
+tab = "\t"
+
+SMALL = 1.0e-15
+GREAT = 1.0e+15
+
+
+#----------------------------------------------------------------------------
+#- Dimensions as the exponents of mass, length, time, temperature, moles,
+#  current and luminous intensity
+class dimensionSet( object ):
+    def __init__( self, *exponents ):
+        self.exponents_ = tuple( exponents ) + ( 0, ) * ( 7 - len( exponents ) )
+
+    def __mul__( self, other ):
+        return dimensionSet( *[ a + b for a, b in zip( self.exponents_, other.exponents_ ) ] )
+
+    def __div__( self, other ):
+        return dimensionSet( *[ a - b for a, b in zip( self.exponents_, other.exponents_ ) ] )
+
+    __truediv__ = __div__
+
+    def __eq__( self, other ):
+        return self.exponents_ == other.exponents_
+
+dimless = dimensionSet()
+dimDensity = dimensionSet( 1, -3 )
+dimForce = dimensionSet( 1, 1, -2 )
+dimArea = dimensionSet( 0, 2 )
+dimVelocity = dimensionSet( 0, 1, -1 )
+dimTime = dimensionSet( 0, 0, 1 )
+
+
+#----------------------------------------------------------------------------
+class dimensionedScalar( standIn ):
+    def __init__( self, *args ):
+        if len( args ) == 1 and isinstance( args[ 0 ], dimensionedScalar ):
+           args = ( args[ 0 ].name(), args[ 0 ].dimensions(), args[ 0 ].value() )
+        elif len( args ) == 1:
+           # Entry as read, [ name ] [ dimensions ] value
+           tokens = args[ 0 ]
+           if not isinstance( tokens, list ):
+              tokens = [ tokens ]
+           name = [ item for item in tokens[ :-1 ] if isinstance( item, str ) ]
+           dimensions = [ item for item in tokens[ :-1 ] if isinstance( item, dimensionSet ) ]
+           args = ( ( name + [ "value" ] )[ 0 ], ( dimensions + [ dimless ] )[ 0 ], tokens[ -1 ] )
+        self.name_, self.dimensions_, self.value_ = word( args[ 0 ] ), args[ 1 ], float( args[ 2 ] )
+
+    def name( self ):
+        return self.name_
+
+    def dimensions( self ):
+        return self.dimensions_
+
+    def value( self ):
+        return self.value_
+
+
+#----------------------------------------------------------------------------
+class vector( standIn ):
+    X, Y, Z = 0, 1, 2
+
+    def __init__( self, *args ):
+        # From the components or from the list read from a dictionary entry
+        if len( args ) == 1:
+           args = tuple( args[ 0 ] )
+        self.array_ = numpy.array( args, float ).reshape( 3 )
+
+    def x( self ):
+        return self.array_[ 0 ]
+
+    def y( self ):
+        return self.array_[ 1 ]
+
+    def z( self ):
+        return self.array_[ 2 ]
+
+vector.zero = vector( 0.0, 0.0, 0.0 )
+
+
+#----------------------------------------------------------------------------
+readLabel = int
+readScalar = float
+
+
+#----------------------------------------------------------------------------
+#- Stream of tokens and dictionaries, as read from a list entry
+class Istream( object ):
+    def __init__( self, items ):
+        self.items_ = list( items )
+        self.position_ = 0
+
+    def read( self ):
+        item = self.items_[ self.position_ ]
+        self.position_ += 1
+        return item
+
+    def putBack( self, token_ ):
+        self.position_ -= 1
+
+    def readBegin( self, name ):
+        if self.read() != token.BEGIN_LIST:
+           raise IOError( "expected '(' reading " + name )
+
+    def readEnd( self, name ):
+        if self.read() != token.END_LIST:
+           raise IOError( "expected ')' reading " + name )
+
+
+class token( object ):
+    BEGIN_LIST = "("
+    END_LIST = ")"
+    END_STATEMENT = ";"
+
+    def __init__( self, is_ ):
+        self.value_ = is_.read()
+
+    def isLabel( self ):
+        return isinstance( self.value_, ( int, long ) ) and not isinstance( self.value_, bool )
+
+    def labelToken( self ):
+        return self.value_
+
+    def isPunctuation( self ):
+        return self.value_ in ( token.BEGIN_LIST, token.END_LIST, token.END_STATEMENT )
+
+    def pToken( self ):
+        return self.value_
+
+
+#----------------------------------------------------------------------------
+class dictionary( standIn ):
+    def __init__( self, *args ):
+        self.entries_ = {}
+        if args and isinstance( args[ 0 ], Istream ):
+           args = ( args[ 0 ].read(), )
+        if args:
+           source = args[ 0 ]
+           if isinstance( source, dictionary ):
+              source = source.entries_
+           self.entries_.update( source )
+
+    def found( self, keyword ):
+        return self.entries_.has_key( str( keyword ) )
+
+    def lookup( self, keyword ):
+        try:
+            return self.entries_[ str( keyword ) ]
+        except KeyError:
+            raise IOError( "keyword %s is undefined in dictionary" % keyword )
+
+    def subDict( self, keyword ):
+        return dictionary( self.lookup( keyword ) )
+
+
+#----------------------------------------------------------------------------
+#- List of ( keyword, dictionary ) entries
+class _entry( object ):
+    def __init__( self, keyword, dict_ ):
+        self.keyword_, self.dict_ = word( keyword ), dictionary( dict_ )
+
+    def keyword( self ):
+        return self.keyword_
+
+    def dict( self ):
+        return self.dict_
+
+
+def PtrList_entry( entries ):
+    return ptrList( [ _entry( keyword, dict_ ) for keyword, dict_ in entries ] )
+
+
+#----------------------------------------------------------------------------
+class IOobject( standIn ):
+    MUST_READ, NO_READ, AUTO_WRITE, NO_WRITE = range( 4 )
+
+    def __init__( self, name, instance, db, readOpt = NO_READ, writeOpt = NO_WRITE ):
+        self.name_, self.instance_, self.db_, self.readOpt_ = word( name ), instance, db, readOpt
+
+    def name( self ):
+        return self.name_
+
+    def db( self ):
+        return self.db_
+
+    def readOpt( self ):
+        return self.readOpt_
+
+
+#----------------------------------------------------------------------------
+class IOdictionary( dictionary ):
+    def __init__( self, io ):
+        dictionary.__init__( self, io.db().dictionaries_[ str( io.name() ) ] )
+        io.db().checkIn( io.name(), self )
+
+    @staticmethod
+    def ext_lookupObject( db, name ):
+        return db.lookupObject( name )
+
+
+#----------------------------------------------------------------------------
+class Pstream( object ):
+    @staticmethod
+    def parRun():
+        return False
+
+
+#----------------------------------------------------------------------------
+#- Field of values held in a NumPy array of shape ( size, ) or ( size, nComponents )
+class field( standIn ):
+    nComponents = 1
+    dtype = float
+    zero = 0.0
+
+    def __init__( self, *args ):
+        self.array_ = self._construct( *args )
+
+    def _construct( self, *args ):
+        if len( args ) == 1:
+           return numpy.array( numpy.asarray( args[ 0 ], self.dtype ) )
+        if len( args ) == 3:
+           # keyword, dictionary and size
+           return self._construct( args[ 2 ], args[ 1 ].lookup( args[ 0 ] ) )
+        if isinstance( args[ 1 ], fvPatchFieldMapper ):
+           return numpy.asarray( args[ 0 ] )[ args[ 1 ].directAddressing() ]
+        return self._uniform( args[ 0 ], args[ 1 ] )
+
+    def _uniform( self, size, value ):
+        if isinstance( value, vector ):
+           value = value.array_
+        value = numpy.asarray( value, self.dtype )
+        if value.ndim > 1 or ( self.nComponents == 1 and value.ndim == 1 ):
+           return numpy.array( value )
+        if self.nComponents == 1:
+           return numpy.full( size, value, self.dtype )
+        return numpy.tile( value, ( size, 1 ) )
+
+    @property
+    def __array_interface__( self ):
+        return self.array_.__array_interface__
+
+    def size( self ):
+        return self.array_.shape[ 0 ]
+
+    def __len__( self ):
+        return self.size()
+
+    def __getitem__( self, i ):
+        return self.array_[ i ]
+
+    def ext_assign( self, value ):
+        if isinstance( value, vector ):
+           value = value.array_
+        self.array_[ ... ] = numpy.asarray( value )
+
+    #- Map the values as Field::autoMap does for a direct mapper
+    def autoMap( self, mapper ):
+        self.array_ = self.array_[ mapper.directAddressing() ]
+
+    #- Reverse-map the values of the given field onto the addressed ones
+    def rmap( self, other, addr ):
+        self.array_[ numpy.asarray( addr ) ] = numpy.asarray( other )
+
+    def _binary( self, other, operator ):
+        if isinstance( other, field ):
+           other = other.array_
+        return self.__class__( operator( self.array_, other ) )
+
+    def __add__( self, other ):
+        return self._binary( other, numpy.add )
+
+    def __sub__( self, other ):
+        return self._binary( other, numpy.subtract )
+
+    def __mul__( self, other ):
+        return self._binary( other, numpy.multiply )
+
+    def __div__( self, other ):
+        return self._binary( other, numpy.divide )
+
+    def __rsub__( self, other ):
+        return self._binary( other, lambda a, b : b - a )
+
+    def __rdiv__( self, other ):
+        return self._binary( other, lambda a, b : b / a )
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+    __truediv__ = __div__
+    __rtruediv__ = __rdiv__
+
+
+class scalarField( field ):
+    pass
+
+
+class vectorField( field ):
+    nComponents = 3
+    zero = ( 0.0, ) * 3
+
+
+class tensorField( field ):
+    nComponents = 9
+    zero = ( 0.0, ) * 9
+
+
+class symmTensorField( field ):
+    nComponents = 6
+    zero = ( 0.0, ) * 6
+
+
+class labelList( field ):
+    dtype = numpy.int64
+
+
+#----------------------------------------------------------------------------
+class fvPatchFieldMapper( standIn ):
+    def __init__( self, addressing ):
+        self.addressing_ = numpy.asarray( addressing, numpy.int64 )
+
+    def direct( self ):
+        return True
+
+    def directAddressing( self ):
+        return self.addressing_
+
+    def size( self ):
+        return self.addressing_.shape[ 0 ]
+
+
+#----------------------------------------------------------------------------
+class Time( object ):
+    def __init__( self, value = 0.0, timeIndex = 0, deltaT = 1.0 ):
+        self.value_, self.timeIndex_, self.deltaT_ = value, timeIndex, deltaT
+
+    def value( self ):
+        return self.value_
+
+    def timeIndex( self ):
+        return self.timeIndex_
+
+    def timeName( self ):
+        return "%g" % self.value_
+
+    def deltaT( self ):
+        return dimensionedScalar( "deltaT", dimTime, self.deltaT_ )
+
+    def constant( self ):
+        return "constant"
+
+    def path( self ):
+        return "."
+
+    #- Advance by the given time step, as runTime++
+    def increment( self, deltaT ):
+        self.value_ += deltaT
+        self.timeIndex_ += 1
+        self.deltaT_ = deltaT
+
+
+#----------------------------------------------------------------------------
+class polyPatch( object ):
+    def __init__( self, name, index, start, size ):
+        self.name_, self.index_, self.start_, self.size_ = word( name ), index, start, size
+
+    def name( self ):
+        return self.name_
+
+    def index( self ):
+        return self.index_
+
+    def start( self ):
+        return self.start_
+
+    def size( self ):
+        return self.size_
+
+    ext_size = size
+
+    def coupled( self ):
+        return False
+
+
+class fvPatch( standIn ):
+    def __init__( self, mesh, polyPatch_, faceCells, nf, Cf ):
+        self.mesh_, self.patch_ = mesh, polyPatch_
+        self.faceCells_, self.nf_, self.Cf_ = labelList( faceCells ), vectorField( nf ), vectorField( Cf )
+
+    def name( self ):
+        return self.patch_.name()
+
+    def index( self ):
+        return self.patch_.index()
+
+    def size( self ):
+        return self.patch_.size()
+
+    def patch( self ):
+        return self.patch_
+
+    def boundaryMesh( self ):
+        return self.mesh_
+
+    def faceCells( self ):
+        return self.faceCells_
+
+    def nf( self ):
+        return self.nf_
+
+    def Cf( self ):
+        return self.Cf_
+
+
+class polyPatchID( object ):
+    def __init__( self, name, boundaryMesh ):
+        self.index_ = -1
+        for patch in boundaryMesh:
+            if str( patch.name() ) == str( name ):
+               self.index_ = patch.index()
+
+    def active( self ):
+        return self.index_ >= 0
+
+    def index( self ):
+        return self.index_
+
+
+#----------------------------------------------------------------------------
+#- Mesh of the given cell volumes, or number of cells of unit volume, and
+#  boundary patches given as ( name, faceCells ), ( name, faceCells, nf ) or
+#  ( name, faceCells, nf, Cf ). It is the object registry as well
+class fvMesh( standIn ):
+    def __init__( self, time, V, patches, nInternalFaces = 0 ):
+        self.time_ = time
+        if isinstance( V, ( int, long ) ):
+           self.nCells_, self.V_ = V, None
+        else:
+           self.V_ = scalarField( V )
+           self.nCells_ = self.V_.size()
+        self.boundaryMesh_ = ptrList()
+        self.boundary_ = ptrList()
+        start = nInternalFaces
+        for patchI, patch in enumerate( patches ):
+            name, faceCells, nf, Cf = ( tuple( patch ) + ( None, None ) )[ : 4 ]
+            if nf is None:
+               nf = numpy.zeros( ( len( faceCells ), 3 ) )
+            if Cf is None:
+               Cf = numpy.zeros( ( len( faceCells ), 3 ) )
+            polyPatch_ = polyPatch( name, patchI, start, len( faceCells ) )
+            self.boundaryMesh_.append( polyPatch_ )
+            self.boundary_.append( fvPatch( self, polyPatch_, faceCells, nf, Cf ) )
+            start += len( faceCells )
+
+        # Registered objects are not owned by the registry
+        self.objects_ = weakref.WeakValueDictionary()
+        self.event_ = 0
+
+        # Contents of the dictionaries and of the fields read with MUST_READ
+        self.dictionaries_ = {}
+        self.fields_ = {}
+
+    def V( self ):
+        if self.V_ is None:
+           self.V_ = scalarField( self.nCells_, 1.0 )
+        return self.V_
+
+    def name( self ):
+        return "region0"
+
+    def time( self ):
+        return self.time_
+
+    def nCells( self ):
+        return self.nCells_
+
+    def changing( self ):
+        return False
+
+    def moving( self ):
+        return False
+
+    #- The mesh is its own fvBoundaryMesh as well
+    def mesh( self ):
+        return self
+
+    def boundary( self ):
+        return self.boundary_
+
+    def boundaryMesh( self ):
+        return self.boundaryMesh_
+
+    def thisDb( self ):
+        return self
+
+    def getEvent( self ):
+        self.event_ += 1
+        return self.event_
+
+    #- As objectRegistry::checkIn, an object of a name in use is not registered
+    def checkIn( self, name, obj ):
+        if str( name ) not in self.objects_:
+           self.objects_[ str( name ) ] = obj
+        self.getEvent()
+
+    def found( self, name ):
+        return str( name ) in self.objects_
+
+    def lookupObject( self, name ):
+        return self.objects_[ str( name ) ]
+
+
+#----------------------------------------------------------------------------
+#- Cell values with one patch field per patch, zero gradient unless replaced
+class geometricField( standIn ):
+    fieldType = scalarField
+
+    def __init__( self, io, mesh, value = None, patchFieldType = None ):
+        self.name_, self.mesh_ = io.name(), mesh
+        self.dimensions_ = dimless
+        if value is None:
+           if io.readOpt() == IOobject.MUST_READ:
+              value = mesh.fields_[ str( io.name() ) ]
+           else:
+              value = self.fieldType.zero
+        elif isinstance( value, dimensionedScalar ):
+           self.dimensions_ = value.dimensions()
+           value = value.value()
+
+        self.internalField_ = self.fieldType( mesh.nCells(), value )
+        self.boundaryField_ = ptrList( [ self.fieldType( patch.size(), self.fieldType.zero )
+                                         for patch in mesh.boundary() ] )
+        self.correctBoundaryConditions()
+        mesh.checkIn( self.name_, self )
+
+    def name( self ):
+        return self.name_
+
+    def mesh( self ):
+        return self.mesh_
+
+    def db( self ):
+        return self.mesh_
+
+    def time( self ):
+        return self.mesh_.time()
+
+    def dimensions( self ):
+        return self.dimensions_
+
+    def internalField( self ):
+        return self.internalField_
+
+    def dimensionedInternalField( self ):
+        return DimensionedField_vector_volMesh( self )
+
+    def ext_boundaryField( self ):
+        return self.boundaryField_
+
+    def correctBoundaryConditions( self ):
+        values = self.internalField_.array_
+        for patch, patchField in zip( self.mesh_.boundary(), self.boundaryField_ ):
+            if isinstance( patchField, fvPatchVectorField ):
+               patchField.evaluate()
+            else:
+               patchField.array_ = values[ patch.faceCells().array_ ]
+
+    def ext_min( self ):
+        return dimensionedScalar( word( "min" ), self.dimensions_, self.internalField_.array_.min() )
+
+    def ext_max( self ):
+        return dimensionedScalar( word( "max" ), self.dimensions_, self.internalField_.array_.max() )
+
+    @staticmethod
+    def ext_lookupObject( db, name ):
+        return db.lookupObject( name )
+
+    @staticmethod
+    def ext_lookupPatchField( patch, name ):
+        return patch.boundaryMesh().lookupObject( name ).ext_boundaryField()[ patch.index() ]
+
+
+class volScalarField( geometricField ):
+    fieldType = scalarField
+
+
+class volVectorField( geometricField ):
+    fieldType = vectorField
+
+
+class volTensorField( geometricField ):
+    fieldType = tensorField
+
+
+class volSymmTensorField( geometricField ):
+    fieldType = symmTensorField
+
+
+class zeroGradientFvPatchScalarField( object ):
+    typeName = word( "zeroGradient" )
+
+
+#----------------------------------------------------------------------------
+class DimensionedField_vector_volMesh( standIn ):
+    def __init__( self, field_ ):
+        self.field_ = field_
+
+    def name( self ):
+        return self.field_.name()
+
+    def mesh( self ):
+        return self.field_.mesh()
+
+    def values( self ):
+        return self.field_.internalField().array_
+
+
+#----------------------------------------------------------------------------
+class fvPatchVectorField( vectorField ):
+    def evaluate( self ):
+        pass
+
+
+class fixedGradientFvPatchVectorField( fvPatchVectorField ):
+    def __init__( self, *args ):
+        if isinstance( args[ 0 ], fvPatch ):
+           p, iF = args
+           vectorField.__init__( self, p.size(), vector.zero )
+           self.gradient_ = vectorField( p.size(), vector.zero )
+        elif len( args ) == 4:
+           ptf, p, iF, mapper = args
+           vectorField.__init__( self, ptf, mapper )
+           self.gradient_ = vectorField( ptf.gradient_, mapper )
+        else:
+           ptf = args[ 0 ]
+           p, iF = ptf.patch_, ( args + ( ptf.iF_, ) )[ 1 ]
+           vectorField.__init__( self, ptf )
+           self.gradient_ = vectorField( ptf.gradient_ )
+        self.patch_, self.iF_ = p, iF
+        self.updated_ = False
+
+    def patch( self ):
+        return self.patch_
+
+    def db( self ):
+        return self.iF_.mesh()
+
+    def dimensionedInternalField( self ):
+        return self.iF_
+
+    def patchInternalField( self ):
+        return vectorField( self.iF_.values()[ self.patch_.faceCells().array_ ] )
+
+    def gradient( self ):
+        return self.gradient_
+
+    def updated( self ):
+        return self.updated_
+
+    def updateCoeffs( self ):
+        self.updated_ = True
+
+    def evaluate( self ):
+        if not self.updated_:
+           self.updateCoeffs()
+        self.array_ = self.patchInternalField().array_ + self.gradient_.array_
+        self.updated_ = False
+
+    def autoMap( self, mapper ):
+        vectorField.autoMap( self, mapper )
+        self.gradient_.autoMap( mapper )
+
+    def rmap( self, ptf, addr ):
+        vectorField.rmap( self, ptf, addr )
+        self.gradient_.rmap( ptf.gradient_, addr )
+
+    @staticmethod
+    def ext_refCast( ptf ):
+        return ptf
+
+
+class tmp_fvPatchField_vector( object ):
+    def __init__( self, obj ):
+        self.obj_ = obj
+
+    def __call__( self ):
+        return self.obj_
+
+
+#----------------------------------------------------------------------------
+class PtrList_TypeBase( object ):
+    def __init__( self ):
+        pass
+
+
+class PtrList_INewBase( object ):
+    def __init__( self ):
+        pass
+
+
+class autoPtr_PtrList_TypeHolder( object ):
+    def __init__( self, obj ):
+        self.obj_ = obj
+
+    def __call__( self ):
+        return self.obj_
+
+
+#- Run-time selection table of the vector patch fields
+fvPatchFieldConstructorTable_vector = {}
+
+class fvPatchFieldConstructorToTableBase_vector( object ):
+    def __init__( self ):
+        pass
+
+    def init( self, obj, name ):
+        fvPatchFieldConstructorTable_vector[ str( name ) ] = obj
+
+def getfvPatchFieldConstructorToTableBase_vector():
+    return fvPatchFieldConstructorToTableBase_vector
+
+
+#----------------------------------------------------------------------------
+_modules = { "Foam.OpenFOAM" : ( "word", "string", "fileName", "Switch", "ext_Info", "ext_Warning",
+                                 "ext_SeriousError", "nl", "tab", "SMALL", "GREAT", "dimensionSet",
+                                 "dimless", "dimDensity", "dimForce", "dimArea", "dimVelocity", "dimTime",
+                                 "dimensionedScalar", "vector", "readLabel", "readScalar", "token",
+                                 "dictionary", "PtrList_entry", "IOobject", "IOdictionary", "Pstream",
+                                 "scalarField", "vectorField", "tensorField", "symmTensorField",
+                                 "labelList", "polyPatchID" ),
+             "Foam.finiteVolume" : ( "fvMesh", "fvPatch", "volScalarField", "volVectorField",
+                                     "volTensorField", "volSymmTensorField", "zeroGradientFvPatchScalarField",
+                                     "DimensionedField_vector_volMesh", "fvPatchFieldMapper",
+                                     "fvPatchVectorField", "fixedGradientFvPatchVectorField",
+                                     "tmp_fvPatchField_vector" ),
+             "Foam.template" : ( "PtrList_TypeBase", "PtrList_INewBase", "autoPtr_PtrList_TypeHolder",
+                                 "getfvPatchFieldConstructorToTableBase_vector" ) }
+
+
+#----------------------------------------------------------------------------
+#- Read the entries of a dictionary given as text or by the file name. Lists
+#  are Python lists, a word followed by a dictionary in a list is read as a
+#  ( keyword, dictionary ) pair, dimensions as a dimensionSet and an entry of
+#  more than one item as the list of the items
+def readDictionary( source ):
+    import os, re
+    if os.path.isfile( source ):
+       source = open( source ).read()
+    source = re.sub( r"/\*.*?\*/|//[^\n]*", " ", source, flags = re.S )
+    tokens = re.findall( r'"[^"]*"|[{}()\[\];]|[^\s{}()\[\];"]+', source )
+
+    def value( pos ):
+        item = tokens[ pos ]
+        if item == "{":
+           return entries( pos + 1, "}" )
+        if item == "(":
+           items = []
+           pos += 1
+           while tokens[ pos ] != ")":
+               if tokens[ pos + 1 ] == "{" and tokens[ pos ] != "{":
+                  keyword = tokens[ pos ]
+                  sub, pos = entries( pos + 2, "}" )
+                  items.append( ( keyword, sub ) )
+               else:
+                  sub, pos = value( pos )
+                  items.append( sub )
+           return items, pos + 1
+        if item == "[":
+           end = tokens.index( "]", pos )
+           return dimensionSet( *[ int( float( exponent ) ) for exponent in tokens[ pos + 1 : end ] ] ), end + 1
+        if item.startswith( '"' ):
+           return item[ 1 : -1 ], pos + 1
+        for convert in ( int, float ):
+            try:
+                return convert( item ), pos + 1
+            except ValueError:
+                pass
+        return item, pos + 1
+
+    def entries( pos, end ):
+        result = dictionary()
+        while pos < len( tokens ) and tokens[ pos ] != end:
+            keyword = tokens[ pos ]
+            if tokens[ pos + 1 ] == "{":
+               sub, pos = entries( pos + 2, "}" )
+            else:
+               items = []
+               pos += 1
+               while tokens[ pos ] != ";":
+                   item, pos = value( pos )
+                   items.append( item )
+               pos += 1
+               sub = items[ 0 ] if len( items ) == 1 else items
+            if keyword != "FoamFile":
+               result.entries_[ keyword ] = sub
+        return result, pos + 1
+
+    return entries( 0, None )[ 0 ]
+
+
+#----------------------------------------------------------------------------
+#- Build the rheologyModel of the mesh from the rheologyProperties, given as
+#  a dictionary, as its entries or by the file name, and the material labels
+#  of the cells, if any
+def rheologyModelFor( mesh, rheologyProperties, materials = None ):
+    install()
+    if isinstance( rheologyProperties, str ):
+       rheologyProperties = readDictionary( rheologyProperties )
+    mesh.dictionaries_[ "rheologyProperties" ] = rheologyProperties
+    if materials is not None:
+       mesh.fields_[ "materials" ] = numpy.asarray( materials, float )
+
+    sigma = volSymmTensorField( IOobject( word( "sigma" ), mesh.time().timeName(), mesh ), mesh )
+
+    from materialModels.rheologyModel import rheologyModel
+    return rheologyModel( sigma )
+
+
+#----------------------------------------------------------------------------
+#- Make the backend importable as the Foam package
+def install( force = False ):
+    package = sys.modules.get( "Foam" )
+    if package is not None:
+       if getattr( package, "numpyBackend", False ):
+          return
+       raise ImportError( "Foam is already imported, the NumPy backend can not replace it" )
+
+    if not force:
+       import imp
+       try:
+           found = imp.find_module( "Foam" )
+       except ImportError:
+           found = None
+       if found is not None:
+          if found[ 0 ] is not None:
+             found[ 0 ].close()
+          raise ImportError( "Foam can be imported from %s, the NumPy backend would shadow it. "
+                             "Pass force = True to replace it in this process all the same" % found[ 1 ] )
+       pass
+
+    this = sys.modules[ __name__ ]
+    package = types.ModuleType( "Foam" )
+    package.__path__ = []
+    package.numpyBackend = True
+    sys.modules[ "Foam" ] = package
+    for moduleName, names in _modules.items():
+        module = types.ModuleType( moduleName )
+        for name in names:
+            setattr( module, name, getattr( this, name ) )
+        sys.modules[ moduleName ] = module
+        setattr( package, moduleName.split( "." )[ -1 ], module )
+    pass
+
+
+#----------------------------------------------------------------------------
@@ -0,0 +1,106 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Selection of the C++ like overloaded constructors and methods.
+# Overloads are registered with one checker per argument; the first call
+# with a given combination of argument classes runs the checkers and the
+# selected overload is remembered for that combination, so that later
+# calls go straight to it.
+
+
+#----------------------------------------------------------------------------
+#- Checker accepting any argument
+def anything( obj, arg ):
+    return True
+
+
+#----------------------------------------------------------------------------
+#- Checker accepting an argument of the same class as the object
+def sameClass( obj, arg ):
+    return arg.__class__ == obj.__class__
+
+
+#----------------------------------------------------------------------------
+#- Return checker accepting instances of the given wrapped Foam class
+def foamType( moduleName, className ):
+    holder = []
+    def checker( obj, arg ):
+        if not holder:
+           module = __import__( moduleName, globals(), locals(), [ className ] )
+           holder.append( getattr( module, className ) )
+           pass
+        try:
+            holder[ 0 ].ext_isinstance( arg )
+        except TypeError:
+            return False
+        return True
+
+    return checker
+
+
+#----------------------------------------------------------------------------
+class overloadTable:
+    def __init__( self ):
+        self.candidates_ = {}
+        self.table_ = {}
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Register the method of the given name taking arguments accepted by the checkers
+    def add( self, name, *checkers ):
+        self.candidates_.setdefault( len( checkers ), [] ).append( ( name, checkers ) )
+        self.table_.clear()
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return name of the method matching the arguments
+    def select( self, obj, *args ):
+        key = ( obj.__class__, ) + tuple( [ arg.__class__ for arg in args ] )
+        try:
+            return self.table_[ key ]
+        except KeyError:
+            pass
+
+        for name, checkers in self.candidates_.get( len( args ), [] ):
+            matched = True
+            for checker, arg in zip( checkers, args ):
+                if not checker( obj, arg ):
+                   matched = False
+                   break
+            if matched:
+               self.table_[ key ] = name
+               return name
+
+        raise AssertionError( "No overload for the given arguments" )
+
+
+    #------------------------------------------------------------------------
+    #- Call the method matching the arguments
+    def __call__( self, obj, *args ):
+        return getattr( obj, self.select( obj, *args ) )( *args )
+
+
+#----------------------------------------------------------------------------
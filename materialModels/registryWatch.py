@@ -0,0 +1,112 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Handles derived from objects of an objectRegistry, kept between calls and
+# revalidated without looking the objects up : the registry must be the same
+# C++ object and the watched names still found in it. Reading the registry
+# event counter is no use here, getEvent counts up on every call and every
+# temporary field checked in changes it.
+
+
+#----------------------------------------------------------------------------
+#- Return true if both handles refer to the same object, the wrapper may
+#  return a new proxy of the same C++ object for every lookup
+def sameObject( first, second ):
+    if first is second:
+       return True
+
+    this = getattr( first, "this", None )
+    return this is not None and this == getattr( second, "this", None )
+
+
+#----------------------------------------------------------------------------
+#- Return a key of the object for dictionaries : the address of the C++
+#  object for a wrapped one, as every call may return a new proxy of it
+def objectKey( obj ):
+    this = getattr( obj, "this", None )
+    if this is None:
+       return id( obj )
+
+    return int( this )
+
+
+#----------------------------------------------------------------------------
+#- Handles derived from the objects registered under the given names.
+#  lookup( db ) returns the tuple of the objects found by name, derive( objects )
+#  the handles. The names are looked up again only if the registry is another
+#  one, one of the names is no longer found or the mesh is changing, and the
+#  handles are derived again only if one of the objects was replaced. An object
+#  destroyed and registered anew under its name between two calls is not
+#  noticed, clear drops the handles for such a case
+class watchedObjects( object ):
+    def __init__( self, names, lookup, derive ):
+        self.names_ = [ str( name ) for name in names ]
+        self.lookup_ = lookup
+        self.derive_ = derive
+        self.db_ = None
+        self.objects_ = None
+        self.handles_ = None
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return true if the handles can be used for the registry as they are
+    def valid( self, db, mesh ):
+        if self.handles_ is None or mesh.changing() or not sameObject( db, self.db_ ):
+           return False
+
+        for name in self.names_:
+            if not db.found( name ):
+               return False
+
+        return True
+
+
+    #------------------------------------------------------------------------
+    def handles( self, db, mesh ):
+        if self.valid( db, mesh ):
+           return self.handles_
+
+        objects = self.lookup_( db )
+        if self.handles_ is None or mesh.changing() or len( objects ) != len( self.objects_ ) \
+           or not all( [ sameObject( new, old ) for new, old in zip( objects, self.objects_ ) ] ):
+           self.handles_ = self.derive_( objects )
+           pass
+
+        self.db_ = db
+        self.objects_ = objects
+
+        return self.handles_
+
+
+    #------------------------------------------------------------------------
+    #- Drop the handles, the objects are looked up at the next call
+    def clear( self ):
+        self.db_ = None
+        self.objects_ = None
+        self.handles_ = None
+        pass
+
+
+#----------------------------------------------------------------------------
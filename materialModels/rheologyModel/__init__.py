@@ -22,6 +22,7 @@
 
 #----------------------------------------------------------------------------
 from Foam.OpenFOAM import IOdictionary
+from materialModels.lazyImport import numpy, OpenFOAM, finiteVolume
 #----------------------------------------------------------------------------
 
 class rheologyModel( IOdictionary ):
@@ -40,14 +41,53 @@ class rheologyModel( IOdictionary ):
                                               IOobject.NO_WRITE ) )
         self.sigma_ = sigma
         
+        # The material models work on NumPy views of the Foam fields, with no
+        # per-element copies from Python. A wrapper without the array interface
+        # is rejected here rather than on the first property evaluation
+        from materialModels.fieldArrays import requireView
+        requireView( sigma.internalField() )
+        
         self.typeName = word( "rheologyModel" )
         from Foam.OpenFOAM import Switch
         self.planeStress_ = Switch( self.lookup( word( "planeStress" ) ) )
 
+        from materialModels import instrumentation
+        instrumentation.enableFromEnvironment( self.sigma_.time() )
+        
         from materialModels.rheologyModel.rheologyLaws import rheologyLaw
         self.lawPtr_ = rheologyLaw.New( word( "law" ), self.sigma_, self.subDict( word( "rheology" ) ) )
+        
+        # Cached elastic constants and the law version they are of, see clearOut
+        self.constants_ = None
+        self.constantsVersion_ = None
+        
+        # Cached uniform elastic constants and the law version they are of
+        self.uniformConstants_ = None
+        self.uniformVersion_ = None
+        self.cacheTimeIndex_ = self.sigma_.time().timeIndex()
+        self.cacheNCells_ = self.sigma_.mesh().nCells()
+        
+        # Elastic constants evaluated at given times, see elasticConstants
+        from materialModels.lruCache import lruCache
+        self.timeCache_ = lruCache( self._timeCacheSize() )
+        
+        from materialModels import chunkedPool, fieldPool
+        chunkedPool.configure( self )
+        fieldPool.configure( self )
         pass
            
+    #-------------------------------------------------------------------------
+    #- Return number of time levels of elastic constants kept in the cache,
+    #  the optional timeCacheSize entry of rheologyProperties
+    def _timeCacheSize( self ):
+        from Foam.OpenFOAM import word, readLabel
+        if self.found( word( "timeCacheSize" ) ):
+           return readLabel( self.lookup( word( "timeCacheSize" ) ) )
+        
+        # Current, old and old-old time levels and a spare one
+        return 4
+
+
     #-------------------------------------------------------------------------
     def type( self ):
         return self.typeName
@@ -80,122 +120,340 @@ class rheologyModel( IOdictionary ):
                 arg = float(args[0])
             except ValueError:
                 raise AttributeError ("The arg is not float")
-        return self.lawPtr_.rho()
+        return self.lawPtr_.rho( *args )
 
 
     #-------------------------------------------------------------------------
-    #- Return first Lame's coefficient
-    def mu( self, *args ):
+    #- Clear cached elastic constants
+    def clearOut( self ):
+        self.constants_ = None
+        self.uniformConstants_ = None
+        pass
+
+
+    #-------------------------------------------------------------------------
+    #- Drop the cache if the time index advanced for a time-dependent law
+    #  or if the mesh has changed since the cache was filled
+    def checkCache( self ):
+        mesh = self.sigma_.mesh()
+        
+        timeIndex = self.sigma_.time().timeIndex()
+        if timeIndex != self.cacheTimeIndex_:
+            if self.lawPtr_.timeDependent() or mesh.changing():
+                self.clearOut()
+                pass
+            if mesh.changing():
+                self.timeCache_.clear()
+                pass
+            self.cacheTimeIndex_ = timeIndex
+            pass
+        
+        nCells = mesh.nCells()
+        if nCells != self.cacheNCells_:
+            self.clearOut()
+            self.timeCache_.clear()
+            self.cacheNCells_ = nCells
+            pass
+        
+        if self.constants_ is not None and self.constantsVersion_ != self.lawPtr_.version():
+            self._updateConstants()
+            pass
+        
+        if self.uniformConstants_ is not None and self.uniformVersion_ != self.lawPtr_.version():
+            self.uniformConstants_ = None
+            pass
+        pass
+
+
+    #-------------------------------------------------------------------------
+    #- Bring the cached elastic constants up to the current law version,
+    #  evaluating only the cells the law reports as changed
+    def _updateConstants( self ):
+        version = self.lawPtr_.version()
+        cells = self.lawPtr_.changedCells( self.constantsVersion_ )
+        if cells is None or self.uniform():
+           self.constants_ = self._calcConstants()
+           self.constantsVersion_ = version
+           return
+        
+        if cells.shape[ 0 ] != 0:
+           from materialModels.fieldArrays import toArray
+           from materialModels.rheologyModel.elasticConstants import elasticConstants, names
+           rho, E, nu = self.lawPtr_.cellValues( cells )
+           values = elasticConstants( E, nu, rho, self.planeStress() )
+           for name, value in zip( names, values ):
+               field = self.constants_[ name ]
+               toArray( field.internalField() )[ cells ] = value
+               field.correctBoundaryConditions()
+           pass
+        
+        self.constantsVersion_ = version
+        pass
+
+
+    #-------------------------------------------------------------------------
+    #- Return true if the rheology law has uniform properties
+    def uniform( self ):
+        return self.lawPtr_.uniform()
+
+
+    #-------------------------------------------------------------------------
+    #- Return dimensions of the elastic constants given those of E and rho
+    def _dimensions( self, dimE, dimRho ):
+        return { "mu" : dimE, 
+                 "lambda" : dimE, 
+                 "threeK" : dimE / dimRho, 
+                 "K" : dimE, 
+                 "Cp" : OpenFOAM.dimVelocity }
+
+
+    #-------------------------------------------------------------------------
+    #- Return uniform elastic constants ( mu, lambda, threeK, K and Cp ) 
+    #  as a dictionary of dimensionedScalars
+    def uniformConstants( self, *args ):
+        lawRho = self.lawPtr_.uniformRho( *args )
+        lawE = self.lawPtr_.uniformE( *args )
+        lawNu = self.lawPtr_.uniformNu( *args )
+        
+        from materialModels.rheologyModel.elasticConstants import elasticConstants, names
+        values = elasticConstants( lawE.value(), lawNu.value(), lawRho.value(), self.planeStress() )
+        dimensions = self._dimensions( lawE.dimensions(), lawRho.dimensions() )
+        
+        result = {}
+        for name, value in zip( names, values ):
+            result[ name ] = OpenFOAM.dimensionedScalar( OpenFOAM.word( name ), dimensions[ name ], float( value ) )
+        
+        return result
+
+
+    #-------------------------------------------------------------------------
+    #- Return uniform elastic constants at the current time, kept until the
+    #  law version changes or checkCache drops them
+    def _currentUniformConstants( self ):
+        self.checkCache()
+        if self.uniformConstants_ is None:
+            self.uniformConstants_ = self.uniformConstants()
+            self.uniformVersion_ = self.lawPtr_.version()
+            pass
+        
+        return self.uniformConstants_
+
+
+    #-------------------------------------------------------------------------
+    #- Return uniform first Lame's coefficient
+    def uniformMu( self ):
+        return self._currentUniformConstants()[ "mu" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return uniform second Lame's coefficient
+    def uniformLambda( self ):
+        return self._currentUniformConstants()[ "lambda" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return uniform threeK
+    def uniformThreeK( self ):
+        return self._currentUniformConstants()[ "threeK" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return a new field of the given value, the constants are kept by the
+    #  caches and are never taken from the scratch field pool
+    def _newField( self, value ):
+        from materialModels.fieldPool import newField
+        return newField( value.name(), self.sigma_.mesh(), value, self.sigma_.db() )
+
+
+    #-------------------------------------------------------------------------
+    #- Evaluate all elastic constants as fields, reading E, nu and rho once
+    def _calcConstants( self, *args ):
+        result = {}
+        if self.uniform():
+           for name, value in self.uniformConstants( *args ).items():
+               result[ name ] = self._newField( value )
+               result[ name ].correctBoundaryConditions()
+           return result
+        
+        # The property fields of the law are only read here, they go back to the pool
+        from materialModels import fieldPool
+        with fieldPool.scratch():
+            self._fillConstants( result, *args )
+        
+        return result
+
+
+    #-------------------------------------------------------------------------
+    def _fillConstants( self, result, *args ):
+        # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
+        lawRho = self.lawPtr_.rho( *args )
+        lawE = self.lawPtr_.E( *args )
+        lawNu = self.lawPtr_.nu( *args )
+        
+        from materialModels.fieldArrays import toArray
+        from materialModels.rheologyModel.elasticConstants import elasticConstants, names
+        E = toArray( lawE.internalField() )
+        nu = toArray( lawNu.internalField() )
+        rho = toArray( lawRho.internalField() )
+        dimensions = self._dimensions( lawE.dimensions(), lawRho.dimensions() )
+        
+        values = []
+        for name in names:
+            result[ name ] = self._newField( OpenFOAM.dimensionedScalar( OpenFOAM.word( name ), dimensions[ name ], 0.0 ) )
+            # Evaluated straight into the field
+            values.append( toArray( result[ name ].internalField() ) )
+        
+        planeStress = self.planeStress()
+        def kernel( start, end ):
+            elasticConstants( E[ start : end ], nu[ start : end ], rho[ start : end ], planeStress,
+                              [ value[ start : end ] for value in values ] )
+        
+        from materialModels import chunkedPool
+        chunkedPool.instance().run( kernel, E.shape[ 0 ] )
+        
+        for name in names:
+            result[ name ].correctBoundaryConditions()
+        pass
+
+
+    #-------------------------------------------------------------------------
+    #- Return elastic constants mu, lambda, threeK, bulk modulus K and
+    #  dilatational wave speed Cp as a dictionary of fields. 
+    #  Constants at a given time are kept in a bounded LRU cache keyed on 
+    #  the time and the state version of the law
+    def elasticConstants( self, *args ):
         if len(args) > 1:
             raise AttributeError("len(args) > 1")
-        flag = False
+        
+        self.checkCache()
         if len(args) == 1:
             try:
                 t = float(args[0])
-                flag = True
             except ValueError:
                 raise AttributeError ("The arg is not float")
-                
-        if flag: 
-            lawE = self.lawPtr_.E( t )
-            lawNu = self.lawPtr_.nu( t )
-        else:
-            lawE = self.lawPtr_.E()
-            lawNu = self.lawPtr_.nu()
-
-        
-        from Foam.finiteVolume import volScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
-        result  = volScalarField( IOobject( word( "mu" ),
-                                            fileName( self.sigma_.time().timeName() ),
-                                            self.sigma_.db(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                  lawE / ( 2.0 * ( 1.0 + lawNu ) ) )
-        return result
+            
+            if self.lawPtr_.timeDependent():
+               key = ( t, self.lawPtr_.version() )
+               result = self.timeCache_.lookup( key )
+               if result is None:
+                  result = self.timeCache_.insert( key, self._calcConstants( t ) )
+                  pass
+               return result
+            pass
+        
+        # Properties of a time-independent law are the same at any time
+        if self.constants_ is None:
+            self.constants_ = self._calcConstants()
+            self.constantsVersion_ = self.lawPtr_.version()
+            pass
+        
+        return self.constants_
+
+
+    #-------------------------------------------------------------------------
+    #- Return first Lame's coefficient
+    def mu( self, *args ):
+        return self.elasticConstants( *args )[ "mu" ]
 
 
     #-------------------------------------------------------------------------
     #- Return second Lame's coefficient
     def _lambda( self, *args ):    
-        if len(args) > 1:
-            raise AttributeError("len(args) > 1")
-        flag = False
-        if len(args) == 1:
-            try:
-                arg = float(args[0])
-                flag = True
-            except ValueError:
-                raise AttributeError ("The arg is not float")
+        return self.elasticConstants( *args )[ "lambda" ]
         
-        if flag: 
-            lawE = self.lawPtr_.E( t )
-            lawNu = self.lawPtr_.nu( t )
-        else:
-            lawE = self.lawPtr_.E()
-            lawNu = self.lawPtr_.nu()
         
-        from Foam.finiteVolume import volScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
+    #-------------------------------------------------------------------------
+    #- Return threeK
+    def threeK( self ):
+        return self.elasticConstants()[ "threeK" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return bulk modulus
+    def K( self ):
+        return self.elasticConstants()[ "K" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return dilatational wave speed
+    def Cp( self ):
+        return self.elasticConstants()[ "Cp" ]
+
+
+    #-------------------------------------------------------------------------
+    #- Return modulus of elasticity on the given patch
+    def patchE( self, patchI ):
+        return self.lawPtr_.patchE( patchI )
+
+
+    #-------------------------------------------------------------------------
+    #- Return Poisson's ratio on the given patch
+    def patchNu( self, patchI ):
+        return self.lawPtr_.patchNu( patchI )
+
+
+    #-------------------------------------------------------------------------
+    #- Return first Lame's coefficient on the given patch,
+    #  evaluated from the face cells only unless the field is already cached
+    def patchMu( self, patchI ):
+        try:
+            patchI = int( patchI )
+        except ValueError:
+            raise AttributeError ("The patchI is not int")
         
-        if self.planeStress():
-           result = volScalarField( IOobject( word( "lambda" ),
-                                              fileName( self.sigma_.time().timeName() ),
-                                              self.sigma_.db(),
-                                              IOobject.NO_READ,
-                                              IOobject.NO_WRITE ),
-                                    lawNu * lawE / ( ( 1.0 + lawNu ) * ( 1.0 - lawNu ) ) )
-        else:
-           result = volScalarField( IOobject( word( "lambda" ),
-                                              fileName( self.sigma_.time().timeName() ),
-                                              self.sigma_.db(),
-                                              IOobject.NO_READ,
-                                              IOobject.NO_WRITE ),
-                                    lawNu * lawE / ( ( 1.0 + lawNu ) * ( 1.0 - 2.0 * lawNu ) ) ) 
-        return result
+        if self.uniform():
+           return OpenFOAM.scalarField( self.sigma_.mesh().boundary()[ patchI ].size(), self.uniformMu().value() )
+        
+        self.checkCache()
+        if self.constants_ is not None:
+           return OpenFOAM.scalarField( self.constants_[ "mu" ].ext_boundaryField()[ patchI ] )
         
+        lawE = self.lawPtr_.patchE( patchI )
+        lawNu = self.lawPtr_.patchNu( patchI )
         
+        return lawE / ( 2.0 * ( 1.0 + lawNu ) )
+
+
     #-------------------------------------------------------------------------
-    #- Return threeK
-    def threeK( self ):
-        lawRho = self.lawPtr_.rho()
-        lawE = self.lawPtr_.E()
-        lawNu = self.lawPtr_.nu()
+    #- Return second Lame's coefficient on the given patch
+    def patchLambda( self, patchI ):
+        try:
+            patchI = int( patchI )
+        except ValueError:
+            raise AttributeError ("The patchI is not int")
+        
+        if self.uniform():
+           return OpenFOAM.scalarField( self.sigma_.mesh().boundary()[ patchI ].size(), self.uniformLambda().value() )
+        
+        self.checkCache()
+        if self.constants_ is not None:
+           return OpenFOAM.scalarField( self.constants_[ "lambda" ].ext_boundaryField()[ patchI ] )
+        
+        lawE = self.lawPtr_.patchE( patchI )
+        lawNu = self.lawPtr_.patchNu( patchI )
         
-        from Foam.finiteVolume import volScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
         if self.planeStress():
-           result = volScalarField( IOobject( word( "threeK" ),
-                                              fileName( self.sigma_.time().timeName() ),
-                                              self.sigma_.db(),
-                                              IOobject.NO_READ,
-                                              IOobject.NO_WRITE ),
-                                    lawE / ( lawRho * ( 1 - lawNu ) ) )
-        else:
-           result = volScalarField( IOobject( word( "threeK" ),
-                                              fileName( self.sigma_.time().timeName() ),
-                                              self.sigma_.db(),
-                                              IOobject.NO_READ,
-                                              IOobject.NO_WRITE ),
-                                    lawE / ( lawRho * ( 1 - 2 * lawNu ) ) )
-        return result
+           return lawNu * lawE / ( ( 1.0 + lawNu ) * ( 1.0 - lawNu ) )
+        
+        return lawNu * lawE / ( ( 1.0 + lawNu ) * ( 1.0 - 2.0 * lawNu ) )
 
 
     #-------------------------------------------------------------------------
     #- Return yield stress
     def sigmaY( self ):
-        self.lawPtr_.sigmaY()
+        return self.lawPtr_.sigmaY()
 
     #-------------------------------------------------------------------------
     #- Return plastic modulus
     def Ep( self ):
-        self.lawPtr_.Ep()
+        return self.lawPtr_.Ep()
 
 
     #-------------------------------------------------------------------------
     #- Correct the rheological model
     def correct( self ):
         self.lawPtr_.correct()
+        self.clearOut()
 
 
     #-------------------------------------------------------------------------
@@ -207,6 +465,12 @@ class rheologyModel( IOdictionary ):
            from Foam.OpenFOAM import word
            from materialModels.rheologyModel.rheologyLaws import rheologyLaw
            self.lawPtr_ = rheologyLaw.New( word( "law" ), self.sigma_, self.subDict("rheology"));
+           self.clearOut()
+           from materialModels.lruCache import lruCache
+           self.timeCache_ = lruCache( self._timeCacheSize() )
+           from materialModels import chunkedPool, fieldPool
+           chunkedPool.configure( self )
+           fieldPool.configure( self )
 
            return True 
         else:
@@ -0,0 +1,75 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+#- Names of the elastic constants in the order returned by elasticConstants
+names = ( "mu", "lambda", "threeK", "K", "Cp" )
+
+
+#----------------------------------------------------------------------------
+#- Evaluate mu, lambda, threeK, the bulk modulus K and the dilatational
+#  wave speed Cp from E, nu and rho in one pass.
+#  Works on floats as well as on NumPy arrays, floats give arrays of size one.
+#  The results are written into the five arrays of out if given, e.g. into
+#  slices of larger arrays when evaluated chunk by chunk
+def elasticConstants( E, nu, rho, planeStress, out = None ):
+    import numpy
+    E = numpy.atleast_1d( numpy.asarray( E, float ) )
+    nu = numpy.atleast_1d( numpy.asarray( nu, float ) )
+    rho = numpy.atleast_1d( numpy.asarray( rho, float ) )
+
+    if out is None:
+       shape = numpy.broadcast( E, nu, rho ).shape
+       out = [ numpy.empty( shape ) for name in names ]
+       pass
+    mu, _lambda, threeK, K, Cp = out
+
+    # 1 + nu and the compressibility term are the only temporaries
+    onePlusNu = nu + 1.0
+    if planeStress:
+       compress = 1.0 - nu
+    else:
+       compress = 1.0 - 2.0 * nu
+
+    numpy.divide( E, onePlusNu, out = mu )
+    mu *= 0.5
+
+    numpy.multiply( nu, E, out = _lambda )
+    _lambda /= onePlusNu
+    _lambda /= compress
+
+    numpy.divide( E, rho, out = threeK )
+    threeK /= compress
+
+    numpy.multiply( mu, 2.0 / 3.0, out = K )
+    K += _lambda
+
+    numpy.multiply( mu, 2.0, out = Cp )
+    Cp += _lambda
+    Cp /= rho
+    numpy.sqrt( Cp, out = Cp )
+
+    return mu, _lambda, threeK, K, Cp
+
+
+#----------------------------------------------------------------------------
@@ -0,0 +1,402 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+#----------------------------------------------------------------------------
+from materialModels.rheologyModel.rheologyLaws import rheologyLaw
+from materialModels.lazyImport import OpenFOAM
+
+
+#----------------------------------------------------------------------------
+# Linear viscoelastic law given by the Prony series of the relaxation modulus
+#
+#     E( t ) = EInf + sum_i moduli[ i ]*exp( -t/relaxationTimes[ i ] )
+#
+# The creep compliance is the equivalent series over the retardation times
+#
+#     J( t ) = 1/EInf - sum_j compliances[ j ]*exp( -t/retardationTimes[ j ] )
+#
+# found once at construction. correct() integrates the creep strain of the
+# stress history recursively, keeping one symmTensor per term per cell of
+# the law.
+#
+#     rheology
+#     {
+#         type            PronyViscoelastic;
+#         rho             rho [1 -3 0 0 0 0 0] 1000;
+#         EInf            EInf [1 -1 -2 0 0 0 0] 1e9;
+#         nu              nu [0 0 0 0 0 0 0] 0.3;
+#         moduli          ( 2e9 5e8 );
+#         relaxationTimes ( 0.1 10 );
+#     }
+class PronyViscoelastic( rheologyLaw ):
+    def __init__( self, name, sigma, dict_ ):
+
+        from Foam.OpenFOAM import word, dictionary
+        from Foam.finiteVolume import volSymmTensorField
+        try:
+            name = word( str( name ) )
+        except ValueError:
+           raise AttributeError("The second arg is not string")
+
+        try:
+            volSymmTensorField.ext_isinstance( sigma )
+        except TypeError:
+            raise AssertionError( "sigma != volSymmTensorField" )
+
+        try:
+            dictionary.ext_isinstance( dict_ )
+        except TypeError:
+            raise AssertionError( "dict_ != dictionary" )
+
+        rheologyLaw.__init__( self, name, sigma, dict_ )
+
+        from Foam.OpenFOAM import dimensionedScalar, scalarField
+        self.rho_ = dimensionedScalar( dict_.lookup( word( "rho" ) ) )
+        self.EInf_ = dimensionedScalar( dict_.lookup( word( "EInf" ) ) )
+        self.nu_ = dimensionedScalar( dict_.lookup( word( "nu" ) ) )
+
+        import numpy
+        from materialModels.fieldArrays import toArray
+        moduli = toArray( scalarField( dict_.lookup( word( "moduli" ) ) ) )
+        relaxationTimes = toArray( scalarField( dict_.lookup( word( "relaxationTimes" ) ) ) )
+
+        if moduli.shape != relaxationTimes.shape or moduli.shape[ 0 ] == 0:
+           raise IOError( "moduli and relaxationTimes of %s must be non-empty lists of equal size" % name )
+        if self.EInf_.value() <= 0.0 or numpy.any( moduli <= 0.0 ) or numpy.any( relaxationTimes <= 0.0 ):
+           raise IOError( "EInf, moduli and relaxationTimes of %s must be positive" % name )
+
+        order = numpy.argsort( relaxationTimes )
+        self.moduli_ = moduli[ order ]
+        self.relaxationTimes_ = relaxationTimes[ order ]
+
+        self.retardationTimes_, self.compliances_ = self._retardation()
+
+        # Hereditary integral state of the cells of the law, in the order of
+        # cells(), see correct
+        self.history_ = None
+        pass
+
+
+    #-----------------------------------------------------------------------------------------
+    def type(self):
+        return OpenFOAM.word( "PronyViscoelastic" )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return retardation times and compliances of the creep series.
+    #  The retardation times are the roots of
+    #      EInf + sum_i moduli[ i ]*tau[ i ]/( tau[ i ] - lambda ) = 0,
+    #  one between each pair of relaxation times and one above the largest
+    def _retardation( self ):
+        import numpy
+        EInf = self.EInf_.value()
+        moduli = self.moduli_
+        tau = self.relaxationTimes_
+
+        def f( lam ):
+            return EInf + numpy.sum( moduli * tau / ( tau - lam.reshape( -1, 1 ) ), axis = 1 )
+
+        # f grows from -inf to +inf on each bracket, so bisection always converges
+        lower = tau.copy()
+        upper = numpy.append( tau[ 1: ], 2.0 * tau[ -1 ] * ( 1.0 + moduli.sum() / EInf ) )
+        for iteration in range( 200 ):
+            middle = 0.5 * ( lower + upper )
+            negative = f( middle ) < 0.0
+            lower = numpy.where( negative, middle, lower )
+            upper = numpy.where( negative, upper, middle )
+        retardationTimes = 0.5 * ( lower + upper )
+
+        # Residues of the creep compliance transform at s = -1/lambda
+        s = -1.0 / retardationTimes
+        dG = numpy.sum( moduli * tau / ( 1.0 + s.reshape( -1, 1 ) * tau ) ** 2, axis = 1 )
+        compliances = -1.0 / ( s * dG )
+
+        return retardationTimes, compliances
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return relaxation modulus value(s) for a time or an array of times
+    def relaxationModulus( self, t ):
+        import numpy
+        t = numpy.asarray( t, float )
+        terms = numpy.exp( -t.reshape( t.shape + ( 1, ) ) / self.relaxationTimes_ )
+
+        return self.EInf_.value() + numpy.dot( terms, self.moduli_ )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return creep compliance value(s) for a time or an array of times
+    def compliance( self, t ):
+        import numpy
+        t = numpy.asarray( t, float )
+        terms = numpy.exp( -t.reshape( t.shape + ( 1, ) ) / self.retardationTimes_ )
+
+        return 1.0 / self.EInf_.value() - numpy.dot( terms, self.compliances_ )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- The relaxation modulus changes with time
+    def timeDependent( self ):
+        return True
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Properties are uniform in space
+    def uniform( self ):
+        return True
+
+
+    #-----------------------------------------------------------------------------------------
+    def uniformKey( self ):
+        return rheologyLaw.uniformKey( self ) + ( tuple( self.moduli_ ), tuple( self.relaxationTimes_ ) )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform density
+    def uniformRho( self, *args ):
+        return self.rho_
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform modulus of elasticity, the relaxation modulus at the given
+    #  or at the current time
+    def uniformE( self, *args ):
+        t = self.mesh().time().value()
+        if len( args ) == 1:
+           t = float( args[ 0 ] )
+
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "E" ), self.EInf_.dimensions(), float( self.relaxationModulus( t ) ) )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform Poisson's ratio
+    def uniformNu( self, *args ):
+        return self.nu_
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform creep compliance at the given time
+    def uniformJ( self, t ):
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "J" ), OpenFOAM.dimless / self.EInf_.dimensions(), float( self.compliance( t ) ) )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform modulus of plasticity
+    def uniformEp( self ):
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroEp" ), OpenFOAM.dimForce/OpenFOAM.dimArea, 0.0 )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform yield stress
+    def uniformSigmaY( self ):
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroSigmaY" ), OpenFOAM.dimForce/OpenFOAM.dimArea, OpenFOAM.GREAT )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return modulus of elasticity on the given patch
+    def patchE( self, patchI ):
+        return OpenFOAM.scalarField( self.mesh().boundary()[ patchI ].size(), self.uniformE().value() )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return Poisson's ratio on the given patch
+    def patchNu( self, patchI ):
+        return OpenFOAM.scalarField( self.mesh().boundary()[ patchI ].size(), self.nu_.value() )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return density
+    def rho( self, *args ):
+        if len(args) > 1:
+            raise AttributeError("len(args) > 1")
+        if len(args) == 1:
+            try:
+                arg = float(args[0])
+            except ValueError:
+                raise AttributeError ("The args is not float")
+
+        return self._uniformField( "rho", self.rho_ )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return relaxation modulus at the given or at the current time
+    def E( self, *args ):
+        if len(args) > 1:
+            raise AttributeError("len(args) > 1")
+        if len(args) == 1:
+            try:
+                arg = float(args[0])
+            except ValueError:
+                raise AttributeError ("The args is not float")
+
+        return self._uniformField( "E", self.uniformE( *args ) )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return Poisson's ratio
+    def nu( self, *args ):
+        if len(args) > 1:
+            raise AttributeError("len(args) > 1")
+        if len(args) == 1:
+            try:
+                arg = float(args[0])
+            except ValueError:
+                raise AttributeError ("The args is not float")
+
+        return self._uniformField( "nu", self.nu_ )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return modulus of plasticity
+    def Ep( self ):
+        return self._uniformField( "Ep", self.uniformEp() )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return yield stress
+    def sigmaY( self ):
+        return self._uniformField( "sigmaY", self.uniformSigmaY() )
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Return creep compliance : a field for a scalar time,
+    #  a NumPy array of values for an array of times
+    def J( self, t ):
+        import numpy
+        if numpy.ndim( t ) > 0:
+           return self.compliance( t )
+
+        try:
+            t = float( t )
+        except ValueError:
+            raise AttributeError ("The t is not scalar")
+
+        return self._uniformField( "J", self.uniformJ( t ) )
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Integrate the hereditary creep integral over the current time step.
+    #  For every retardation term j the state
+    #      r_j( t ) = integral exp( -( t - s )/lambda_j ) dsigma( s )
+    #  is advanced recursively, assuming stress linear in time over the step
+    #      r_j = exp( -dt/lambda_j )*r_j_old + ( 1 - exp( -dt/lambda_j ) )*lambda_j/dt*( sigma - sigma_old )
+    #  Repeated calls within a time step restart from the last accepted state
+    def correct( self ):
+        import numpy
+        from materialModels.fieldArrays import toArray
+        sigma = toArray( self.sigma_.internalField(), 6 )
+        if self.cells() is not None:
+           sigma = sigma[ self.cells() ]
+        time = self.mesh().time()
+
+        nTerms = self.retardationTimes_.shape[ 0 ]
+        if self.history_ is None or self.history_.shape[ 1 ] != sigma.shape[ 0 ]:
+           self.history_ = numpy.zeros( ( nTerms, ) + sigma.shape )
+           self.trialHistory_ = numpy.zeros( ( nTerms, ) + sigma.shape )
+           self.sigmaOld_ = numpy.zeros( sigma.shape )
+           self.trialSigma_ = numpy.zeros( sigma.shape )
+           self.historyTimeIndex_ = time.timeIndex()
+        elif time.timeIndex() != self.historyTimeIndex_:
+           # Accept the state of the previous time step
+           self.history_, self.trialHistory_ = self.trialHistory_, self.history_
+           self.sigmaOld_[ ... ] = self.trialSigma_
+           self.historyTimeIndex_ = time.timeIndex()
+           pass
+
+        x = time.deltaT().value() / self.retardationTimes_
+        decay = numpy.exp( -x )
+        weight = -numpy.expm1( -x ) / x
+
+        dSigma = numpy.subtract( sigma, self.sigmaOld_, out = self.trialSigma_ )
+        for termI in range( nTerms ):
+            trial = self.trialHistory_[ termI ]
+            numpy.multiply( self.history_[ termI ], decay[ termI ], out = trial )
+            trial += weight[ termI ] * dSigma
+
+        self.trialSigma_[ ... ] = sigma
+        pass
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Move the hereditary state of the cells staying with the law, the cells
+    #  entering it start from an unloaded history
+    def setCells( self, cells ):
+        if self.history_ is not None and self.history_.shape[ 1 ] == self.nCells():
+           old = self.cells()
+           for name in ( "history_", "trialHistory_" ):
+               history = getattr( self, name ).swapaxes( 0, 1 )
+               setattr( self, name, self._remapCells( history, old, cells ).swapaxes( 0, 1 ).copy() )
+           self.sigmaOld_ = self._remapCells( self.sigmaOld_, old, cells )
+           self.trialSigma_ = self._remapCells( self.trialSigma_, old, cells )
+           pass
+        rheologyLaw.setCells( self, cells )
+        pass
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Return creep strain of the current state as an array of shape
+    #  ( number of cells of the law, 6 )
+    def creepStrainArray( self ):
+        import numpy
+        if self.history_ is None:
+           self.correct()
+
+        # sum_j J_j*( sigma - r_j ) in stress units times compliance
+        S = self.trialSigma_ * self.compliances_.sum()
+        for termI in range( self.compliances_.shape[ 0 ] ):
+            S -= self.compliances_[ termI ] * self.trialHistory_[ termI ]
+
+        # Isotropic compliance operator per unit modulus
+        nu = self.nu_.value()
+        trS = S[ :, 0 ] + S[ :, 3 ] + S[ :, 5 ]
+        S *= 1.0 + nu
+        for d in ( 0, 3, 5 ):
+            S[ :, d ] -= nu * trS
+
+        return S
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Return creep strain field
+    def creepStrain( self ):
+        from Foam.finiteVolume import volSymmTensorField, zeroGradientFvPatchSymmTensorField
+        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedSymmTensor, symmTensor, dimless
+        result = volSymmTensorField( IOobject( word( "epsilonCreep" ),
+                                               fileName( self.mesh().time().timeName() ),
+                                               self.mesh(),
+                                               IOobject.NO_READ,
+                                               IOobject.NO_WRITE ),
+                                     self.mesh(),
+                                     dimensionedSymmTensor( word( "zero" ), dimless, symmTensor.zero ),
+                                     zeroGradientFvPatchSymmTensorField.typeName )
+
+        from materialModels.fieldArrays import assign, toArray
+        if self.cells() is None:
+           assign( result.internalField(), self.creepStrainArray() )
+        else:
+           toArray( result.internalField(), 6 )[ self.cells() ] = self.creepStrainArray()
+        result.correctBoundaryConditions()
+
+        return result
+
+
+#----------------------------------------------------------------------------
@@ -23,7 +23,19 @@
 
 #----------------------------------------------------------------------------
 from rheologyLaw import *
-from multiMaterial import *
-from linearElastic import *
 from addDictionaryConstructorTable import *
 
+
+#----------------------------------------------------------------------------
+# The laws are imported by rheologyLaw.New when first selected, a law class
+# is reached through its module
+#
+#     from materialModels.rheologyModel.rheologyLaws.linearElastic import linearElastic
+for lawName in ( "linearElastic", "multiMaterial", "PronyViscoelastic", "elastoPlastic" ):
+    addDictionaryConstructorTable( lawName, "%s.%s.%s" % ( __name__, lawName, lawName ) )
+    pass
+
+del lawName
+
+
+#----------------------------------------------------------------------------
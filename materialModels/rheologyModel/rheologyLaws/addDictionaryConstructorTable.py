@@ -20,7 +20,12 @@
 ## Author : Alexey PETROV
 ##
 
+
 #----------------------------------------------------------------------------
+# Run-time selection table of the rheology laws. A law is registered either
+# by its class or by the dotted name of the class, "<module>.<class>", in
+# which case the module is imported only when rheologyLaw.New first asks
+# for the law.
 class addDictionaryConstructorTable:
      
      dictionaryTable = {}
@@ -29,9 +34,30 @@ class addDictionaryConstructorTable:
          if not addDictionaryConstructorTable.dictionaryTable.has_key(name):
             addDictionaryConstructorTable.dictionaryTable[ name ] = nameClass
             pass
-         else:
+         elif isinstance( addDictionaryConstructorTable.dictionaryTable[ name ], str ) and not isinstance( nameClass, str ):
+            # An explicitly given class replaces the lazy entry of the same name
+            addDictionaryConstructorTable.dictionaryTable[ name ] = nameClass
+            pass
+         elif addDictionaryConstructorTable.dictionaryTable[ name ] is not nameClass:
             print "The model %s is already registered" %name
             pass
+     
+     
+     #-------------------------------------------------------------------------
+     #- Return the class registered under the name, importing it if needed
+     @staticmethod
+     def lookup( name ):
+         nameClass = addDictionaryConstructorTable.dictionaryTable[ name ]
+         
+         if isinstance( nameClass, str ):
+            moduleName, className = nameClass.rsplit( ".", 1 )
+            module = __import__( moduleName, globals(), locals(), [ className ] )
+            nameClass = getattr( module, className )
+            addDictionaryConstructorTable.dictionaryTable[ name ] = nameClass
+            pass
+         
+         return nameClass
+     
      pass
             
 
@@ -0,0 +1,188 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+## 
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+## 
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+## 
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+from materialModels.rheologyModel.rheologyLaws.linearElastic import linearElastic
+from materialModels.fieldArrays import toArray, assign
+from materialModels.lazyImport import numpy, OpenFOAM
+
+
+#----------------------------------------------------------------------------
+# Von Mises plasticity with linear isotropic hardening
+#
+#     rheology
+#     {
+#         type            elastoPlastic;
+#         rho             rho [1 -3 0 0 0 0 0] 7800;
+#         E               E [1 -1 -2 0 0 0 0] 2e11;
+#         nu              nu [0 0 0 0 0 0 0] 0.3;
+#         sigmaY          sigmaY [1 -1 -2 0 0 0 0] 2.5e8;
+#         Ep              Ep [1 -1 -2 0 0 0 0] 2e9;
+#     }
+#
+# sigmaY is the initial yield stress and Ep the plastic modulus, the slope
+# of the yield stress against the equivalent plastic strain. The solver
+# puts the elastic trial stress into sigma, correct() maps it back onto the
+# yield surface ( radial return ) and updates the equivalent plastic strain.
+# The return always starts from the plastic strain accepted at the end of
+# the previous time step, so the outer correctors of a time step do not
+# harden the material again. The plastic state is kept for the cells of the
+# law only, cells entering it under multiMaterial start unstrained.
+class elastoPlastic( linearElastic ):
+    def __init__( self, name, sigma, dict_ ):
+        linearElastic.__init__( self, name, sigma, dict_ )
+
+        from Foam.OpenFOAM import word, dimensionedScalar
+        self.sigmaY_ = dimensionedScalar( dict_.lookup( word( "sigmaY" ) ) )
+        self.Ep_ = dimensionedScalar( dict_.lookup( word( "Ep" ) ) )
+
+        if self.sigmaY_.value() <= 0.0 or self.Ep_.value() < 0.0:
+           raise IOError( "sigmaY of %s must be positive and Ep not negative" % name )
+
+        # Equivalent plastic strain per cell of the law, in the order of cells(),
+        # of the current iterate and the one accepted at the end of the previous
+        # time step, see correct
+        self.epsilonPEq_ = None
+        self.epsilonPEqOld_ = None
+        self.stateTimeIndex_ = None
+        pass
+
+
+    #-----------------------------------------------------------------------------------------
+    def type(self):
+        return OpenFOAM.word( "elastoPlastic" )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform modulus of plasticity
+    def uniformEp( self ):
+        return self.Ep_
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return uniform initial yield stress
+    def uniformSigmaY( self ):
+        return self.sigmaY_
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Return shear modulus
+    def _mu( self ):
+        return self.E_.value() / ( 2.0 * ( 1.0 + self.nu_.value() ) )
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Move the plastic state of the cells staying with the law
+    def setCells( self, cells ):
+        if self.epsilonPEq_ is not None and self.epsilonPEq_.shape[ 0 ] == self.nCells():
+           self.epsilonPEq_ = self._remapCells( self.epsilonPEq_, self.cells(), cells )
+           self.epsilonPEqOld_ = self._remapCells( self.epsilonPEqOld_, self.cells(), cells )
+           pass
+        linearElastic.setCells( self, cells )
+        pass
+
+
+    #-----------------------------------------------------------------------------------------
+    #- Allocate the plastic state for the cells of the law and accept the
+    #  iterate of the previous time step once the time index has advanced
+    def _checkState( self ):
+        nCells = self.nCells()
+        timeIndex = self.mesh().time().timeIndex()
+        if self.epsilonPEq_ is None or self.epsilonPEq_.shape[ 0 ] != nCells:
+           self.epsilonPEq_ = numpy.zeros( nCells )
+           self.epsilonPEqOld_ = numpy.zeros( nCells )
+           self.stateTimeIndex_ = timeIndex
+        elif timeIndex != self.stateTimeIndex_:
+           self.epsilonPEqOld_[ ... ] = self.epsilonPEq_
+           self.stateTimeIndex_ = timeIndex
+           pass
+        pass
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Radial return of the trial stress over the cells of the law from the
+    #  accepted hardening state. Repeated calls within a time step replace
+    #  the iterate instead of adding to it
+    def correct( self ):
+        self._checkState()
+
+        sigma = toArray( self.sigma_.internalField(), 6 )
+        cells = self.cells()
+        trial = sigma
+        if cells is not None:
+           trial = sigma[ cells ]
+        epsilonPEqOld = self.epsilonPEqOld_
+        self.epsilonPEq_[ ... ] = epsilonPEqOld
+
+        # Deviatoric trial stress, components xx xy xz yy yz zz
+        p = ( trial[ :, 0 ] + trial[ :, 3 ] + trial[ :, 5 ] ) / 3.0
+        s = trial.copy()
+        for d in ( 0, 3, 5 ):
+            s[ :, d ] -= p
+
+        # 3/2 s:s against the square of the current yield stress, no square roots for elastic cells
+        ss = s[ :, 0 ] ** 2 + s[ :, 3 ] ** 2 + s[ :, 5 ] ** 2 + 2.0 * ( s[ :, 1 ] ** 2 + s[ :, 2 ] ** 2 + s[ :, 4 ] ** 2 )
+        yieldStress = self.sigmaY_.value() + self.Ep_.value() * epsilonPEqOld
+        plastic = numpy.nonzero( 1.5 * ss > yieldStress ** 2 * ( 1.0 + 1.0e-12 ) )[ 0 ]
+        if plastic.shape[ 0 ] == 0:
+           return
+
+        q = numpy.sqrt( 1.5 * ss[ plastic ] )
+        mu = self._mu()
+        dEpsilonPEq = ( q - yieldStress[ plastic ] ) / ( 3.0 * mu + self.Ep_.value() )
+
+        # Scale the deviator back onto the yield surface
+        scale = ( 3.0 * mu * dEpsilonPEq / q ).reshape( -1, 1 )
+        returned = trial[ plastic ] - scale * s[ plastic ]
+
+        self.epsilonPEq_[ plastic ] = epsilonPEqOld[ plastic ] + dEpsilonPEq
+        if cells is not None:
+           plastic = cells[ plastic ]
+        sigma[ plastic ] = returned
+
+        assign( self.sigma_.internalField(), sigma )
+        self.sigma_.correctBoundaryConditions()
+        pass
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Return the equivalent plastic strain as an array over the cells of the law
+    def epsilonPEqArray( self ):
+        self._checkState()
+        return self.epsilonPEq_
+
+
+    #-------------------------------------------------------------------------------------------
+    #- Return the equivalent plastic strain field
+    def epsilonPEq( self ):
+        result = self._uniformField( "epsilonPEq", OpenFOAM.dimensionedScalar( OpenFOAM.word( "zero" ), OpenFOAM.dimless, 0.0 ) )
+        if self.cells() is None:
+           assign( result.internalField(), self.epsilonPEqArray() )
+        else:
+           toArray( result.internalField() )[ self.cells() ] = self.epsilonPEqArray()
+        result.correctBoundaryConditions()
+
+        return result
+
+
+#----------------------------------------------------------------------------
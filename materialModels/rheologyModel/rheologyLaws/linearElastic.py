@@ -22,6 +22,7 @@
 
 #----------------------------------------------------------------------------
 from materialModels.rheologyModel.rheologyLaws import rheologyLaw
+from materialModels.lazyImport import OpenFOAM
 
 
 #----------------------------------------------------------------------------
@@ -57,8 +58,55 @@ class linearElastic( rheologyLaw ):
            
     #-----------------------------------------------------------------------------------------        
     def type(self):
-        from Foam.OpenFOAM import word
-        return word( "linearElastic" )
+        return OpenFOAM.word( "linearElastic" )
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Properties of the linear elastic law are uniform in space
+    def uniform( self ):
+        return True
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return uniform density
+    def uniformRho( self, *args ):
+        return self.rho_
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return uniform modulus of elasticity
+    def uniformE( self, *args ):
+        return self.E_
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return uniform Poisson's ratio
+    def uniformNu( self, *args ):
+        return self.nu_
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return uniform modulus of plasticity
+    def uniformEp( self ):
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroEp" ), OpenFOAM.dimForce/OpenFOAM.dimArea, 0.0 )
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return uniform yield stress
+    def uniformSigmaY( self ):
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroSigmaY" ), OpenFOAM.dimForce/OpenFOAM.dimArea, OpenFOAM.GREAT )
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return modulus of elasticity on the given patch
+    def patchE( self, patchI ):
+        return OpenFOAM.scalarField( self.mesh().boundary()[ patchI ].size(), self.E_.value() )
+    
+    
+    #-----------------------------------------------------------------------------------------        
+    #- Return Poisson's ratio on the given patch
+    def patchNu( self, patchI ):
+        return OpenFOAM.scalarField( self.mesh().boundary()[ patchI ].size(), self.nu_.value() )
     
     
     #-----------------------------------------------------------------------------------------        
@@ -72,21 +120,7 @@ class linearElastic( rheologyLaw ):
             except ValueError:
                 raise AttributeError ("The args is not float")
         
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField, tmp_volScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
-        
-        result = volScalarField( IOobject( word( "rho" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                  self.mesh(),
-                                  self.rho_,
-                                  zeroGradientFvPatchScalarField.typeName )
-        
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._uniformField( "rho", self.uniformRho() )
         
         
     #-----------------------------------------------------------------------------------------        
@@ -100,20 +134,7 @@ class linearElastic( rheologyLaw ):
             except ValueError:
                 raise AttributeError ("The args is not float")
                 
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField,tmp_volScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
-        result = volScalarField( IOobject( word( "E" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                            self.mesh(),
-                                            self.E_,
-                                            zeroGradientFvPatchScalarField.typeName )  
-        
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._uniformField( "E", self.uniformE() )
         
 
     #-----------------------------------------------------------------------------------------        
@@ -127,68 +148,30 @@ class linearElastic( rheologyLaw ):
             except ValueError:
                 raise AttributeError ("The args is not float")
         
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject
-        tresult = volScalarField( IOobject( word( "nu" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                            self.mesh(),
-                                            self.nu_,
-                                            zeroGradientFvPatchScalarField.typeName ) 
-        tresult.correctBoundaryConditions()
-        
-        return tresult
+        return self._uniformField( "nu", self.uniformNu() )
 
 
     #-----------------------------------------------------------------------------------------        
     #- Return modulus of plasticity
     def Ep( self ):
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimForce, dimArea
-        tresult = volScalarField( IOobject( word( "Ep" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                            self.mesh(),
-                                            dimensionedScalar( word( "zeroEp" ), dimForce/dimArea, 0.0),
-                                            zeroGradientFvPatchScalarField.typeName )  
-        tresult.correctBoundaryConditions()
-        
-        return tresult
+        return self._uniformField( "Ep", self.uniformEp() )
 
 
     #-----------------------------------------------------------------------------------------        
     # - - Return yield stress
     def sigmaY( self ):
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimForce, dimArea, GREAT
-        tresult = volScalarField( IOobject( word( "sigmaY" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                            self.mesh(),
-                                            dimensionedScalar( word( "zeroSigmaY" ), dimForce/dimArea, GREAT),
-                                            zeroGradientFvPatchScalarField.typeName ) 
-        tresult().correctBoundaryConditions()
-        
-        return tresult
+        return self._uniformField( "sigmaY", self.uniformSigmaY() )
 
 
     #------------------------------------------------------------------------------------------- 
-    #- Return creep compliance
+    #- Return creep compliance, constant for the elastic solid
     def J(self, t):
          try:
             arg = float( t )
          except ValueError:
                 raise AttributeError ("The t is not scalar")
             
-            
-         raise NotImplementedError("J(scalar t)");
-         pass
+         return self._uniformField( "J", self.uniformJ( t ) )
 
 
     #------------------------------------------------------------------------------------------- 
@@ -24,6 +24,15 @@
 
 #----------------------------------------------------------------------------
 from materialModels.rheologyModel.rheologyLaws import rheologyLaw
+from materialModels.fieldArrays import toArray, toScalarField
+from materialModels import chunkedPool
+from materialModels import fieldPool
+from materialModels.lazyImport import numpy, OpenFOAM
+
+
+#----------------------------------------------------------------------------
+#- Number of moves of cells between materials kept for changedCells
+maxChanges = 64
 
 
 #----------------------------------------------------------------------------
@@ -68,15 +77,262 @@ class multiMaterial( rheologyLaw, list ):
         if self.materials_.ext_min().value() < 0 or self.materials_.ext_max().value() > (len(self) + SMALL):
            raise IOError(" Invalid definition of material indicator field.")
         
+        # ( version before, version after, cells ) of the latest moves of cells
+        # between materials, oldest first, see changedCells
+        self.changes_ = []
+        
+        # Time index at which the materials field was last checked for changes
+        self.scanTimeIndex_ = self.mesh().time().timeIndex()
+        
+        # ( arguments, version, values ) of the latest assembly of rho, E and nu
+        # by name, brought up to date over the moved cells, see _assemble
+        self.assembled_ = {}
+        
+        self.updateIndex()
         pass
  
            
     #-----------------------------------------------------------------------------------------        
     def type(self):
-        from Foam.OpenFOAM import word
-        return word( "multiMaterial" )
+        return OpenFOAM.word( "multiMaterial" )
+    
+    
+    #-----------------------------------------------------------------------------------------    
+    #- Return true if any of the laws is time-dependent
+    def timeDependent( self ):
+        for lawI in self:
+            if lawI.timeDependent():
+               return True
+        
+        return False
+    
+    
+    #-----------------------------------------------------------------------------------------    
+    #- Return the state version, changed by the index or by any of the laws.
+    #  Changes of the materials field since the last time step are picked up first
+    def version( self ):
+        self._checkIndex()
+        
+        return self._version()
+    
+    
+    #-----------------------------------------------------------------------------------------    
+    def _version( self ):
+        result = self.version_
+        for lawI in self:
+            result += lawI.version()
+        
+        return result
     
     
+    #-----------------------------------------------------------------------------------------    
+    #- Build the material label of every cell and the cell list of every material.
+    #  Given the cells whose materials value was changed, only those are re-read
+    #  and moved between the cell lists
+    def updateIndex( self, cells = None ):
+        if cells is not None:
+           cells = numpy.unique( numpy.asarray( cells, numpy.int64 ) )
+           self._moveCells( cells, self._labels( self._materialsAt( cells ) ) )
+           return
+        
+        self.cellLabels_ = self._labels( toArray( self.materials_.internalField() ) )
+        self.materialCells_ = self._materialCells( self.cellLabels_ )
+        for lawI, law in enumerate( self ):
+            law.setCells( self.materialCells_[ lawI ] )
+        self._updateGroups()
+        self.modified()
+        pass
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Merge uniform laws with identical parameters into groups sharing one
+    #  slot of the property tables, non-uniform laws get group -1
+    def _updateGroups( self ):
+        keys = {}
+        self.groupLaws_ = []
+        lawGroups = []
+        for lawI in self:
+            if not lawI.uniform():
+               lawGroups.append( -1 )
+               continue
+            key = lawI.uniformKey()
+            if not keys.has_key( key ):
+               keys[ key ] = len( self.groupLaws_ )
+               self.groupLaws_.append( lawI )
+            lawGroups.append( keys[ key ] )
+        
+        self.lawGroups_ = numpy.array( lawGroups, numpy.int64 )
+        
+        # Cells of no material or of a non-uniform law point to the trailing default slot
+        cellGroups = numpy.append( self.lawGroups_, -1 )[ self.cellLabels_ ]
+        cellGroups[ cellGroups < 0 ] = len( self.groupLaws_ )
+        self.cellGroups_ = cellGroups
+        pass
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Rebuild the index if the mesh size has changed, once per time step move
+    #  the cells whose materials value was changed without telling, e.g. by a
+    #  script writing the field
+    def _checkIndex( self ):
+        if self.cellLabels_.shape[ 0 ] != self.mesh().nCells():
+           self.scanTimeIndex_ = self.mesh().time().timeIndex()
+           self.updateIndex()
+           return
+        
+        timeIndex = self.mesh().time().timeIndex()
+        if timeIndex != self.scanTimeIndex_:
+           self.scanTimeIndex_ = timeIndex
+           labels = self._labels( toArray( self.materials_.internalField() ) )
+           cells = numpy.nonzero( labels != self.cellLabels_ )[ 0 ]
+           if cells.shape[ 0 ] != 0:
+              self._moveCells( cells, labels[ cells ] )
+              pass
+           pass
+        pass
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return the materials values of the given cells
+    def _materialsAt( self, cells ):
+        return toArray( self.materials_.internalField() )[ cells ]
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Set the materials value of the given cells and move them to their new
+    #  material, for material removal or phase change
+    def setMaterials( self, cells, values ):
+        cells = numpy.asarray( cells, numpy.int64 )
+        values = numpy.resize( numpy.asarray( values, float ), cells.shape )
+        
+        toArray( self.materials_.internalField() )[ cells ] = values
+        self.materials_.correctBoundaryConditions()
+        
+        self.updateIndex( cells )
+        pass
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Move the given sorted cells to the given material labels. The cell lists
+    #  of the materials left and entered are spliced, the others are kept
+    def _moveCells( self, cells, labels ):
+        old = self.cellLabels_[ cells ]
+        moved = old != labels
+        cells = cells[ moved ]
+        old = old[ moved ]
+        labels = labels[ moved ]
+        if cells.shape[ 0 ] == 0:
+           return
+        
+        for lawI in numpy.unique( old[ old >= 0 ] ):
+            members = self.materialCells_[ lawI ]
+            self.materialCells_[ lawI ] = numpy.delete( members, numpy.searchsorted( members, cells[ old == lawI ] ) )
+        
+        for lawI in numpy.unique( labels[ labels >= 0 ] ):
+            members = self.materialCells_[ lawI ]
+            entered = cells[ labels == lawI ]
+            self.materialCells_[ lawI ] = numpy.insert( members, numpy.searchsorted( members, entered ), entered )
+        
+        for lawI in numpy.unique( numpy.append( old, labels ) ):
+            if lawI >= 0:
+               self[ lawI ].setCells( self.materialCells_[ lawI ] )
+        
+        self.cellLabels_[ cells ] = labels
+        groups = numpy.append( self.lawGroups_, -1 )[ labels ]
+        groups[ groups < 0 ] = len( self.groupLaws_ )
+        self.cellGroups_[ cells ] = groups
+        
+        before = self._version()
+        self.modified()
+        self.changes_.append( ( before, self._version(), cells ) )
+        del self.changes_[ : -maxChanges ]
+        pass
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return the cells moved between materials since the given version, None
+    #  if anything else changed since then or the moves are no longer logged
+    def changedCells( self, version ):
+        current = self.version()
+        
+        result = []
+        for before, after, cells in self.changes_:
+            if before < version:
+               continue
+            if before != version:
+               return None
+            result.append( cells )
+            version = after
+        
+        if version != current:
+           return None
+        if not result:
+           return numpy.zeros( 0, numpy.int64 )
+        
+        return numpy.unique( numpy.concatenate( result ) )
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return density, modulus of elasticity and Poisson's ratio of the given cells
+    def cellValues( self, cells, *args ):
+        self._checkIndex()
+        cells = numpy.asarray( cells, numpy.int64 )
+        
+        tables = numpy.zeros( ( 3, len( self.groupLaws_ ) + 1 ) )
+        for groupI, lawI in enumerate( self.groupLaws_ ):
+            tables[ :, groupI ] = ( lawI.uniformRho( *args ).value(), 
+                                    lawI.uniformE( *args ).value(), 
+                                    lawI.uniformNu( *args ).value() )
+        result = tables[ :, self.cellGroups_[ cells ] ]
+        
+        labels = self.cellLabels_[ cells ]
+        for lawI, law in enumerate( self ):
+            if self.lawGroups_[ lawI ] >= 0:
+               continue
+            mine = numpy.nonzero( labels == lawI )[ 0 ]
+            if mine.shape[ 0 ] != 0:
+               result[ :, mine ] = law.cellValues( cells[ mine ], *args )
+        
+        return result[ 0 ], result[ 1 ], result[ 2 ]
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Convert indicator values to material labels, -1 marks cells of no material
+    def _labels( self, mat ):
+        labels = numpy.floor( mat + OpenFOAM.SMALL ).astype( numpy.int64 )
+        labels[ ( labels < 0 ) | ( labels >= len( self ) ) ] = -1
+        
+        return labels
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Split cells into per-material lists with a single stable sort
+    def _materialCells( self, labels ):
+        order = numpy.argsort( labels, kind = "mergesort" )
+        bounds = numpy.cumsum( numpy.bincount( labels + 1, minlength = len( self ) + 1 ) )
+        
+        return [ order[ bounds[ i ] : bounds[ i + 1 ] ] for i in range( len( self ) ) ]
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return cell labels of the given material
+    def materialCells( self, i ):
+        self._checkIndex()
+        return self.materialCells_[ i ]
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return boolean cell mask of the given material
+    def mask( self, i ):
+        try:
+            arg = int( i )
+        except ValueError:
+            raise AttributeError ("The i is not int")
+        
+        self._checkIndex()
+        return self.cellLabels_ == i
+     
+               
     #-----------------------------------------------------------------------------------------    
     #- Calculate indicator field given index
     def indicator( self, i ):
@@ -85,17 +341,141 @@ class multiMaterial( rheologyLaw, list ):
         except ValueError:
             raise AttributeError ("The i is not int")
         
-        mat = self.materials_.internalField()
+        self._checkIndex()
         
-        from Foam.OpenFOAM import scalarField, SMALL
-        result = scalarField( mat.size(), 0.0 )
-        for matI in range(mat.size()):
-            if mat[ matI ] > (i- SMALL) and mat[matI] < (i + 1 - SMALL):
-               result[ matI ] = 1.0
+        result = numpy.zeros( self.cellLabels_.shape[ 0 ] )
+        result[ self.materialCells_[ i ] ] = 1.0
         
-        return result
+        return toScalarField( result )
      
                
+    #-----------------------------------------------------------------------------------------    
+    #- Return material labels of the cells next to the given patch
+    def patchLabels( self, patchI ):
+        self._checkIndex()
+        
+        faceCells = toArray( self.mesh().boundary()[ patchI ].faceCells() )
+        
+        return self.cellLabels_[ faceCells ]
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Collect the patch values of every law on the faces of its material,
+    #  the same way as _assemble does for the cells
+    def _patchValues( self, patchI, uniformValue, lawPatchValues ):
+        try:
+            patchI = int( patchI )
+        except ValueError:
+            raise AttributeError ("The patchI is not int")
+        
+        labels = self.patchLabels( patchI )
+        
+        table = numpy.zeros( len( self.groupLaws_ ) + 1 )
+        for groupI, lawI in enumerate( self.groupLaws_ ):
+            table[ groupI ] = uniformValue( lawI ).value()
+        
+        faceGroups = numpy.append( self.lawGroups_, -1 )[ labels ]
+        faceGroups[ faceGroups < 0 ] = len( self.groupLaws_ )
+        result = table[ faceGroups ]
+        
+        for lawI, law in enumerate( self ):
+            if self.lawGroups_[ lawI ] >= 0:
+               continue
+            faces = labels == lawI
+            if faces.any():
+               result[ faces ] = toArray( lawPatchValues( law, patchI ) )[ faces ]
+        
+        return toScalarField( result )
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return modulus of elasticity on the given patch
+    def patchE( self, patchI ):
+        return self._patchValues( patchI, 
+                                  lambda law : law.uniformE(), 
+                                  lambda law, patchI : law.patchE( patchI ) )
+     
+               
+    #-----------------------------------------------------------------------------------------    
+    #- Return Poisson's ratio on the given patch
+    def patchNu( self, patchI ):
+        return self._patchValues( patchI, 
+                                  lambda law : law.uniformNu(), 
+                                  lambda law, patchI : law.patchNu( patchI ) )
+     
+               
+    #-------------------------------------------------------------------------------------------
+    #- Assemble a property field in one pass : uniform laws are gathered from
+    #  the per-group value table, non-uniform laws are scattered over their cells.
+    #  The component of cellValues given, the values are kept and later only
+    #  the cells moved between materials are evaluated again
+    def _assemble( self, name, defaultValue, uniformValue, lawField, component = None, args = () ):
+        self._checkIndex()
+        
+        keep = component is not None and not self.timeDependent()
+        if keep and self.assembled_.has_key( name ) and self.assembled_[ name ][ 0 ] == args:
+           result = self._reassemble( name, defaultValue, component, args )
+           if result is not None:
+              return result
+           pass
+        
+        table = numpy.empty( len( self.groupLaws_ ) + 1 )
+        for groupI, lawI in enumerate( self.groupLaws_ ):
+            table[ groupI ] = uniformValue( lawI ).value()
+        table[ -1 ] = defaultValue.value()
+        
+        # All the cells are overwritten below
+        result = fieldPool.scratchField( name, self.mesh(), defaultValue, initialise = False )
+        
+        # Gathered straight into the field
+        cellGroups = self.cellGroups_
+        values = toArray( result.internalField() )
+        
+        def kernel( start, end ):
+            numpy.take( table, cellGroups[ start : end ], out = values[ start : end ] )
+        
+        chunkedPool.instance().run( kernel, cellGroups.shape[ 0 ] )
+        
+        with fieldPool.scratch():
+            for lawI, law in enumerate( self ):
+                cells = self.materialCells_[ lawI ]
+                if self.lawGroups_[ lawI ] >= 0 or cells.shape[ 0 ] == 0:
+                   continue
+                # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
+                lawI_field = lawField( law )
+                values[ cells ] = toArray( lawI_field.internalField() )[ cells ]
+        
+        if keep:
+           self.assembled_[ name ] = ( args, self._version(), values.copy() )
+        else:
+           self.assembled_.pop( name, None )
+        
+        result.correctBoundaryConditions()
+        
+        return result
+    
+    
+    #-------------------------------------------------------------------------------------------
+    #- Bring the kept values of the property up to date over the cells moved
+    #  since they were assembled, None if anything else changed
+    def _reassemble( self, name, defaultValue, component, args ):
+        version, values = self.assembled_[ name ][ 1 : ]
+        cells = self.changedCells( version )
+        if cells is None:
+           return None
+        
+        if cells.shape[ 0 ] != 0:
+           values[ cells ] = self.cellValues( cells, *args )[ component ]
+           pass
+        self.assembled_[ name ] = ( args, self._version(), values )
+        
+        result = fieldPool.scratchField( name, self.mesh(), defaultValue, initialise = False )
+        toArray( result.internalField() )[ : ] = values
+        result.correctBoundaryConditions()
+        
+        return result
+    
+    
     #-------------------------------------------------------------------------------------------
     #- Return density
     def rho( self, *args):
@@ -107,29 +487,11 @@ class multiMaterial( rheologyLaw, list ):
             except ValueError:
                 raise AttributeError ("The arg is not float")
         
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimDensity
-        
-        result = volScalarField( IOobject( word( "rho" ),
-                                           fileName(self.mesh().time().timeName()),
-                                           self.mesh(),
-                                           IOobject.NO_READ,
-                                           IOobject.NO_WRITE ),
-                                 self.mesh(),
-                                 dimensionedScalar( word( "zeroRho" ), dimDensity, 0.0 ),
-                                 zeroGradientFvPatchScalarField.typeName )
-        
-        #Accumulate data for all fields
-        from Foam.OpenFOAM import ext_Info 
-        
-        for lawI in self:
-            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-            lawI_rho = lawI.rho()
-            result.internalField().ext_assign( result.internalField() + self.indicator( self.index( lawI ) ) * lawI_rho.internalField() )
-            
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._assemble( "rho", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroRho" ), OpenFOAM.dimDensity, 0.0 ),
+                               lambda law : law.uniformRho( *args ),
+                               lambda law : law.rho( *args ),
+                               0, args )
     
     
     #-------------------------------------------------------------------------------------------
@@ -143,28 +505,11 @@ class multiMaterial( rheologyLaw, list ):
             except ValueError:
                 raise AttributeError ("The arg is not float")
                 
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimForce, dimArea
-        
-        result = volScalarField( IOobject( word( "E" ),
-                                           fileName( self.mesh().time().timeName() ),
-                                           self.mesh(),
-                                           IOobject.NO_READ,
-                                           IOobject.NO_WRITE ),
-                                 self.mesh(),
-                                 dimensionedScalar( word( "zeroE" ), dimForce/dimArea, 0.0 ),
-                                 zeroGradientFvPatchScalarField.typeName )
-        
-        #Accumulate data for all fields
-        for lawI in self:
-            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-            lawI_E = lawI.E()
-            result.internalField().ext_assign( result.internalField() + \
-                                               self.indicator( self.index( lawI ) ) * lawI_E.internalField()  )
-            
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._assemble( "E", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroE" ), OpenFOAM.dimForce/OpenFOAM.dimArea, 0.0 ),
+                               lambda law : law.uniformE( *args ),
+                               lambda law : law.E( *args ),
+                               1, args )
     
     
     #-------------------------------------------------------------------------------------------
@@ -178,94 +523,43 @@ class multiMaterial( rheologyLaw, list ):
             except ValueError:
                 raise AttributeError ("The arg is not float")
         
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimless
-        
-        result = volScalarField( IOobject( word( "nu" ),
-                                           fileName( self.mesh().time().timeName() ),
-                                           self.mesh(),
-                                           IOobject.NO_READ,
-                                           IOobject.NO_WRITE ),
-                                 self.mesh(),
-                                 dimensionedScalar( word( "zeroE" ), dimless, 0.0 ),
-                                 zeroGradientFvPatchScalarField.typeName )
-        
-        #Accumulate data for all fields
-        for lawI in self:
-            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-            lawI_nu =lawI.nu()
-            result.internalField().ext_assign( result.internalField() + \
-                                               self.indicator( self.index( lawI ) ) * lawI_nu.internalField()  )
-            
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._assemble( "nu", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroE" ), OpenFOAM.dimless, 0.0 ),
+                               lambda law : law.uniformNu( *args ),
+                               lambda law : law.nu( *args ),
+                               2, args )
 
 
     #-------------------------------------------------------------------------------------------
     #- Return modulus of plasticity
     def Ep( self ):
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimForce, dimArea, GREAT
-        
-        result = volScalarField( IOobject( word( "Ep" ),
-                                           fileName( self.mesh().time().timeName() ),
-                                           self.mesh(),
-                                           IOobject.NO_READ,
-                                           IOobject.NO_WRITE ),
-                                 self.mesh(),
-                                 dimensionedScalar( wrod( "zeroEp" ), dimForce/dimArea, GREAT),
-                                 zeroGradientFvPatchScalarField.typeName )
-        
-        #Accumulate data for all fields
-        for lawI in self:
-            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-            lawI_Ep = lawI.Ep()
-            result.internalField().ext_assign( result.internalField() + \
-                                               self.indicator( lawI ) * lawI_Ep.internalField()  )
-            
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._assemble( "Ep", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroEp" ), OpenFOAM.dimForce/OpenFOAM.dimArea, OpenFOAM.GREAT ),
+                               lambda law : law.uniformEp(),
+                               lambda law : law.Ep() )
 
 
     #-------------------------------------------------------------------------------------------
     #- Return yield stress
     def sigmaY( self ):
-        from Foam.finiteVolume import volScalarField, zeroGradientFvPatchScalarField
-        from Foam.OpenFOAM import word, fileName, IOobject, dimensionedScalar, dimForce, dimArea, GREAT
-        
-        result =  volScalarField( IOobject( word( "sigmaY" ),
-                                            fileName( self.mesh().time().timeName() ),
-                                            self.mesh(),
-                                            IOobject.NO_READ,
-                                            IOobject.NO_WRITE ),
-                                  self.mesh(),
-                                  dimensionedScalar( word( "zeroSigmaY" ), dimForce/dimArea, GREAT),
-                                  zeroGradientFvPatchScalarField.typeName )
-        
-        #Accumulate data for all fields
-        for lawI in self:
-            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
-            lawI_sigmaY = lawI.sigmaY()
-            result.internalField().ext_assign( result.internalField() + \
-                                               self.indicator( lawI ) * lawI_sigmaY.internalField()  )
-            
-        result.correctBoundaryConditions()
-        
-        return result
+        return self._assemble( "sigmaY", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroSigmaY" ), OpenFOAM.dimForce/OpenFOAM.dimArea, OpenFOAM.GREAT ),
+                               lambda law : law.uniformSigmaY(),
+                               lambda law : law.sigmaY() )
 
 
     #-------------------------------------------------------------------------------------------
-    #- Return creep compliance
+    #- Return creep compliance at the given time, assembled from the laws
     def J(self, t):
         try:
-            arg = float( t )
+            t = float( t )
         except ValueError:
             raise AttributeError ("The t is not scalar")
-            
-            
-        raise NotImplementedError("J(scalar t)")
+        
+        return self._assemble( "J", 
+                               OpenFOAM.dimensionedScalar( OpenFOAM.word( "zeroJ" ), OpenFOAM.dimless/( OpenFOAM.dimForce/OpenFOAM.dimArea ), 0.0 ),
+                               lambda law : law.uniformJ( t ),
+                               lambda law : law.J( t ) )
     
     
     #-------------------------------------------------------------------------------------------
@@ -21,6 +21,10 @@
 ##
 
 
+#----------------------------------------------------------------------------
+from materialModels.lazyImport import OpenFOAM
+
+
 #----------------------------------------------------------------------------
 class rheologyLaw:
     def __init__( self, name, sigma, dict_ ):
@@ -46,6 +50,12 @@ class rheologyLaw:
           
         self.name_ = name
         self.sigma_ = sigma
+        
+        # State version, see modified
+        self.version_ = 0
+        
+        # Cells the law is applied to, all of them unless set by multiMaterial
+        self.cells_ = None
         pass         
             
             
@@ -67,10 +77,54 @@ class rheologyLaw:
         return self.sigma_.mesh()
 
         
+    #------------------------------------------------------------------------------------------
+    #- Return labels of the cells the law is applied to, None for all cells
+    def cells( self ):
+        return self.cells_
+
+
+    #------------------------------------------------------------------------------------------
+    #- Restrict the law to the given cells, e.g. to its material
+    def setCells( self, cells ):
+        self.cells_ = cells
+        pass
+
+
+    #------------------------------------------------------------------------------------------
+    #- Return the number of cells the law is applied to
+    def nCells( self ):
+        if self.cells_ is None:
+           return self.mesh().nCells()
+        
+        return self.cells_.shape[ 0 ]
+
+
+    #------------------------------------------------------------------------------------------
+    #- Return the per-cell state stored in the order of the old sorted cells
+    #  in the order of the new ones, None standing for all the cells. Cells
+    #  entering the law start from zero
+    def _remapCells( self, values, oldCells, newCells ):
+        import numpy
+        nCells = self.mesh().nCells()
+        if oldCells is None:
+           oldCells = numpy.arange( nCells )
+        if newCells is None:
+           newCells = numpy.arange( nCells )
+        
+        result = numpy.zeros( ( newCells.shape[ 0 ], ) + values.shape[ 1: ] )
+        if oldCells.shape[ 0 ] == 0:
+           return result
+        
+        position = numpy.minimum( numpy.searchsorted( oldCells, newCells ), oldCells.shape[ 0 ] - 1 )
+        kept = oldCells[ position ] == newCells
+        result[ kept ] = values[ position[ kept ] ]
+        
+        return result
+
+        
     #-------------------------------------------------------------------------------------------
     def type( self ) :
-        from Foam.OpenFOAM import word
-        return word( "rheologyLaw" )
+        return OpenFOAM.word( "rheologyLaw" )
     
         
     #-------------------------------------------------------------------------------------------
@@ -106,7 +160,7 @@ class rheologyLaw:
         from materialModels.rheologyModel.rheologyLaws import addDictionaryConstructorTable
         if addDictionaryConstructorTable.dictionaryTable.has_key( key ):
 
-           className = addDictionaryConstructorTable.dictionaryTable[ key ]
+           className = addDictionaryConstructorTable.lookup( key )
 
            return className( name, sigma, dict_ )
         else:
@@ -114,6 +168,144 @@ class rheologyLaw:
           raise IOError("Unknown rheologyLaw type  - %s.\n " %key )
     
     
+    #--------------------------------------------------------------------------------------------
+    #- Return true if the material properties change with time
+    def timeDependent( self ):
+        return False
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return the state version of the law. It changes whenever the properties
+    #  returned for a given time may have changed, so that values cached
+    #  against the time and the version stay valid while the version holds
+    def version( self ):
+        return self.version_
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Mark the properties as changed
+    def modified( self ):
+        self.version_ += 1
+        pass
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return the cells whose properties changed since the given version, 
+    #  None if not known, in which case all of them are to be taken as changed
+    def changedCells( self, version ):
+        return None
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return density, modulus of elasticity and Poisson's ratio of the given cells
+    #  as arrays. This generic version evaluates the whole fields
+    def cellValues( self, cells, *args ):
+        import numpy
+        if self.uniform():
+           return tuple( [ numpy.repeat( value.value(), len( cells ) ) 
+                           for value in ( self.uniformRho( *args ), self.uniformE( *args ), self.uniformNu( *args ) ) ] )
+        
+        from materialModels.fieldArrays import toArray
+        from materialModels import fieldPool
+        result = []
+        with fieldPool.scratch():
+            for name in ( "rho", "E", "nu" ):
+                # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
+                lawField = getattr( self, name )( *args )
+                result.append( toArray( lawField.internalField() )[ cells ] )
+        
+        return tuple( result )
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return true if the material properties are uniform in space,
+    #  in which case the uniform* methods can be used instead of the fields
+    def uniform( self ):
+        return False
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform density at the given or at the current time
+    def uniformRho( self, *args ):
+        raise NotImplementedError("It is abstract method")
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform modulus of elasticity at the given or at the current time
+    def uniformE( self, *args ):
+        raise NotImplementedError("It is abstract method")
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform Poisson's ratio at the given or at the current time
+    def uniformNu( self, *args ):
+        raise NotImplementedError("It is abstract method")
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform creep compliance at the given time, that of an elastic
+    #  solid of the uniform modulus unless the law creeps
+    def uniformJ( self, t ):
+        E = self.uniformE( t )
+        return OpenFOAM.dimensionedScalar( OpenFOAM.word( "J" ), OpenFOAM.dimless / E.dimensions(), 1.0 / E.value() )
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform yield stress
+    def uniformSigmaY( self ):
+        raise NotImplementedError("It is abstract method")
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return uniform plastic modulus
+    def uniformEp( self ):
+        raise NotImplementedError("It is abstract method")
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return key of the uniform parameters, laws with equal keys behave the same
+    def uniformKey( self ):
+        return ( str( self.type() ),
+                 self.uniformRho().value(), 
+                 self.uniformE().value(), 
+                 self.uniformNu().value(), 
+                 self.uniformEp().value(), 
+                 self.uniformSigmaY().value() )
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Build the full field for the given uniform value, only when a caller needs it.
+    #  In a scratch scope of the field pool a released field is reused
+    def _uniformField( self, name, value ):
+        from materialModels.fieldPool import scratchField
+        result = scratchField( name, self.mesh(), value )
+        
+        result.correctBoundaryConditions()
+        
+        return result
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return modulus of elasticity on the given patch.
+    #  This generic version evaluates the whole field, laws override it to
+    #  work on the patch face cells only
+    def patchE( self, patchI ):
+        from materialModels import fieldPool
+        with fieldPool.scratch():
+            # Python does not wait for evaluation of the closure expression, it destroys return values if it is no more in use
+            lawE = self.E()
+            return OpenFOAM.scalarField( lawE.ext_boundaryField()[ patchI ] )
+    
+    
+    #--------------------------------------------------------------------------------------------
+    #- Return Poisson's ratio on the given patch
+    def patchNu( self, patchI ):
+        from materialModels import fieldPool
+        with fieldPool.scratch():
+            lawNu = self.nu()
+            return OpenFOAM.scalarField( lawNu.ext_boundaryField()[ patchI ] )
+    
+    
     #--------------------------------------------------------------------------------------------
     #- Return density
     def rho( self, *args):
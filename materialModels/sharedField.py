@@ -0,0 +1,78 @@
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+#----------------------------------------------------------------------------
+# Copy-on-write holder of a field. Holders made by share() see the same
+# field until one of them asks for write access with ref(), which gives
+# that holder a private copy first. As for tmp, operator() is read access.
+
+
+#----------------------------------------------------------------------------
+class sharedField( object ):
+    def __init__( self, field, cell = None ):
+        if cell is None:
+           # The field and the number of holders sharing it
+           cell = [ field, 0 ]
+           pass
+        cell[ 1 ] += 1
+        self.cell_ = cell
+        pass
+
+
+    #------------------------------------------------------------------------
+    def __del__( self ):
+        self.cell_[ 1 ] -= 1
+        pass
+
+
+    #------------------------------------------------------------------------
+    #- Return a new holder sharing the same field
+    def share( self ):
+        return sharedField( None, self.cell_ )
+
+
+    #------------------------------------------------------------------------
+    #- Return true if other holders see the same field
+    def isShared( self ):
+        return self.cell_[ 1 ] > 1
+
+
+    #------------------------------------------------------------------------
+    #- Return the field for reading
+    def __call__( self ):
+        return self.cell_[ 0 ]
+
+
+    #------------------------------------------------------------------------
+    #- Return the field for writing, copied first if it is shared
+    def ref( self ):
+        if self.isShared():
+           field = self.cell_[ 0 ]
+           self.cell_[ 1 ] -= 1
+           self.cell_ = [ field.__class__( field ), 1 ]
+           pass
+
+        return self.cell_[ 0 ]
+
+
+#----------------------------------------------------------------------------
@@ -33,7 +33,7 @@ setup( name = "materialModels",
        author_email = 'alexey.petrov.nnov@gmail.com', 
        license = 'GPL',
        url = 'http://sourceforge.net/projects/pythonFlu',
-       install_requires = [ 'Foam >= 8.2-hybrid' ],
+       install_requires = [ 'Foam >= 8.2-hybrid', 'numpy' ],
        platforms = [ 'linux' ],
        version = "1.2",
        classifiers = [ 'Development Status :: 3 - Alpha',
@@ -44,6 +44,7 @@ setup( name = "materialModels",
                        'Programming Language :: Python',
                        'Topic :: Scientific/Engineering'],
        packages = find_packages(),
+       entry_points = { 'console_scripts' : [ 'materialModels-importProfile = materialModels.importProfile:main' ] },
        zip_safe = True )
 
 
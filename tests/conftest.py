@@ -0,0 +1,143 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Shared set-up of the tests. They run the material layer on the NumPy
+# backend, installed as the Foam package before anything imports it, so
+# no OpenFOAM build is needed
+#
+#     python -m pytest tests
+
+
+#--------------------------------------------------------------------------------------
+import os, sys
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), os.pardir ) )
+
+import numpy
+import pytest
+from materialModels import numpyBackend
+numpyBackend.install()
+
+from materialModels.numpyBackend import word, dictionary, IOobject, volSymmTensorField, volVectorField, volTensorField
+
+
+#--------------------------------------------------------------------------------------
+steel = """
+        steel
+        {
+            type            linearElastic;
+            rho             rho [1 -3 0 0 0 0 0] 7854;
+            E               E [1 -1 -2 0 0 0 0] 2e+11;
+            nu              nu [0 0 0 0 0 0 0] 0.3;
+        }
+"""
+
+polymer = """
+        polymer
+        {
+            type            linearElastic;
+            rho             rho [1 -3 0 0 0 0 0] 1000;
+            E               E [1 -1 -2 0 0 0 0] 3e9;
+            nu              nu [0 0 0 0 0 0 0] 0.4;
+        }
+"""
+
+viscoelastic = """
+        polymer
+        {
+            type            PronyViscoelastic;
+            rho             rho [1 -3 0 0 0 0 0] 1000;
+            EInf            EInf [1 -1 -2 0 0 0 0] 1e9;
+            nu              nu [0 0 0 0 0 0 0] 0.4;
+            moduli          ( 2e9 5e8 );
+            relaxationTimes ( 0.1 10 );
+        }
+"""
+
+
+#--------------------------------------------------------------------------------------
+#- Return rheologyProperties text of a single law given by its dictionary entry
+def singleLaw( entry ):
+    return "planeStress no; rheology" + entry[ entry.index( "{" ) : ]
+
+
+#--------------------------------------------------------------------------------------
+#- Return rheologyProperties text of a multiMaterial law of the given law entries
+def multiMaterial( *entries ):
+    return "planeStress no; rheology { type multiMaterial; laws ( %s ); }" % "".join( entries )
+
+
+#--------------------------------------------------------------------------------------
+#- Return a mesh of the given number of cells and one patch on the first cells
+def newMesh( nCells, time = None ):
+    if time is None:
+       time = numpyBackend.Time()
+    return numpyBackend.fvMesh( time, nCells, [ ( "left", numpy.arange( 0, min( nCells, 10 ) ) ) ] )
+
+
+#--------------------------------------------------------------------------------------
+#- Mesh with tractionDisplacement patches on U, the displacement gradient
+#  at random and a multiMaterial rheology, as the scaling benchmark builds
+class tractionCase( object ):
+    def __init__( self, nCells = 200, nPatches = 3, seed = 0 ):
+        random = numpy.random.RandomState( seed )
+        patches = []
+        for patchI in range( nPatches ):
+            nf = random.normal( size = ( 20, 3 ) )
+            nf /= numpy.sqrt( ( nf * nf ).sum( axis = 1 ) ).reshape( -1, 1 )
+            patches.append( ( "traction%d" % patchI, random.randint( 0, nCells, 20 ), nf, random.uniform( size = ( 20, 3 ) ) ) )
+
+        self.mesh_ = mesh = numpyBackend.fvMesh( numpyBackend.Time(), nCells, patches )
+        mesh.dictionaries_[ "rheologyProperties" ] = numpyBackend.readDictionary( multiMaterial( steel, polymer ) )
+        mesh.fields_[ "materials" ] = ( numpy.arange( nCells ) * 2 // nCells ).astype( float )
+
+        def io( name ):
+            return IOobject( word( name ), "0", mesh, IOobject.NO_READ, IOobject.NO_WRITE )
+
+        from materialModels.rheologyModel import rheologyModel
+        self.sigma_ = volSymmTensorField( io( "sigma" ), mesh )
+        self.U_ = volVectorField( io( "U" ), mesh )
+        self.gradU_ = volTensorField( io( "grad(U)" ), mesh, 1.0e-3 * random.normal( size = ( nCells, 9 ) ) )
+        self.rheology_ = rheologyModel( self.sigma_ )
+
+        from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+        iF = self.U_.dimensionedInternalField()
+        patchDict = dictionary( { "U" : "U", "rheology" : "rheologyProperties",
+                                  "traction" : ( 1.0e+6, 0.0, 0.0 ), "pressure" : 0.0 } )
+        self.patchFields_ = []
+        for patch in mesh.boundary():
+            patchField = tractionDisplacementFvPatchVectorField( patch, iF, patchDict )
+            self.U_.ext_boundaryField()[ patch.index() ] = patchField
+            self.patchFields_.append( patchField )
+        pass
+
+
+#--------------------------------------------------------------------------------------
+@pytest.fixture
+def case():
+    return tractionCase()
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,150 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Prony series of PronyViscoelastic : the relaxation modulus, its creep
+# compliance and the recursive integration of the creep strain
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from conftest import newMesh, singleLaw, viscoelastic
+from materialModels import numpyBackend
+from materialModels.fieldArrays import toArray
+
+
+#--------------------------------------------------------------------------------------
+EInf, moduli, relaxationTimes, nu = 1.0e+9, numpy.array( [ 2.0e+9, 5.0e+8 ] ), numpy.array( [ 0.1, 10.0 ] ), 0.4
+
+
+#--------------------------------------------------------------------------------------
+def newLaw( nCells = 4 ):
+    return numpyBackend.rheologyModelFor( newMesh( nCells ), singleLaw( viscoelastic ) ).law()
+
+
+#--------------------------------------------------------------------------------------
+def testRelaxationModulus():
+    law = newLaw()
+    t = numpy.array( [ 0.0, 0.05, 1.0, 30.0 ] )
+    expected = EInf + ( moduli * numpy.exp( -t.reshape( -1, 1 ) / relaxationTimes ) ).sum( axis = 1 )
+
+    assert numpy.allclose( law.relaxationModulus( t ), expected )
+    assert numpy.allclose( toArray( law.E( 1.0 ).internalField() ), expected[ 2 ] )
+
+
+#--------------------------------------------------------------------------------------
+#- The Laplace transforms of the relaxation modulus and of the creep
+#  compliance multiply to 1/s^2
+def testInterconversion():
+    law = newLaw()
+    for s in ( 1.0e-3, 0.1, 1.0, 10.0, 1.0e+3 ):
+        E = EInf / s + ( moduli * relaxationTimes / ( 1.0 + s * relaxationTimes ) ).sum()
+        J = 1.0 / ( EInf * s ) - ( law.compliances_ * law.retardationTimes_ / ( 1.0 + s * law.retardationTimes_ ) ).sum()
+        assert abs( E * J * s * s - 1.0 ) < 1.0e-9
+
+    assert abs( law.compliance( 0.0 ) * law.relaxationModulus( 0.0 ) - 1.0 ) < 1.0e-9
+    assert abs( law.compliance( 1.0e+6 ) * EInf - 1.0 ) < 1.0e-9
+    assert ( numpy.diff( law.compliance( numpy.linspace( 0.0, 50.0, 100 ) ) ) > 0.0 ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- A uniaxial stress ramped up over the first step and then held gives the
+#  creep strain of the compliance series in closed form
+def testCreepUnderConstantStress():
+    law = newLaw()
+    time = law.mesh().time()
+    sigma0, dt = 1.0e+6, 0.05
+    toArray( law.sigma().internalField(), 6 )[ :, 0 ] = sigma0
+
+    for step in range( 1, 41 ):
+        time.increment( dt )
+        law.correct()
+        t = step * dt
+        lam = law.retardationTimes_
+        expected = sigma0 * ( law.compliances_ * ( 1.0 - lam / dt * ( numpy.exp( -( t - dt ) / lam ) - numpy.exp( -t / lam ) ) ) ).sum()
+        strain = law.creepStrainArray()
+        assert numpy.allclose( strain[ :, 0 ], expected, rtol = 1.0e-10 )
+        assert numpy.allclose( strain[ :, 3 ], -nu * expected, rtol = 1.0e-10 )
+
+
+#--------------------------------------------------------------------------------------
+#- Repeated corrections within a time step restart from the accepted state
+def testCorrectWithinTimeStep():
+    law = newLaw()
+    time = law.mesh().time()
+    sigma = toArray( law.sigma().internalField(), 6 )
+    sigma[ :, 0 ] = 1.0e+6
+    time.increment( 0.1 )
+    law.correct()
+    time.increment( 0.1 )
+    law.correct()
+    first = law.creepStrainArray().copy()
+
+    sigma[ :, 0 ] = 3.0e+6
+    law.correct()
+    sigma[ :, 0 ] = 1.0e+6
+    law.correct()
+
+    assert numpy.allclose( law.creepStrainArray(), first, rtol = 1.0e-12 )
+
+
+#--------------------------------------------------------------------------------------
+#- Under multiMaterial the history covers the cells of the law only and
+#  follows the cells moved between the materials
+def testHistoryOfMaterialCells():
+    from conftest import multiMaterial, steel
+    nCells = 10
+    materials = ( numpy.arange( nCells ) >= 4 ).astype( float )
+    model = numpyBackend.rheologyModelFor( newMesh( nCells ), multiMaterial( steel, viscoelastic ), materials )
+    law = model.law()[ 1 ]
+    time = law.mesh().time()
+    toArray( law.sigma().internalField(), 6 )[ :, 0 ] = 1.0e+6 * numpy.arange( nCells )
+    time.increment( 0.1 )
+    law.correct()
+    strain = law.creepStrainArray().copy()
+
+    assert law.history_.shape[ 1 ] == 6 and strain.shape == ( 6, 6 )
+    assert numpy.allclose( strain[ :, 0 ] / numpy.arange( 4, nCells ), strain[ 0, 0 ] / 4.0 )
+
+    model.law().setMaterials( [ 2, 5 ], [ 1.0, 0.0 ] )
+    assert list( law.cells() ) == [ 2, 4, 6, 7, 8, 9 ]
+    moved = law.creepStrainArray()
+    assert numpy.allclose( moved[ 1: ], strain[ [ 0, 2, 3, 4, 5 ] ] )
+    assert ( moved[ 0 ] == 0.0 ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- The compliance of the mixture is that of every material on its cells
+def testComplianceOfMaterials():
+    from conftest import multiMaterial, steel
+    materials = ( numpy.arange( 10 ) >= 4 ).astype( float )
+    model = numpyBackend.rheologyModelFor( newMesh( 10 ), multiMaterial( steel, viscoelastic ), materials )
+    J = toArray( model.law().J( 2.0 ).internalField() )
+
+    assert numpy.allclose( J[ : 4 ], 1.0 / 2.0e+11 )
+    assert numpy.allclose( J[ 4 : ], model.law()[ 1 ].compliance( 2.0 ) )
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,93 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Evaluation of the property kernels over chunks of cells in a thread pool
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from conftest import newMesh, multiMaterial, steel, polymer
+from materialModels import numpyBackend, chunkedPool
+from materialModels.fieldArrays import toArray
+
+
+#--------------------------------------------------------------------------------------
+def testChunksCoverRange():
+    pool = chunkedPool.chunkedPool( 4, 10 )
+    for size in ( 0, 1, 9, 10, 11, 95, 1000 ):
+        chunks = pool.chunks( size )
+        assert chunks[ 0 ][ 0 ] == 0 and chunks[ -1 ][ 1 ] == size
+        for ( start, end ), ( nextStart, nextEnd ) in zip( chunks[ :-1 ], chunks[ 1: ] ):
+            assert start < end == nextStart
+        assert len( chunks ) <= 16
+
+
+#--------------------------------------------------------------------------------------
+def testSingleCall():
+    calls = []
+    chunkedPool.chunkedPool( 1, 10 ).run( lambda start, end : calls.append( ( start, end ) ), 100 )
+    chunkedPool.chunkedPool( 4, 1000 ).run( lambda start, end : calls.append( ( start, end ) ), 100 )
+
+    assert calls == [ ( 0, 100 ), ( 0, 100 ) ]
+
+
+#--------------------------------------------------------------------------------------
+def testThreadedRun():
+    pool = chunkedPool.chunkedPool( 4, 100 )
+    values = numpy.random.RandomState( 0 ).uniform( size = 10000 )
+    result = numpy.zeros( values.shape )
+    def kernel( start, end ):
+        numpy.sqrt( values[ start : end ], out = result[ start : end ] )
+
+    try:
+        pool.run( kernel, values.shape[ 0 ] )
+    finally:
+        pool.close()
+
+    assert ( result == numpy.sqrt( values ) ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- The shared pool set to several threads assembles the same properties
+def testThreadedAssembly():
+    nCells = 5000
+    materials = ( numpy.arange( nCells ) % 2 ).astype( float )
+    model = numpyBackend.rheologyModelFor( newMesh( nCells ), multiMaterial( steel, polymer ), materials )
+    serial = toArray( model.mu().internalField() ).copy()
+
+    pool = chunkedPool.instance()
+    nThreads, chunkSize = pool.nThreads(), pool.chunkSize()
+    pool.configure( 4, 256 )
+    try:
+        model.clearOut()
+        threaded = toArray( model.mu().internalField() ).copy()
+    finally:
+        pool.configure( nThreads, chunkSize )
+
+    assert ( threaded == serial ).all()
+
+
+#--------------------------------------------------------------------------------------
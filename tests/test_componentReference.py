@@ -0,0 +1,205 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+
+
+
+#--------------------------------------------------------------------------------------
+# componentReference lists read into arrays sorted by patch, and lists given
+# by global faces read on the processor meshes of a case decomposed on two
+# ranks
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+import pytest
+from materialModels import numpyBackend, globalFaceIndex as globalFaceIndexModule
+from materialModels.componentReference import componentReference, componentReferenceList
+from materialModels.globalFaceIndex import globalFaceIndex
+from materialModels.numpyBackend import Istream, token
+
+
+#--------------------------------------------------------------------------------------
+# ( patch, face, direction, value ) of references given by patch and face
+patchReferences = ( ( "right", 3, "x", 1.0 ), ( "left", 2, "y", 2.0 ), ( "right", 0, "Z", 3.0 ), ( "left", 4, "x", 4.0 ) )
+
+
+#--------------------------------------------------------------------------------------
+def newMesh():
+    return numpyBackend.fvMesh( numpyBackend.Time(), 10, [ ( "left", numpy.arange( 5 ) ),
+                                                           ( "right", numpy.arange( 5, 10 ) ) ] )
+
+
+#--------------------------------------------------------------------------------------
+#- Return the stream of the references, in the ( ... ) or the N ( ... ) form
+def stream( entries, sized = False ):
+    dicts = [ { "patch" : patch, "face" : face, "direction" : dir_, "value" : value }
+              for patch, face, dir_, value in entries ]
+    prefix = [ len( dicts ) ] if sized else []
+    return Istream( prefix + [ token.BEGIN_LIST ] + dicts + [ token.END_LIST ] )
+
+
+#--------------------------------------------------------------------------------------
+#- The references are kept sorted by patch, in the order read within a patch
+@pytest.mark.parametrize( "sized", ( False, True ) )
+def testSortedByPatch( sized ):
+    cr = componentReferenceList( newMesh(), stream( patchReferences, sized ) )
+
+    assert len( cr ) == 4
+    assert list( cr.patchIndices() ) == [ 0, 0, 1, 1 ]
+    assert list( cr.faceIndices() ) == [ 2, 4, 3, 0 ]
+    assert list( cr.dirs() ) == [ 1, 0, 0, 2 ]
+    assert list( cr.values()[ cr.patchReferences( 1 ) ] ) == [ 1.0, 3.0 ]
+    assert list( cr.values()[ cr.patchReferences( 0 ) ] ) == [ 2.0, 4.0 ]
+
+
+#--------------------------------------------------------------------------------------
+#- The references built on demand are those a PtrList read gives
+def testItems():
+    mesh = newMesh()
+    cr = componentReferenceList( mesh, stream( patchReferences ) )
+    is_ = stream( patchReferences )
+    is_.read()
+    reader = componentReference.iNew( mesh )
+    read = sorted( [ reader( is_ )() for entry in patchReferences ], key = lambda item : item.patchIndex() )
+
+    for i in range( len( cr ) ):
+        assert ( cr[ i ].patchIndex(), cr[ i ].faceIndex(), cr[ i ].dir(), cr[ i ].value(), cr[ i ].globalFace() ) == \
+               ( read[ i ].patchIndex(), read[ i ].faceIndex(), read[ i ].dir(), read[ i ].value(), -1 )
+
+
+#--------------------------------------------------------------------------------------
+#- The groups are built from the arrays as from the references
+def testGroupsOfList():
+    from materialModels.componentReferenceGroups import componentReferenceGroups
+    cr = componentReferenceList( newMesh(), stream( patchReferences ) )
+    expected = componentReferenceGroups.New( [ cr[ i ] for i in range( len( cr ) ) ] )
+
+    assert cr.groups() is cr.groups()
+    for group, other in zip( cr.groups().groups(), expected.groups() ):
+        assert group[ : 2 ] == other[ : 2 ]
+        assert ( group[ 2 ] == other[ 2 ] ).all() and ( group[ 3 ] == other[ 3 ] ).all()
+
+
+#--------------------------------------------------------------------------------------
+@pytest.mark.parametrize( "entry", ( ( "top", 0, "x", 1.0 ), ( "left", 5, "x", 1.0 ) ) )
+def testBadReference( entry ):
+    with pytest.raises( AssertionError ):
+        componentReferenceList( newMesh(), stream( [ entry ] ) )
+
+
+#--------------------------------------------------------------------------------------
+# Undecomposed mesh : 10 internal faces, then the patches left and right
+nInternalFaces = 10
+patchStarts = { "left" : 10, "right" : 16 }
+patchSizes = { "left" : 6, "right" : 6 }
+
+# Global faces of the patch faces of every rank
+rankFaces = ( { "left" : [ 10, 12, 14 ], "right" : [ 16, 17 ] },
+              { "left" : [ 11, 13, 15 ], "right" : [ 18, 19, 20, 21 ] } )
+
+
+#--------------------------------------------------------------------------------------
+#- Return the processor mesh of the rank and its faceProcAddressing, the
+#  first internal face flipped
+def processorMesh( rank ):
+    internal = range( rank, nInternalFaces, 2 )
+    patches = [ ( name, numpy.zeros( len( rankFaces[ rank ][ name ] ), int ) ) for name in ( "left", "right" ) ]
+    mesh = numpyBackend.fvMesh( numpyBackend.Time(), 5, patches, len( internal ) )
+
+    globalFaces = numpy.array( internal + rankFaces[ rank ][ "left" ] + rankFaces[ rank ][ "right" ] )
+    addressing = globalFaces + 1
+    addressing[ 0 ] *= -1
+
+    return mesh, addressing
+
+
+#--------------------------------------------------------------------------------------
+def references():
+    entries = [ { "globalFace" : face, "direction" : "y", "value" : float( face ) }
+                for face in range( nInternalFaces, 22 ) ]
+    return Istream( [ token.BEGIN_LIST ] + entries + [ token.END_LIST ] )
+
+
+#--------------------------------------------------------------------------------------
+#- Two processor meshes read in a parallel run, with the number of
+#  faceProcAddressing reads
+@pytest.fixture
+def ranks( monkeypatch ):
+    meshes = [ processorMesh( rank ) for rank in range( 2 ) ]
+    reads = []
+    def readAddressing( mesh ):
+        reads.append( mesh )
+        return [ addressing for processor, addressing in meshes if processor is mesh ][ 0 ]
+
+    monkeypatch.setattr( numpyBackend.Pstream, "parRun", staticmethod( lambda : True ) )
+    monkeypatch.setattr( globalFaceIndexModule, "readAddressing", readAddressing )
+    monkeypatch.setattr( globalFaceIndexModule, "_indices", {} )
+
+    return meshes, reads
+
+
+#--------------------------------------------------------------------------------------
+#- Every reference is kept by exactly one rank and points back to its face
+def testGlobalFacesOnTwoRanks( ranks ):
+    meshes, reads = ranks
+    owned = []
+    for mesh, addressing in meshes:
+        cr = componentReferenceList( mesh, references() )
+        starts = numpy.array( [ patch.start() for patch in mesh.boundaryMesh() ] )
+        localFaces = starts[ cr.patchIndices() ] + cr.faceIndices()
+
+        assert ( numpy.abs( addressing[ localFaces ] ) - 1 == cr.values() ).all()
+        assert ( cr.values() == [ cr[ i ].globalFace() for i in range( len( cr ) ) ] ).all()
+        owned.extend( cr.values() )
+
+    assert sorted( owned ) == range( nInternalFaces, 22 )
+
+
+#--------------------------------------------------------------------------------------
+#- Reading for a PtrList fails on a face of the other rank instead of
+#  leaving the entry out
+def testPtrListOfOtherRank( ranks ):
+    mesh, addressing = ranks[ 0 ][ 0 ]
+    is_ = references()
+    is_.read()
+    reader = componentReference.iNew( mesh )
+
+    reference = reader( is_ )()
+    assert reference.patchIndex() == 0 and reference.faceIndex() == 0
+    with pytest.raises( IOError ):
+        reader( is_ )
+
+
+#--------------------------------------------------------------------------------------
+#- The index is built once per mesh, whichever way the references are read
+def testIndexBuiltOnce( ranks ):
+    meshes, reads = ranks
+    mesh = meshes[ 1 ][ 0 ]
+    componentReferenceList( mesh, references() )
+    list( componentReference.iNew( mesh ).references( references() ) )
+    index = globalFaceIndex.New( mesh )
+
+    assert globalFaceIndex.New( mesh ) is index
+    assert reads == [ mesh ]
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,138 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+
+
+
+#--------------------------------------------------------------------------------------
+# componentReference constraints applied in bulk agree with those applied
+# one reference at a time
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from materialModels import numpyBackend
+from materialModels.componentReferenceGroups import componentReferenceGroups
+from materialModels.fieldArrays import toArray
+from materialModels.numpyBackend import word, IOobject, volVectorField, scalarField, vectorField
+
+
+#--------------------------------------------------------------------------------------
+# ( patch, face, direction, value ), the face 3 of patch 1 referenced twice
+references = ( ( 1, 3, 0, 1.0 ), ( 0, 2, 1, 2.0 ), ( 1, 0, 2, 3.0 ), ( 1, 3, 0, 4.0 ), ( 0, 4, 1, 5.0 ) )
+
+
+#--------------------------------------------------------------------------------------
+def newMesh():
+    return numpyBackend.fvMesh( numpyBackend.Time(), 10, [ ( "left", numpy.arange( 5 ) ),
+                                                           ( "right", numpy.arange( 5, 10 ) ) ] )
+
+
+#--------------------------------------------------------------------------------------
+def newGroups():
+    patches, faces, dirs, values = zip( *references )
+    return componentReferenceGroups( patches, faces, dirs, values )
+
+
+#--------------------------------------------------------------------------------------
+#- Vector matrix of the given diagonal with the coefficients
+#  setComponentReference changes
+class vectorMatrix( object ):
+    def __init__( self, mesh, needReference = True ):
+        self.mesh_ = mesh
+        self.needReference_ = needReference
+        self.diag_ = scalarField( numpy.arange( 1.0, mesh.nCells() + 1.0 ) )
+        self.internalCoeffs_ = [ vectorField( numpy.zeros( ( patch.size(), 3 ) ) ) for patch in mesh.boundary() ]
+        self.boundaryCoeffs_ = [ vectorField( numpy.zeros( ( patch.size(), 3 ) ) ) for patch in mesh.boundary() ]
+        pass
+
+    def psi( self ):
+        return self
+
+    def mesh( self ):
+        return self.mesh_
+
+    def needReference( self ):
+        return self.needReference_
+
+    def diag( self ):
+        return self.diag_
+
+    def internalCoeffs( self ):
+        return self.internalCoeffs_
+
+    def boundaryCoeffs( self ):
+        return self.boundaryCoeffs_
+
+    #- As fvMatrix::setComponentReference
+    def setComponentReference( self, patchI, faceI, dir_, value ):
+        diag = toArray( self.diag_ )[ toArray( self.mesh_.boundary()[ patchI ].faceCells() )[ faceI ] ]
+        toArray( self.internalCoeffs_[ patchI ], 3 )[ faceI, dir_ ] += diag
+        toArray( self.boundaryCoeffs_[ patchI ], 3 )[ faceI, dir_ ] += diag * value
+        pass
+
+
+#--------------------------------------------------------------------------------------
+def testGroups():
+    groups = newGroups()
+
+    assert groups.size() == len( references )
+    assert [ ( patchI, dir_ ) for patchI, dir_, faces, values in groups.groups() ] == [ ( 0, 1 ), ( 1, 0 ), ( 1, 2 ) ]
+
+
+#--------------------------------------------------------------------------------------
+#- The components are set on the patches, the last reference of a face winning
+def testApply():
+    mesh = newMesh()
+    U = volVectorField( IOobject( word( "U" ), "0", mesh ), mesh )
+    newGroups().apply( U )
+
+    expected = [ numpy.zeros( ( 5, 3 ) ), numpy.zeros( ( 5, 3 ) ) ]
+    for patchI, faceI, dir_, value in references:
+        expected[ patchI ][ faceI, dir_ ] = value
+    for patchI in range( 2 ):
+        assert ( toArray( U.ext_boundaryField()[ patchI ], 3 ) == expected[ patchI ] ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- The reference levels add up as setComponentReference called per reference
+def testSetReference():
+    mesh = newMesh()
+    matrix = vectorMatrix( mesh )
+    newGroups().setReference( matrix )
+    expected = vectorMatrix( mesh )
+    for reference in references:
+        expected.setComponentReference( *reference )
+
+    for patchI in range( 2 ):
+        assert numpy.allclose( toArray( matrix.internalCoeffs()[ patchI ] ), toArray( expected.internalCoeffs()[ patchI ] ) )
+        assert numpy.allclose( toArray( matrix.boundaryCoeffs()[ patchI ] ), toArray( expected.boundaryCoeffs()[ patchI ] ) )
+
+
+#--------------------------------------------------------------------------------------
+def testNoReferenceNeeded():
+    matrix = vectorMatrix( newMesh(), needReference = False )
+    newGroups().setReference( matrix )
+
+    assert not toArray( matrix.internalCoeffs()[ 1 ] ).any()
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,144 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Caching of the elastic constants by rheologyModel, at the current time
+# and in the bounded cache of given times
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from conftest import newMesh, multiMaterial, singleLaw, steel, polymer, viscoelastic
+from materialModels import numpyBackend
+from materialModels.fieldArrays import toArray
+
+
+#--------------------------------------------------------------------------------------
+def values( field ):
+    return toArray( field.internalField() ).copy()
+
+
+#--------------------------------------------------------------------------------------
+def newModel( properties, nCells = 40 ):
+    materials = ( numpy.arange( nCells ) * 2 // nCells ).astype( float )
+    return numpyBackend.rheologyModelFor( newMesh( nCells ), properties, materials )
+
+
+#--------------------------------------------------------------------------------------
+def testConstantsOfMaterials():
+    model = newModel( multiMaterial( steel, polymer ) )
+    mu = values( model.mu() )
+    _lambda = values( model._lambda() )
+
+    assert numpy.allclose( mu[ : 20 ], 2.0e+11 / 2.6 )
+    assert numpy.allclose( mu[ 20 : ], 3.0e+9 / 2.8 )
+    assert numpy.allclose( _lambda[ : 20 ], 0.3 * 2.0e+11 / ( 1.3 * 0.4 ) )
+    assert numpy.allclose( _lambda[ 20 : ], 0.4 * 3.0e+9 / ( 1.4 * 0.2 ) )
+
+
+#--------------------------------------------------------------------------------------
+def testConstantsAreCached():
+    model = newModel( multiMaterial( steel, polymer ) )
+    calls = []
+    calcConstants = model._calcConstants
+    def counted( *args ):
+        calls.append( args )
+        return calcConstants( *args )
+    model._calcConstants = counted
+
+    assert model.mu() is model.mu()
+    assert model._lambda() is model._lambda()
+    assert len( calls ) == 1
+
+
+#--------------------------------------------------------------------------------------
+#- clearOut drops the cached constants, they are evaluated again on demand
+def testClearOut():
+    model = newModel( multiMaterial( steel, polymer ) )
+    mu = model.mu()
+    model.clearOut()
+
+    assert model.mu() is not mu
+    assert numpy.allclose( values( model.mu() ), values( mu ) )
+
+
+#--------------------------------------------------------------------------------------
+def testTimeCache():
+    model = newModel( singleLaw( viscoelastic ) )
+    law = model.law()
+
+    assert model.mu( 1.0 ) is model.mu( 1.0 )
+    assert numpy.allclose( values( model.mu( 1.0 ) ), law.relaxationModulus( 1.0 ) / 2.8 )
+    assert numpy.allclose( values( model.mu( 2.0 ) ), law.relaxationModulus( 2.0 ) / 2.8 )
+
+    for t in range( 10 * model.timeCache_.maxSize() ):
+        model.mu( float( t ) )
+    assert model.timeCache_.size() <= model.timeCache_.maxSize()
+
+
+#--------------------------------------------------------------------------------------
+#- Constants of a time-dependent law at the current time follow the time steps
+def testTimeDependentConstants():
+    model = newModel( singleLaw( viscoelastic ) )
+    law = model.law()
+    time = model.sigma().mesh().time()
+
+    first = values( model.mu() )
+    time.increment( 0.5 )
+    second = values( model.mu() )
+
+    assert numpy.allclose( first, law.relaxationModulus( 0.0 ) / 2.8 )
+    assert numpy.allclose( second, law.relaxationModulus( 0.5 ) / 2.8 )
+
+
+#--------------------------------------------------------------------------------------
+#- Uniform Lame's coefficients are kept until the time step of a time-dependent law
+def testUniformConstantsAreCached():
+    model = newModel( singleLaw( viscoelastic ) )
+    law = model.law()
+    time = model.sigma().mesh().time()
+
+    mu = model.uniformMu()
+    assert model.uniformMu() is mu
+    assert model.uniformLambda() is model.uniformLambda()
+
+    time.increment( 0.5 )
+    assert model.uniformMu() is not mu
+    assert numpy.allclose( model.uniformMu().value(), law.relaxationModulus( 0.5 ) / 2.8 )
+
+
+#--------------------------------------------------------------------------------------
+#- Moving cells between materials updates the cached constants of those cells
+def testConstantsFollowMovedCells():
+    model = newModel( multiMaterial( steel, polymer ) )
+    mu = model.mu()
+    model.law().setMaterials( [ 0, 5 ], 1.0 )
+
+    assert model.mu() is mu
+    assert numpy.allclose( values( mu )[ [ 0, 5 ] ], 3.0e+9 / 2.8 )
+    assert numpy.allclose( values( mu )[ [ 1, 6 ] ], 2.0e+11 / 2.6 )
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,176 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Radial return of elastoPlastic with linear isotropic hardening
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from conftest import newMesh, singleLaw
+from materialModels import numpyBackend
+from materialModels.fieldArrays import toArray
+
+
+#--------------------------------------------------------------------------------------
+steel = """
+        steel
+        {
+            type            elastoPlastic;
+            rho             rho [1 -3 0 0 0 0 0] 7800;
+            E               E [1 -1 -2 0 0 0 0] 2e11;
+            nu              nu [0 0 0 0 0 0 0] 0.3;
+            sigmaY          sigmaY [1 -1 -2 0 0 0 0] 2.5e8;
+            Ep              Ep [1 -1 -2 0 0 0 0] 2e9;
+        }
+"""
+
+E, nu, sigmaY, Ep = 2.0e+11, 0.3, 2.5e+8, 2.0e+9
+mu = E / ( 2.0 * ( 1.0 + nu ) )
+
+
+#--------------------------------------------------------------------------------------
+def newLaw( nCells = 4 ):
+    return numpyBackend.rheologyModelFor( newMesh( nCells ), singleLaw( steel ) ).law()
+
+
+#--------------------------------------------------------------------------------------
+#- Return the von Mises stress and the pressure of the stresses
+def equivalent( sigma ):
+    p = ( sigma[ :, 0 ] + sigma[ :, 3 ] + sigma[ :, 5 ] ) / 3.0
+    s = sigma.copy()
+    for d in ( 0, 3, 5 ):
+        s[ :, d ] -= p
+    ss = s[ :, 0 ] ** 2 + s[ :, 3 ] ** 2 + s[ :, 5 ] ** 2 + 2.0 * ( s[ :, 1 ] ** 2 + s[ :, 2 ] ** 2 + s[ :, 4 ] ** 2 )
+
+    return numpy.sqrt( 1.5 * ss ), p
+
+
+#--------------------------------------------------------------------------------------
+#- Set the trial stress and return the corrected one
+def returnMap( law, trial ):
+    sigma = toArray( law.sigma().internalField(), 6 )
+    sigma[ ... ] = trial
+    law.correct()
+
+    return sigma.copy()
+
+
+#--------------------------------------------------------------------------------------
+def testElasticBelowYield():
+    law = newLaw()
+    trial = numpy.zeros( ( 4, 6 ) )
+    trial[ :, 0 ] = 0.9 * sigmaY
+
+    assert ( returnMap( law, trial ) == trial ).all()
+    assert ( law.epsilonPEqArray() == 0.0 ).all()
+
+
+#--------------------------------------------------------------------------------------
+def testRadialReturn():
+    law = newLaw()
+    random = numpy.random.RandomState( 0 )
+    trial = 4.0e+8 * random.normal( size = ( 4, 6 ) )
+    qTrial, pTrial = equivalent( trial )
+    assert ( qTrial > sigmaY ).all()
+
+    sigma = returnMap( law, trial )
+    q, p = equivalent( sigma )
+    epsilonPEq = law.epsilonPEqArray()
+
+    assert numpy.allclose( epsilonPEq, ( qTrial - sigmaY ) / ( 3.0 * mu + Ep ) )
+    assert numpy.allclose( q, sigmaY + Ep * epsilonPEq )
+    assert numpy.allclose( p, pTrial )
+
+    # The deviator is scaled, its direction is kept
+    for d in ( 1, 2, 4 ):
+        assert numpy.allclose( sigma[ :, d ] / trial[ :, d ], q / qTrial )
+
+
+#--------------------------------------------------------------------------------------
+#- Corrector iterations within a time step do not harden the material again
+def testIterationsDoNotHarden():
+    law = newLaw()
+    trial = numpy.zeros( ( 4, 6 ) )
+    trial[ :, 0 ] = 4.0e+8
+
+    results = [ ( returnMap( law, trial ), law.epsilonPEqArray().copy() ) for i in range( 3 ) ]
+    for sigma, epsilonPEq in results[ 1: ]:
+        assert ( sigma == results[ 0 ][ 0 ] ).all()
+        assert ( epsilonPEq == results[ 0 ][ 1 ] ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- The plastic strain of a time step is the start of the next one
+def testHardeningAcrossTimeSteps():
+    law = newLaw()
+    trial = numpy.zeros( ( 4, 6 ) )
+    trial[ :, 0 ] = 4.0e+8
+
+    returnMap( law, trial )
+    first = law.epsilonPEqArray().copy()
+    law.mesh().time().increment( 1.0 )
+    returnMap( law, trial )
+    returnMap( law, trial )
+
+    assert numpy.allclose( law.epsilonPEqArray(), first + ( 4.0e+8 - sigmaY - Ep * first ) / ( 3.0 * mu + Ep ) )
+
+
+#--------------------------------------------------------------------------------------
+#- Under multiMaterial the state covers the cells of the law only and
+#  follows the cells moved between the materials
+def testStateOfMaterialCells():
+    from conftest import multiMaterial, polymer
+    nCells = 10
+    materials = ( numpy.arange( nCells ) >= 6 ).astype( float )
+    model = numpyBackend.rheologyModelFor( newMesh( nCells ), multiMaterial( steel, polymer ), materials )
+    law = model.law()[ 0 ]
+    trial = numpy.zeros( ( nCells, 6 ) )
+    trial[ :, 0 ] = 4.0e+8 + 1.0e+7 * numpy.arange( nCells )
+    sigma = returnMap( law, trial )
+
+    assert law.epsilonPEqArray().shape == ( 6, )
+    assert ( sigma[ 6: ] == trial[ 6: ] ).all()
+    expected = ( trial[ :6, 0 ] - sigmaY ) / ( 3.0 * mu + Ep )
+    assert numpy.allclose( law.epsilonPEqArray(), expected )
+
+    model.law().setMaterials( [ 2, 7 ], [ 1.0, 0.0 ] )
+    assert list( law.cells() ) == [ 0, 1, 3, 4, 5, 7 ]
+    assert numpy.allclose( law.epsilonPEqArray(), [ expected[ 0 ], expected[ 1 ], expected[ 3 ], expected[ 4 ], expected[ 5 ], 0.0 ] )
+    epsilonPEq = toArray( law.epsilonPEq().internalField() )
+    assert numpy.allclose( epsilonPEq[ law.cells() ], law.epsilonPEqArray() )
+    assert ( numpy.delete( epsilonPEq, law.cells() ) == 0.0 ).all()
+
+
+#--------------------------------------------------------------------------------------
+#- The model returns the yield stress and plastic modulus of the law
+def testModelSigmaYAndEp():
+    model = numpyBackend.rheologyModelFor( newMesh( 4 ), singleLaw( steel ) )
+
+    assert numpy.allclose( toArray( model.sigmaY().internalField() ), sigmaY )
+    assert numpy.allclose( toArray( model.Ep().internalField() ), Ep )
+
+
+#--------------------------------------------------------------------------------------
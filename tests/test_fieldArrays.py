@@ -0,0 +1,48 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+
+
+
+#--------------------------------------------------------------------------------------
+# NumPy views of the fields
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from materialModels.fieldArrays import toArray
+from materialModels.numpyBackend import scalarField, vectorField, labelList
+
+
+#--------------------------------------------------------------------------------------
+#- The views share the data of the field and keep its type
+def testViews():
+    field = vectorField( numpy.zeros( ( 4, 3 ) ) )
+    toArray( field, 3 )[ 1, 2 ] = 5.0
+    assert toArray( field, 3 )[ 1, 2 ] == 5.0
+
+    labels = labelList( [ 3, 1, 2 ] )
+    view = toArray( labels )
+    assert view.dtype.kind == "i"
+    assert ( toArray( scalarField( [ 1.0, 2.0, 3.0, 4.0 ] ) )[ view ] == [ 4.0, 2.0, 3.0 ] ).all()
+
+
+#--------------------------------------------------------------------------------------
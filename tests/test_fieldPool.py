@@ -0,0 +1,111 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Scratch field pool : fields are recycled only inside scratch scopes, a
+# field handed out otherwise is never refilled behind the back of its holder
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+import pytest
+from conftest import newMesh, multiMaterial, steel, viscoelastic
+from materialModels import numpyBackend, fieldPool
+from materialModels.fieldArrays import toArray
+from materialModels.numpyBackend import word, dimensionedScalar, dimless
+
+
+#--------------------------------------------------------------------------------------
+def value( x ):
+    return dimensionedScalar( word( "x" ), dimless, x )
+
+
+#--------------------------------------------------------------------------------------
+#- A field kept by the caller keeps its values while the law and the model
+#  evaluate further properties
+def testFieldsAreNotAliased():
+    model = numpyBackend.rheologyModelFor( newMesh( 100 ), multiMaterial( steel, viscoelastic ), numpy.ones( 100 ) )
+    law = model.law()
+    E0 = toArray( law.E( 0.0 ).internalField() )
+    expected = law[ 1 ].relaxationModulus( 0.0 )
+
+    law.E( 5.0 )
+    for t in ( 1.0, 2.0, 3.0 ):
+        model.mu( t )
+
+    assert numpy.allclose( E0, expected )
+
+
+#--------------------------------------------------------------------------------------
+def testFieldsOutsideScopeAreNew():
+    mesh = newMesh( 10 )
+    first = fieldPool.scratchField( "E", mesh, value( 1.0 ) )
+    second = fieldPool.scratchField( "E", mesh, value( 2.0 ) )
+
+    assert first is not second
+    assert ( toArray( first.internalField() ) == 1.0 ).all()
+
+
+#--------------------------------------------------------------------------------------
+def testScopesRecycleFields():
+    mesh = newMesh( 10 )
+    hits = fieldPool.instance().stats()[ 0 ]
+    with fieldPool.scratch():
+        first = fieldPool.scratchField( "E", mesh, value( 1.0 ) )
+        other = fieldPool.scratchField( "E", mesh, value( 1.0 ) )
+        assert other is not first
+
+    with fieldPool.scratch():
+        again = fieldPool.scratchField( "E", mesh, value( 3.0 ) )
+        assert again is first or again is other
+        assert ( toArray( again.internalField() ) == 3.0 ).all()
+
+    assert fieldPool.instance().stats()[ 0 ] == hits + 1
+
+
+#--------------------------------------------------------------------------------------
+def testAcquireOutsideScope():
+    with pytest.raises( AssertionError ):
+        fieldPool.instance().acquire( "E", lambda : None )
+
+
+#--------------------------------------------------------------------------------------
+#- Fields are pooled per C++ mesh, whichever proxy of it is passed
+def testPooledPerMesh():
+    mesh = newMesh( 10 )
+    class proxy( object ):
+        this = id( mesh )
+        def __getattr__( self, name ):
+            return getattr( mesh, name )
+
+    with fieldPool.scratch():
+        first = fieldPool.scratchField( "E", mesh, value( 1.0 ) )
+
+    with fieldPool.scratch():
+        assert fieldPool.scratchField( "E", proxy(), value( 1.0 ) ) is first
+        assert fieldPool.scratchField( "E", newMesh( 10 ), value( 1.0 ) ) is not first
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,103 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+
+
+
+#--------------------------------------------------------------------------------------
+# Timing of the hot entry points : counted while enabled, summaries per time
+# step, a Chrome trace at the end, and the original methods back afterwards
+
+
+#--------------------------------------------------------------------------------------
+import json
+from materialModels import instrumentation
+from materialModels.rheologyModel import rheologyModel
+from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+
+
+#--------------------------------------------------------------------------------------
+def updateCoeffs( case ):
+    for patchField in case.patchFields_:
+        patchField.updated_ = False
+        patchField.updateCoeffs()
+    pass
+
+
+#--------------------------------------------------------------------------------------
+def testTimedRun( case, tmpdir ):
+    traceFile = str( tmpdir.join( "trace.json" ) )
+    summaryFile = str( tmpdir.join( "summary.txt" ) )
+    mu = rheologyModel.__dict__[ "mu" ]
+    instrumentation.enable( case.mesh_.time(), traceFile, summaryFile )
+    try:
+        assert instrumentation.enabled()
+        assert rheologyModel.__dict__[ "mu" ] is not mu
+        updateCoeffs( case )
+        case.mesh_.time().increment( 1.0 )
+        updateCoeffs( case )
+        statistics = instrumentation.statistics()
+    finally:
+        instrumentation.finish()
+
+    assert not instrumentation.enabled()
+    assert rheologyModel.__dict__[ "mu" ] is mu
+
+    calls, cumulative, maximum = statistics[ "tractionDisplacementFvPatchVectorField.updateCoeffs" ]
+    assert calls == 2 * len( case.patchFields_ )
+    assert 0.0 <= maximum <= cumulative
+
+    events = json.load( open( traceFile ) )[ "traceEvents" ]
+    assert sum( [ statistics[ name ][ 0 ] for name in statistics ] ) == len( events )
+    assert set( [ event[ "name" ] for event in events ] ) == set( statistics.keys() )
+    assert all( [ event[ "ph" ] == "X" and event[ "dur" ] >= 0.0 for event in events ] )
+
+    summary = open( summaryFile ).read()
+    assert "time index 0" in summary and "time index 1" in summary and "whole run" in summary
+
+
+#--------------------------------------------------------------------------------------
+#- Nothing is recorded while disabled
+def testDisabled( case ):
+    updateCoeffs_ = tractionDisplacementFvPatchVectorField.__dict__[ "updateCoeffs" ]
+    instrumentation.enable()
+    instrumentation.disable()
+    updateCoeffs( case )
+
+    assert instrumentation.statistics() == {}
+    assert tractionDisplacementFvPatchVectorField.__dict__[ "updateCoeffs" ] is updateCoeffs_
+
+
+#--------------------------------------------------------------------------------------
+#- The environment variable switches the timing on
+def testEnableFromEnvironment( case, tmpdir, monkeypatch ):
+    monkeypatch.setenv( "MATERIALMODELS_TRACE", str( tmpdir.join( "trace.json" ) ) )
+    monkeypatch.setenv( "MATERIALMODELS_SUMMARY", str( tmpdir.join( "summary.txt" ) ) )
+    instrumentation.enableFromEnvironment( case.mesh_.time() )
+    try:
+        assert instrumentation.enabled()
+    finally:
+        instrumentation.finish()
+
+    assert tmpdir.join( "trace.json" ).check()
+
+
+#--------------------------------------------------------------------------------------
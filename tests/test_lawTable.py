@@ -0,0 +1,73 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+
+
+
+#--------------------------------------------------------------------------------------
+# Run-time selection table of the rheology laws : the laws are registered by
+# dotted name and imported when first selected
+
+
+#--------------------------------------------------------------------------------------
+import os, sys, subprocess, types
+from materialModels.rheologyModel.rheologyLaws import addDictionaryConstructorTable
+
+
+#--------------------------------------------------------------------------------------
+#- Importing the package imports none of the laws
+def testLawsNotImported():
+    script = "import sys; sys.path.insert( 0, %r ); " \
+             "from materialModels import numpyBackend; numpyBackend.install(); " \
+             "import materialModels.rheologyModel.rheologyLaws as laws; " \
+             "print sorted( [ name for name, module in sys.modules.items() " \
+             "if name.startswith( laws.__name__ + '.' ) and module is not None ] )" \
+             % os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), os.pardir )
+    output = subprocess.check_output( [ sys.executable, "-c", script ] )
+
+    assert eval( output ) == [ "materialModels.rheologyModel.rheologyLaws.addDictionaryConstructorTable",
+                               "materialModels.rheologyModel.rheologyLaws.rheologyLaw" ]
+
+
+#--------------------------------------------------------------------------------------
+#- The dotted name is replaced by the class on first lookup
+def testLookup():
+    table = addDictionaryConstructorTable.dictionaryTable
+    table[ "copiedLaw" ] = "materialModels.rheologyModel.rheologyLaws.linearElastic.linearElastic"
+    try:
+        from materialModels.rheologyModel.rheologyLaws.linearElastic import linearElastic
+        assert addDictionaryConstructorTable.lookup( "copiedLaw" ) is linearElastic
+        assert table[ "copiedLaw" ] is linearElastic
+    finally:
+        del table[ "copiedLaw" ]
+
+    from materialModels.rheologyModel.rheologyLaws.elastoPlastic import elastoPlastic
+    assert addDictionaryConstructorTable.lookup( "elastoPlastic" ) is elastoPlastic
+    assert table[ "elastoPlastic" ] is elastoPlastic
+
+
+#--------------------------------------------------------------------------------------
+#- The package stays a plain module
+def testPlainPackage():
+    assert type( sys.modules[ "materialModels.rheologyModel.rheologyLaws" ] ) is types.ModuleType
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,133 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Re-indexing of multiMaterial after cells move between materials, checked
+# against a law built from scratch on the same materials field
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from conftest import newMesh, multiMaterial, steel, polymer, viscoelastic
+from materialModels import numpyBackend
+from materialModels.fieldArrays import toArray
+
+
+#--------------------------------------------------------------------------------------
+nCells = 500
+
+
+#--------------------------------------------------------------------------------------
+def newLaw( properties, materials, time = None ):
+    return numpyBackend.rheologyModelFor( newMesh( nCells, time ), properties, materials.copy() ).law()
+
+
+#--------------------------------------------------------------------------------------
+def checkRebuilt( law, properties, materials ):
+    rebuilt = newLaw( properties, materials, law.mesh().time() )
+
+    for lawI in range( len( law ) ):
+        assert ( law.materialCells( lawI ) == rebuilt.materialCells( lawI ) ).all()
+    assert ( law.cellLabels_ == rebuilt.cellLabels_ ).all()
+    assert ( law.cellGroups_ == rebuilt.cellGroups_ ).all()
+    for name in ( "rho", "E", "nu" ):
+        assert numpy.allclose( toArray( getattr( law, name )().internalField() ),
+                               toArray( getattr( rebuilt, name )().internalField() ) ), name
+    pass
+
+
+#--------------------------------------------------------------------------------------
+def setUp( properties ):
+    random = numpy.random.RandomState( 1 )
+    materials = random.randint( 0, 2, nCells ).astype( float )
+    return newLaw( properties, materials ), materials, random
+
+
+#--------------------------------------------------------------------------------------
+def testSetMaterials():
+    for properties in ( multiMaterial( steel, polymer ), multiMaterial( steel, viscoelastic ) ):
+        law, materials, random = setUp( properties )
+        law.E()
+        cells = random.choice( nCells, 50, replace = False )
+        materials[ cells ] = 1.0 - materials[ cells ]
+        law.setMaterials( cells, materials[ cells ] )
+
+        checkRebuilt( law, properties, materials )
+
+
+#--------------------------------------------------------------------------------------
+#- A materials field written without telling is picked up at the next time step
+def testMaterialsWrittenBehindTheBack():
+    properties = multiMaterial( steel, polymer )
+    law, materials, random = setUp( properties )
+    law.E()
+    cells = random.choice( nCells, 20, replace = False )
+    materials[ cells ] = 1.0 - materials[ cells ]
+    toArray( law.materials_.internalField() )[ cells ] = materials[ cells ]
+    law.mesh().time().increment( 0.1 )
+
+    checkRebuilt( law, properties, materials )
+
+
+#--------------------------------------------------------------------------------------
+def testChangedCells():
+    law, materials, random = setUp( multiMaterial( steel, polymer ) )
+    version = law.version()
+    assert law.changedCells( version ).shape[ 0 ] == 0
+
+    cells = numpy.array( [ 3, 7, 11 ] )
+    law.setMaterials( cells, 1.0 - materials[ cells ] )
+    law.setMaterials( [ 7, 20 ], 1.0 - materials[ [ 7, 20 ] ] )
+    assert ( law.changedCells( version ) == [ 3, 7, 11, 20 ] ).all()
+
+    law.modified()
+    assert law.changedCells( version ) is None
+
+
+#--------------------------------------------------------------------------------------
+#- After a move only the moved cells of the kept assembly are evaluated again,
+#  and the fields handed out before are left alone
+def testIncrementalAssembly():
+    law, materials, random = setUp( multiMaterial( steel, polymer ) )
+    reassembled = []
+    reassemble = law._reassemble
+    def counted( *args ):
+        result = reassemble( *args )
+        reassembled.append( result is not None )
+        return result
+    law._reassemble = counted
+
+    E = law.E()
+    before = toArray( E.internalField() ).copy()
+    cells = random.choice( nCells, 30, replace = False )
+    materials[ cells ] = 1.0 - materials[ cells ]
+    law.setMaterials( cells, materials[ cells ] )
+
+    assert ( toArray( law.E().internalField() ) == numpy.where( materials < 1.0, 2.0e+11, 3.0e+9 ) ).all()
+    assert reassembled == [ True ]
+    assert ( toArray( E.internalField() ) == before ).all()
+
+
+#--------------------------------------------------------------------------------------
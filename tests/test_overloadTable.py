@@ -0,0 +1,118 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Selection of the overloaded constructors by the number and the classes of
+# the arguments, remembered per combination of classes
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+import pytest
+from materialModels.overloadTable import overloadTable, anything, sameClass
+from materialModels.fieldArrays import toArray
+from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+from materialModels.numpyBackend import fvPatchFieldMapper
+
+
+#--------------------------------------------------------------------------------------
+def isInt( obj, arg ):
+    return isinstance( arg, int )
+
+
+#--------------------------------------------------------------------------------------
+class overloaded( object ):
+    _methods = overloadTable()
+    _methods.add( "fromInt", isInt )
+    _methods.add( "fromAny", anything )
+    _methods.add( "fromSelf", sameClass, anything )
+
+    def __init__( self, *args ):
+        self.calls_ = []
+        if args:
+           overloaded._methods( self, *args )
+        pass
+
+    def fromInt( self, value ):
+        self.calls_.append( "fromInt" )
+
+    def fromAny( self, value ):
+        self.calls_.append( "fromAny" )
+
+    def fromSelf( self, other, value ):
+        self.calls_.append( "fromSelf" )
+
+
+#--------------------------------------------------------------------------------------
+def testSelection():
+    assert overloaded( 1 ).calls_ == [ "fromInt" ]
+    assert overloaded( "a" ).calls_ == [ "fromAny" ]
+    assert overloaded( overloaded(), None ).calls_ == [ "fromSelf" ]
+
+    with pytest.raises( AssertionError ):
+        overloaded( 1, 2, 3 )
+
+
+#--------------------------------------------------------------------------------------
+#- The checkers run once per combination of argument classes
+def testSelectionRemembered():
+    checked = []
+    def counted( obj, arg ):
+        checked.append( arg )
+        return True
+
+    table = overloadTable()
+    table.add( "fromAny", counted )
+    target = overloaded()
+    for value in ( 1, 2, 3 ):
+        table( target, value )
+    table( target, "a" )
+
+    assert checked == [ 1, "a" ]
+    assert target.calls_ == [ "fromAny" ] * 4
+
+    # Registering another overload forgets the selections made
+    table.add( "fromInt", isInt )
+    table( target, 4 )
+    assert checked == [ 1, "a", 4 ]
+
+
+#--------------------------------------------------------------------------------------
+def testPatchFieldConstructors( case ):
+    patchField = case.patchFields_[ 0 ]
+    patch = patchField.patch()
+    iF = case.U_.dimensionedInternalField()
+
+    copies = [ tractionDisplacementFvPatchVectorField( patchField ),
+               tractionDisplacementFvPatchVectorField( patchField, iF ),
+               tractionDisplacementFvPatchVectorField( patchField, patch, iF, fvPatchFieldMapper( numpy.arange( patch.size() ) ) ) ]
+    for copy in copies:
+        assert numpy.allclose( toArray( copy.traction_(), 3 ), toArray( patchField.traction_(), 3 ) )
+
+    blank = tractionDisplacementFvPatchVectorField( patch, iF )
+    assert numpy.allclose( toArray( blank.traction_(), 3 ), 0.0 )
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,98 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+#--------------------------------------------------------------------------------------
+# Time-varying and spatial loads of tractionDisplacement : copies own their
+# loads, a scalar traction needs a direction, and the distributions are
+# checked expressions of the face centres and the time
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+import pytest
+from materialModels.fieldArrays import toArray
+from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+from materialModels.fvPatchFields.tractionDisplacement.patchLoads import patchLoads, spatialFunction, timeSeries
+
+
+#--------------------------------------------------------------------------------------
+def testCopiesOwnTheirLoads( case ):
+    patchField = case.patchFields_[ 0 ]
+    patchField.loads_ = patchLoads( tractionSeries = timeSeries( [ 0.0, 1.0 ], [ 0.0, 1.0 ] ), tractionDirection = ( 1, 0, 0 ) )
+    copy = tractionDisplacementFvPatchVectorField( patchField )
+
+    assert copy.loads_ is not patchField.loads_
+    time = patchField.db().time()
+    traction = toArray( patchField.traction_(), 3 )
+    pressure = toArray( patchField.pressure_() )
+    loads = patchField.loads_.apply( patchField.patch(), time, traction, pressure )
+    copy.loads_.clearOut()
+
+    assert patchField.loads_.apply( patchField.patch(), time, traction, pressure ) is loads
+
+
+#--------------------------------------------------------------------------------------
+def testScalarTractionNeedsDirection():
+    for loads in ( dict( tractionDistribution = spatialFunction( "1000.0 + 0*x" ) ),
+                   dict( tractionSeries = timeSeries( [ 0.0, 1.0 ], [ 0.0, 1.0 ] ) ) ):
+        with pytest.raises( IOError ):
+            patchLoads( **loads )
+
+    with pytest.raises( IOError ):
+        patchLoads( tractionSeries = timeSeries( [ 0.0, 1.0 ], [ [ 0.0, 0.0, 0.0 ], [ 1.0, 0.0, 0.0 ] ] ), tractionDirection = ( 1, 0, 0 ) )
+
+    loads = patchLoads( tractionSeries = timeSeries( [ 0.0, 1.0 ], [ 0.0, 2.0 ] ), tractionDirection = ( 0, 0, 1 ) )
+    assert numpy.allclose( loads._tractionTerm( None, 0.5 ), [ 0.0, 0.0, 1.0 ] )
+
+
+#--------------------------------------------------------------------------------------
+#- Only arithmetic on x, y, z, t and the listed functions is evaluated
+def testSpatialFunction():
+    C = numpy.array( [ [ 0.0, 1.0, 2.0 ], [ 1.0, 2.0, 4.0 ] ] )
+    f = spatialFunction( "where( x > 0.5, 2*y, -z ) + sqrt( abs( z ) ) * t ** 2 - pi" )
+
+    assert f.timeDependent() and not spatialFunction( "1e3 * sin( x )" ).timeDependent()
+    assert numpy.allclose( f( C, 2.0 ), [ -2.0 + 4.0 * numpy.sqrt( 2.0 ) - numpy.pi, 4.0 + 8.0 - numpy.pi ] )
+
+    for expression in ( "__import__( 'os' ).system( 'true' )", "x.__class__", "().__class__.__bases__",
+                        "open( 'file' )", "numpy.sin( x )", "[ x for x in y ]", "lambda : x", "sin( x = 1 )",
+                        "u + 1", "x if y else z", "x +", "" ):
+        with pytest.raises( IOError ):
+            spatialFunction( expression )
+
+
+#--------------------------------------------------------------------------------------
+#- A distribution of t is evaluated again every time step
+def testTimeDependentDistribution( case ):
+    patchField = case.patchFields_[ 0 ]
+    patchField.loads_ = patchLoads( pressureDistribution = spatialFunction( "10 * t" ) )
+    time = patchField.db().time()
+    traction = toArray( patchField.traction_(), 3 )
+    pressure = toArray( patchField.pressure_() )
+
+    assert numpy.allclose( patchField.loads_.apply( patchField.patch(), time, traction, pressure )[ 1 ], 0.0 )
+    time.increment( 0.5 )
+    assert numpy.allclose( patchField.loads_.apply( patchField.patch(), time, traction, pressure )[ 1 ], 5.0 )
+
+
+#--------------------------------------------------------------------------------------
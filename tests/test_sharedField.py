@@ -0,0 +1,75 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+
+
+#--------------------------------------------------------------------------------------
+# Copy-on-write sharing of fields by sharedField, as the tractionDisplacement
+# copies share their traction and pressure
+
+
+#--------------------------------------------------------------------------------------
+from materialModels.sharedField import sharedField
+from materialModels.fieldArrays import toArray
+from materialModels.numpyBackend import scalarField
+
+
+#--------------------------------------------------------------------------------------
+def newField():
+    return scalarField( 10, 1.0 )
+
+
+#--------------------------------------------------------------------------------------
+def testShareThenWrite():
+    first = sharedField( newField() )
+    second = first.share()
+    assert first.isShared() and second.isShared()
+    assert second() is first()
+
+    field = second.ref()
+    toArray( field )[ ... ] = 2.0
+
+    assert field is not first()
+    assert ( toArray( first() ) == 1.0 ).all()
+    assert not first.isShared() and not second.isShared()
+
+
+#--------------------------------------------------------------------------------------
+def testWriteWithoutSharing():
+    field = newField()
+    holder = sharedField( field )
+
+    assert holder.ref() is field
+
+
+#--------------------------------------------------------------------------------------
+def testReleasedHolder():
+    first = sharedField( newField() )
+    second = first.share()
+    del second
+
+    assert not first.isShared()
+    assert first.ref() is first()
+
+
+#--------------------------------------------------------------------------------------
@@ -0,0 +1,191 @@
+#--------------------------------------------------------------------------------------
+## pythonFlu - Python wrapping for OpenFOAM C++ API
+## Copyright (C) 2010- Alexey Petrov
+## Copyright (C) 2009-2010 Pebble Bed Modular Reactor (Pty) Limited (PBMR)
+##
+## This program is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program.  If not, see <http://www.gnu.org/licenses/>.
+##
+## See http://sourceforge.net/projects/pythonflu
+##
+## Author : Alexey PETROV
+##
+
+#--------------------------------------------------------------------------------------
+# tractionDisplacement patch fields : copies share the traction until
+# written, the gradients batched over all the patches agree with those of
+# every patch, and those of another pass are never applied
+
+
+#--------------------------------------------------------------------------------------
+import numpy
+from materialModels.fieldArrays import toArray
+from materialModels.fvPatchFields.tractionDisplacement import tractionDisplacementFvPatchVectorField
+from materialModels.numpyBackend import volScalarField, volTensorField, IOobject, word
+
+
+#--------------------------------------------------------------------------------------
+#- Copies share the traction until one of them writes it, reading does not copy
+def testCopiesShareTraction( case ):
+    patchField = case.patchFields_[ 0 ]
+    copy = tractionDisplacementFvPatchVectorField( patchField )
+    assert copy.traction() is patchField.traction()
+    assert copy.pressure() is patchField.pressure()
+    assert copy.traction_() is patchField.traction_()
+
+    toArray( copy.tractionRef(), 3 )[ ... ] = 5.0
+
+    assert copy.traction_() is not patchField.traction_()
+    assert numpy.allclose( toArray( patchField.traction_(), 3 ), [ 1.0e+6, 0.0, 0.0 ] )
+    assert numpy.allclose( toArray( copy.traction(), 3 ), 5.0 )
+
+
+#--------------------------------------------------------------------------------------
+#- Return the names looked up in the registry of the case while calling f
+def lookups( case, f ):
+    names = []
+    lookupObject = case.mesh_.lookupObject
+    def counted( name ):
+        names.append( str( name ) )
+        return lookupObject( name )
+    case.mesh_.lookupObject = counted
+    try:
+        f()
+    finally:
+        del case.mesh_.lookupObject
+
+    return names
+
+
+#--------------------------------------------------------------------------------------
+#- The handles are not looked up again while the registry only gains temporaries
+def testHandlesKept( case ):
+    patchField = case.patchFields_[ 0 ]
+    rheology, gradU = patchField._handles()
+    temporaries = []
+    def update():
+        for i in range( 5 ):
+            temporaries.append( volScalarField( IOobject( word( "tmp%d" % i ), "0", case.mesh_ ), case.mesh_ ) )
+            assert patchField._handles()[ 1 ] is gradU
+
+    assert lookups( case, update ) == []
+
+
+#--------------------------------------------------------------------------------------
+#- The handles are looked up again on a changing mesh and after clear
+def testHandlesLookedUpAgain( case ):
+    patchField = case.patchFields_[ 0 ]
+    patchField._handles()
+
+    case.mesh_.changing = lambda : True
+    try:
+        assert lookups( case, patchField._handles ) == [ "rheologyProperties", "grad(U)" ]
+    finally:
+        del case.mesh_.changing
+
+    del case.mesh_.objects_[ "grad(U)" ]
+    gradU = volTensorField( IOobject( word( "grad(U)" ), "0", case.mesh_ ), case.mesh_ )
+    patchField.handles_.clear()
+    assert lookups( case, patchField._handles ) == [ "rheologyProperties", "grad(U)" ]
+    assert patchField._handles()[ 1 ] is gradU.ext_boundaryField()[ 0 ]
+
+
+#--------------------------------------------------------------------------------------
+def gradients( case ):
+    return [ toArray( patchField.gradient(), 3 ).copy() for patchField in case.patchFields_ ]
+
+
+#--------------------------------------------------------------------------------------
+#- Update the coefficients of all the patches but the skipped ones
+def update( case, batched, skip = () ):
+    tractionDisplacementFvPatchVectorField.batched = batched
+    try:
+        for patchField in case.patchFields_:
+            patchField.updated_ = False
+        for patchField in case.patchFields_:
+            if patchField.patch().index() not in skip:
+               patchField.updateCoeffs()
+    finally:
+        tractionDisplacementFvPatchVectorField.batched = False
+    pass
+
+
+#--------------------------------------------------------------------------------------
+def testBatchedGradients( case ):
+    update( case, False )
+    expected = gradients( case )
+    update( case, True )
+
+    for gradient, reference in zip( gradients( case ), expected ):
+        assert numpy.allclose( gradient, reference )
+
+
+#--------------------------------------------------------------------------------------
+#- The gradient batched for a patch left out of its pass is not applied in
+#  a later pass, after the displacement gradient has changed
+def testStaleBatchedGradient( case ):
+    update( case, True, skip = ( 2, ) )
+    toArray( case.gradU_.internalField(), 9 )[ ... ] *= 2.0
+    case.gradU_.correctBoundaryConditions()
+    update( case, False )
+    first = gradients( case )[ 2 ]
+    update( case, False )
+
+    assert numpy.allclose( gradients( case )[ 2 ], first )
+
+    update( case, True )
+    batched = gradients( case )
+    update( case, False )
+    for gradient, reference in zip( batched, gradients( case ) ):
+        assert numpy.allclose( gradient, reference )
+
+
+#--------------------------------------------------------------------------------------
+#--------------------------------------------------------------------------------------
+#- The passes are kept per registry, not per proxy of it, and those of the
+#  past time steps are dropped
+def testPassesOfPastTimeSteps( case ):
+    from materialModels.fvPatchFields import tractionDisplacement
+    tractionDisplacement._passes.clear()
+    update( case, True )
+    assert len( tractionDisplacement._passes ) == 1
+
+    patchField = case.patchFields_[ 0 ]
+    db = patchField.db
+    patchField.db = lambda : proxy( db() )
+    try:
+        update( case, True )
+    finally:
+        del patchField.db
+    assert len( tractionDisplacement._passes ) == 1
+
+    case.mesh_.time().increment( 1.0 )
+    other = type( case )( seed = 1 )
+    update( other, True )
+    update( case, True )
+    assert len( tractionDisplacement._passes ) == 1
+
+
+#--------------------------------------------------------------------------------------
+#- A new proxy of the object, as a wrapped registry is returned on every call
+class proxy( object ):
+    def __init__( self, obj ):
+        self.this = id( obj )
+        self.obj_ = obj
+        pass
+
+    def __getattr__( self, name ):
+        return getattr( self.obj_, name )
+
+
+#--------------------------------------------------------------------------------------